@@ -0,0 +1,148 @@
+"""
+Compare tail latency of the OpenAI proxy load balancing strategies against
+simulated model instances.
+
+Each simulated instance processes requests concurrently, and every in-flight
+request slows down prefill and decoding on that instance, which approximates
+continuous batching on an inference server. Requests arrive as a Poisson
+process with a mix of short and long generations.
+
+Usage:
+    python benchmarks/benchmark_load_balancer.py --instances 4 --requests 2000
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import random
+import time
+from typing import Dict, List
+
+import numpy
+
+from gpustack.http_proxy.strategies import (
+    STRATEGIES,
+    InstanceLoadTracker,
+    LoadBalancingStrategyEnum,
+)
+from gpustack.schemas.models import ModelInstance, ModelInstanceStateEnum
+
+
+@dataclass
+class SimulatedInstance:
+    instance: ModelInstance
+    # Seconds to prefill a request on an idle instance.
+    prefill_time: float
+    # Seconds per output token on an idle instance.
+    token_time: float
+    # Relative slowdown added by each in-flight request.
+    contention: float
+    in_flight: int = 0
+
+    async def serve(self, output_tokens: int, tracker: InstanceLoadTracker) -> float:
+        start = time.monotonic()
+        self.in_flight += 1
+        try:
+            slowdown = 1 + self.contention * (self.in_flight - 1)
+            await asyncio.sleep(self.prefill_time * slowdown)
+            tracker.first_token_received(self.instance, time.monotonic() - start)
+            await asyncio.sleep(self.token_time * output_tokens * slowdown)
+        finally:
+            self.in_flight -= 1
+        return time.monotonic() - start
+
+
+def build_instances(count: int, slow_ratio: float) -> List[SimulatedInstance]:
+    instances = []
+    for i in range(count):
+        slow = i < int(count * slow_ratio)
+        instances.append(
+            SimulatedInstance(
+                instance=ModelInstance(
+                    id=i + 1,
+                    name=f"sim-{i + 1}",
+                    model_id=1,
+                    model_name="sim",
+                    state=ModelInstanceStateEnum.RUNNING,
+                ),
+                prefill_time=0.004 if slow else 0.002,
+                token_time=0.0004 if slow else 0.0002,
+                contention=0.15,
+            )
+        )
+    return instances
+
+
+async def run_strategy(
+    name: LoadBalancingStrategyEnum, args: argparse.Namespace
+) -> Dict[str, float]:
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    tracker = InstanceLoadTracker()
+    strategy = STRATEGIES[name](tracker)
+    simulated = build_instances(args.instances, args.slow_ratio)
+    by_id = {s.instance.id: s for s in simulated}
+    instances = [s.instance for s in simulated]
+    latencies: List[float] = []
+
+    async def one_request(output_tokens: int):
+        instance = await strategy.select_instance(instances)
+        tracker.request_started(instance)
+        try:
+            latencies.append(await by_id[instance.id].serve(output_tokens, tracker))
+        finally:
+            tracker.request_finished(instance)
+
+    tasks = []
+    for _ in range(args.requests):
+        long_generation = rng.random() < args.long_ratio
+        output_tokens = (
+            rng.randint(800, 1500) if long_generation else rng.randint(20, 100)
+        )
+        tasks.append(asyncio.create_task(one_request(output_tokens)))
+        await asyncio.sleep(rng.expovariate(args.rate))
+    await asyncio.gather(*tasks)
+
+    return {
+        "p50": float(numpy.percentile(latencies, 50)),
+        "p95": float(numpy.percentile(latencies, 95)),
+        "p99": float(numpy.percentile(latencies, 99)),
+        "max": float(max(latencies)),
+    }
+
+
+async def main(args: argparse.Namespace):
+    print(
+        f"{'strategy':<30}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}{'max (s)':>10}"
+    )
+    for name in LoadBalancingStrategyEnum:
+        result = await run_strategy(name, args)
+        print(
+            f"{name.value:<30}{result['p50']:>10.3f}{result['p95']:>10.3f}"
+            f"{result['p99']:>10.3f}{result['max']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark load balancing strategies on simulated instances."
+    )
+    parser.add_argument("--instances", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--rate", type=float, default=400, help="Request arrival rate per second."
+    )
+    parser.add_argument(
+        "--long-ratio",
+        type=float,
+        default=0.1,
+        help="Fraction of requests with long generations.",
+    )
+    parser.add_argument(
+        "--slow-ratio",
+        type=float,
+        default=0.25,
+        help="Fraction of instances that are twice as slow.",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,229 @@
+"""
+Compare placing the replicas of a model one scheduling pass at a time with
+placing them in one batch pass against the allocation index, on synthetic
+workers.
+
+The one-at-a-time mode rebuilds the worker and model instance lists for
+every replica, as loading them from the database did, and computes
+allocations by scanning the instance list. The batch mode places all
+replicas against one allocation index. Filters that query the database are
+left out of both modes.
+
+Usage:
+    python benchmarks/benchmark_scheduler.py --workers 64 --replicas 64
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+from unittest import mock
+
+from gpustack import envs
+from gpustack.config.config import Config
+from gpustack.policies.worker_filters.backend_framework_filter import (
+    BackendFrameworkFilter,
+)
+from gpustack.scheduler.allocation_index import AllocationIndex
+from gpustack.scheduler.scheduler import (
+    apply_candidate,
+    find_candidate,
+    place_instances,
+)
+from gpustack.schemas.models import (
+    BackendEnum,
+    ComputedResourceClaim,
+    Model,
+    ModelInstance,
+    ModelInstanceStateEnum,
+    PlacementStrategyEnum,
+    SourceEnum,
+)
+from gpustack.schemas.workers import (
+    GPUDeviceStatus,
+    MemoryInfo,
+    SystemReserved,
+    Worker,
+    WorkerStateEnum,
+    WorkerStatus,
+)
+
+GiB = 1024**3
+
+
+def build_workers(count: int, gpus: int, gpu_memory: int) -> List[Worker]:
+    workers = []
+    for i in range(count):
+        status = WorkerStatus.get_default_status()
+        status.memory = MemoryInfo(total=1024 * GiB, is_unified_memory=False)
+        status.gpu_devices = [
+            GPUDeviceStatus(
+                vendor="nvidia",
+                type="cuda",
+                index=index,
+                name="NVIDIA H100 80GB HBM3",
+                memory=MemoryInfo(total=gpu_memory * GiB),
+            )
+            for index in range(gpus)
+        ]
+        workers.append(
+            Worker(
+                id=i + 1,
+                name=f"worker-{i + 1}",
+                hostname=f"worker-{i + 1}",
+                ip=f"10.0.{i // 256}.{i % 256}",
+                ifname="eth0",
+                port=10150,
+                worker_uuid=f"worker-{i + 1}",
+                cluster_id=1,
+                state=WorkerStateEnum.READY,
+                status=status,
+                system_reserved=SystemReserved(ram=0, vram=0),
+            )
+        )
+    return workers
+
+
+def build_model(id: int, replicas: int, vram: int) -> Model:
+    return Model(
+        id=id,
+        name=f"model-{id}",
+        replicas=replicas,
+        source=SourceEnum.HUGGING_FACE,
+        huggingface_repo_id=f"synthetic/model-{id}",
+        backend=BackendEnum.CUSTOM,
+        backend_version="0.0.0",
+        cluster_id=1,
+        placement_strategy=PlacementStrategyEnum.BINPACK,
+        distributable=False,
+        env={"GPUSTACK_MODEL_VRAM_CLAIM": str(vram * GiB)},
+    )
+
+
+def build_running_instances(
+    workers: List[Worker], per_worker: int, vram: int
+) -> List[ModelInstance]:
+    instances = []
+    for worker in workers:
+        for gpu_index in range(per_worker):
+            instances.append(
+                ModelInstance(
+                    id=len(instances) + 1,
+                    name=f"running-{len(instances) + 1}",
+                    model_id=1000 + gpu_index,
+                    model_name="running",
+                    source=SourceEnum.HUGGING_FACE,
+                    state=ModelInstanceStateEnum.RUNNING,
+                    worker_id=worker.id,
+                    gpu_type="cuda",
+                    gpu_indexes=[gpu_index],
+                    computed_resource_claim=ComputedResourceClaim(
+                        ram=0, vram={gpu_index: vram * GiB}
+                    ),
+                )
+            )
+    return instances
+
+
+def build_pending_instances(
+    model: Model, first_id: int, count: int
+) -> List[ModelInstance]:
+    return [
+        ModelInstance(
+            id=first_id + i,
+            name=f"{model.name}-{i}",
+            model_id=model.id,
+            model_name=model.name,
+            source=model.source,
+            state=ModelInstanceStateEnum.ANALYZING,
+        )
+        for i in range(count)
+    ]
+
+
+async def one_at_a_time(
+    config: Config,
+    model: Model,
+    workers: List[Worker],
+    running: List[ModelInstance],
+    pending: List[ModelInstance],
+) -> Tuple[float, int]:
+    placed = []
+    start = time.perf_counter()
+    for instance in pending:
+        candidate, _ = await find_candidate(
+            config,
+            model,
+            [w.model_copy(deep=True) for w in workers],
+            [i.model_copy(deep=True) for i in running + placed + [instance]],
+        )
+        if candidate is not None:
+            apply_candidate(instance, model, candidate)
+            placed.append(instance)
+    return time.perf_counter() - start, len(placed)
+
+
+async def batch(
+    config: Config,
+    model: Model,
+    workers: List[Worker],
+    running: List[ModelInstance],
+    pending: List[ModelInstance],
+) -> Tuple[float, int]:
+    index = AllocationIndex()
+    for worker in workers:
+        index.upsert_worker(worker)
+    for instance in running + pending:
+        index.upsert(instance)
+
+    start = time.perf_counter()
+    results = await place_instances(config, model, pending, index)
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(1 for candidate, _, _ in results if candidate is not None)
+
+
+async def main(args: argparse.Namespace):
+    config = Config(token="benchmark", data_dir="/tmp/gpustack-benchmark")
+    workers = build_workers(args.workers, args.gpus, args.gpu_memory)
+    running = build_running_instances(workers, args.running_per_worker, args.vram)
+    model = build_model(1, args.replicas, args.vram)
+
+    print(f"{'mode':<16}{'placed':>10}{'total (s)':>12}{'per replica (ms)':>20}")
+    for name, run in (("one-at-a-time", one_at_a_time), ("batch", batch)):
+        pending = build_pending_instances(model, len(running) + 1, args.replicas)
+        elapsed, placed = await run(config, model, workers, running, pending)
+        print(
+            f"{name:<16}{placed:>10}{elapsed:>12.3f}"
+            f"{elapsed / args.replicas * 1000:>20.2f}"
+        )
+
+
+async def passthrough(self, workers):
+    return workers, []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark scheduling passes on synthetic workers."
+    )
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--gpus", type=int, default=8, help="GPUs per worker.")
+    parser.add_argument(
+        "--gpu-memory", type=int, default=80, help="Memory per GPU in GiB."
+    )
+    parser.add_argument(
+        "--running-per-worker",
+        type=int,
+        default=4,
+        help="Running model instances per worker, one GPU each.",
+    )
+    parser.add_argument("--replicas", type=int, default=64)
+    parser.add_argument(
+        "--vram", type=int, default=40, help="VRAM claim per replica in GiB."
+    )
+    args = parser.parse_args()
+
+    # The locality scorer and the backend framework filter query the database.
+    envs.SCHEDULER_SCALE_UP_LOCALITY_MAX_SCORE = 0
+    with mock.patch.object(BackendFrameworkFilter, "filter", passthrough):
+        asyncio.run(main(args))
@@ -1,8 +1,10 @@
 from datetime import date, datetime, timezone
 import json
 import logging
+import re
 import time
-from typing import Type, Union
+from types import SimpleNamespace
+from typing import AsyncIterator, Type, Union
 from fastapi import Request, Response, status
 from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
 from jwt import DecodeError, ExpiredSignatureError
@@ -24,9 +26,8 @@ from gpustack.schemas.users import User
 from gpustack.security import JWTManager
 from gpustack import envs
 from gpustack.api.auth import SESSION_COOKIE_NAME
-from gpustack.server.db import async_session
 
-from gpustack.server.services import ModelUsageService
+from gpustack.server.usage_buffer import record_usage
 from gpustack.api.types.openai_ext import CreateEmbeddingResponseExt, CompletionExt
 
 
@@ -171,28 +172,17 @@ async def record_model_usage(
 
     user: User = request.state.user
     model: Model = request.state.model
-    fields = {
-        "user_id": user.id,
-        "model_id": model.id,
-        "model_name": model.name,
-        "date": date.today(),
-        "operation": operation,
-    }
     model_usage = ModelUsage(
-        **fields,
+        user_id=user.id,
+        model_id=model.id,
+        model_name=model.name,
+        date=date.today(),
+        operation=operation,
         completion_token_count=completion_tokens,
         prompt_token_count=prompt_tokens,
         request_count=1,
     )
-    async with async_session() as session:
-        model_usage_service = ModelUsageService(session)
-        current_model_usage = await model_usage_service.get_by_fields(fields)
-        if current_model_usage:
-            await model_usage_service.update(
-                current_model_usage, completion_tokens, prompt_tokens
-            )
-        else:
-            await model_usage_service.create(model_usage)
+    record_usage(model_usage)
 
 
 async def handle_streaming_response(
@@ -203,6 +193,12 @@ async def handle_streaming_response(
     ],
     operation: OperationEnum,
 ):
+    if getattr(request.state, "stream_passthrough", False):
+        return StreamingResponse(
+            passthrough_streaming_generator(request, response.body_iterator, operation),
+            headers=response.headers,
+        )
+
     async def streaming_generator():
         async for chunk in response.body_iterator:
             try:
@@ -262,6 +258,82 @@ async def process_chunk(
             yield f"{line}\n\n".encode("utf-8")
 
 
+# Matches a usage object, skipping the `"usage":null` carried by every chunk
+# when stream_options.include_usage is set.
+USAGE_OBJECT_PATTERN = re.compile(rb'"usage"\s*:\s*\{')
+
+
+async def passthrough_streaming_generator(
+    request: Request,
+    body_iterator: AsyncIterator[bytes],
+    operation: OperationEnum,
+):
+    """
+    Forward upstream bytes unchanged, except for the data lines carrying
+    usage. Chunks are only searched for a usage object; a line is decoded
+    and parsed only when it matches. Bytes after the last newline are held
+    back until the line completes, so a usage line is never split.
+    """
+    pending = b""
+    async for chunk in body_iterator:
+        if not hasattr(request.state, 'first_token_time'):
+            request.state.first_token_time = datetime.now(timezone.utc)
+
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = pending + chunk if pending else chunk
+        end = data.rfind(b"\n") + 1
+        complete, pending = data[:end], data[end:]
+        if complete:
+            yield await process_usage_lines(complete, request, operation)
+
+    if pending:
+        yield await process_usage_lines(pending, request, operation)
+
+
+async def process_usage_lines(
+    data: bytes, request: Request, operation: OperationEnum
+) -> bytes:
+    if USAGE_OBJECT_PATTERN.search(data) is None:
+        return data
+
+    lines = data.split(b"\n")
+    for i, line in enumerate(lines):
+        if not line.startswith(b"data:") or not USAGE_OBJECT_PATTERN.search(line):
+            continue
+        try:
+            response_dict = json.loads(line[len(b"data:") :])
+            if not is_usage_dict(response_dict):
+                continue
+
+            usage = response_dict["usage"]
+            await record_model_usage(request, SimpleNamespace(**usage), operation)
+            if should_add_metrics(response_dict):
+                add_metrics(
+                    response_dict,
+                    request,
+                    SimpleNamespace(usage=SimpleNamespace(**usage)),
+                )
+                lines[i] = b"data: " + json.dumps(
+                    response_dict, separators=(',', ':')
+                ).encode("utf-8")
+        except Exception as e:
+            logger.error(f"Error processing streaming usage: {e}")
+
+    return b"\n".join(lines)
+
+
+def is_usage_dict(response_dict) -> bool:
+    if not isinstance(response_dict, dict) or not response_dict.get("usage"):
+        return False
+
+    choices = response_dict.get("choices")
+    if not choices:
+        return True
+
+    return any(choice.get("finish_reason") is not None for choice in choices)
+
+
 def should_add_metrics(response_dict):
     if not isinstance(response_dict, dict):
         return False
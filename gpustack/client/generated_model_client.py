@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 import threading
-from typing import Any, Callable, Dict, Optional, Union, Awaitable
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, Awaitable
 
 import httpx
 from gpustack.api.exceptions import (
@@ -24,9 +24,16 @@ class ModelClient:
         self._url = "/models"
         self._enable_cache = enable_cache
         self._cache: Dict[int, ModelPublic] = {}
+        # Indexes of the cache by field and value, built when a field is
+        # first filtered on and kept up to date with the cache.
+        self._indexes: Dict[str, Dict[Optional[str], Dict[int, ModelPublic]]] = {}
+        # Filtered items by filters, dropped when the cache changes.
+        self._snapshots: Dict[frozenset, Tuple[ModelPublic, ...]] = {}
         self._cache_lock = None
         self._watch_started = False
         self._initial_sync_logged = False
+        # Resource versions to resume watches from, keyed by watch params.
+        self._resource_versions: Dict[frozenset, int] = {}
 
     def _get_cache_lock(self):
         """Lazy initialization of cache lock."""
@@ -77,28 +84,20 @@ class ModelClient:
 
         Note: Cache is automatically populated when awatch() is called.
         The first call to awatch() will set _watch_started=True and enable caching.
+        The returned list is a copy, the items in it are shared with other
+        callers and must not be modified.
         """
-        # Get all cached items
+        # Skip non-filter params like 'watch'
+        filters = {
+            key: str(value) for key, value in (params or {}).items() if key != 'watch'
+        }
+        snapshot_key = frozenset(filters.items())
+
         with self._get_cache_lock():
-            all_items = list(self._cache.values())
-
-        # Apply filters if params provided
-        if params:
-            filtered_items = []
-            for item in all_items:
-                match = True
-                for key, value in params.items():
-                    # Skip non-filter params like 'watch'
-                    if key == 'watch':
-                        continue
-                    # Convert attribute to string for comparison
-                    attr_value = getattr(item, key, None)
-                    if attr_value is not None and str(attr_value) != str(value):
-                        match = False
-                        break
-                if match:
-                    filtered_items.append(item)
-            all_items = filtered_items
+            all_items = self._snapshots.get(snapshot_key)
+            if all_items is None:
+                all_items = tuple(self._filter_cache(filters))
+                self._snapshots[snapshot_key] = all_items
 
         # Return in the same format as the original list()
         total = len(all_items)
@@ -111,7 +110,65 @@ class ModelClient:
             totalPage=1 if total > 0 else 0,
         )
 
-        return ModelsPublic(items=all_items, total=total, pagination=pagination)
+        return ModelsPublic.model_construct(
+            items=list(all_items), pagination=pagination
+        )
+
+    def _filter_cache(self, filters: Dict[str, str]) -> List[ModelPublic]:
+        """
+        Return the cached items matching the filters, looked up in the
+        indexes. Items without a value for a field match any value.
+        Must be called with the cache lock held.
+        """
+        if not filters:
+            return list(self._cache.values())
+
+        # Start from the field with the fewest matches, check the others.
+        matches = []
+        for key, value in filters.items():
+            index = self._get_index(key)
+            matches.append((index.get(value, {}), index.get(None, {})))
+        matches.sort(key=lambda match: len(match[0]) + len(match[1]))
+
+        items = []
+        for candidates in matches[0]:
+            for id, item in candidates.items():
+                if all(id in found or id in unset for found, unset in matches[1:]):
+                    items.append(item)
+        return items
+
+    def _get_index(self, key: str) -> Dict[Optional[str], Dict[int, ModelPublic]]:
+        """Return the index of the field, building it on first use."""
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            for item in self._cache.values():
+                index.setdefault(_index_value(item, key), {})[item.id] = item
+            self._indexes[key] = index
+        return index
+
+    def _put_cached(self, item: ModelPublic):
+        """Store the item in the cache. Must be called with the cache lock held."""
+        self._pop_cached(item.id)
+        self._cache[item.id] = item
+        for key, index in self._indexes.items():
+            index.setdefault(_index_value(item, key), {})[item.id] = item
+        self._snapshots.clear()
+
+    def _pop_cached(self, id: int):
+        """Remove the item from the cache. Must be called with the cache lock held."""
+        item = self._cache.pop(id, None)
+        if item is None:
+            return
+
+        for key, index in self._indexes.items():
+            value = _index_value(item, key)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(id, None)
+                if not bucket:
+                    del index[value]
+        self._snapshots.clear()
 
     def _update_cache_from_event(self, event: Event):
         """Update cache based on received event."""
@@ -125,10 +182,10 @@ class ModelClient:
 
             with self._get_cache_lock():
                 if event.type == EventType.DELETED:
-                    self._cache.pop(item.id, None)
+                    self._pop_cached(item.id)
                     logger.debug(f"Cache: removed model {item.id}")
                 else:  # CREATED or UPDATED
-                    self._cache[item.id] = item
+                    self._put_cached(item)
                     logger.trace(f"Cache: updated model {item.id}")
         except Exception as e:
             logger.error(f"Failed to update models cache from event: {e}")
@@ -167,10 +224,20 @@ class ModelClient:
         stop_condition: Optional[Callable[[Event], bool]] = None,
         params: Optional[Dict[str, Any]] = None,
     ):
-        if params is None:
-            params = {}
+        params = dict(params or {})
         params["watch"] = "true"
 
+        # Resume from the last version received if the watch was started
+        # from a version, e.g. 0 to list first, the server lists everything
+        # again if it can't. Other watches are squashed and don't get versions.
+        watch_key = frozenset(
+            (key, str(value))
+            for key, value in params.items()
+            if key != "resource_version"
+        )
+        if watch_key in self._resource_versions:
+            params["resource_version"] = self._resource_versions[watch_key]
+
         if stop_condition is None:
             stop_condition = lambda event: False
 
@@ -194,6 +261,10 @@ class ModelClient:
                     if line:
                         event_data = json.loads(line)
                         event = Event(**event_data)
+                        if event.resource_version is not None:
+                            self._resource_versions[watch_key] = event.resource_version
+                        if event.type == EventType.HEARTBEAT:
+                            continue
 
                         # Update cache if enabled
                         if self._enable_cache:
@@ -254,7 +325,7 @@ class ModelClient:
         # Update cache if enabled
         if self._enable_cache:
             with self._get_cache_lock():
-                self._cache[id] = result
+                self._put_cached(result)
 
         return result
 
@@ -279,3 +350,9 @@ class ModelClient:
     def delete(self, id: int):
         response = self._client.get_httpx_client().delete(f"{self._url}/{id}")
         raise_if_response_error(response)
+
+
+def _index_value(item: Any, key: str) -> Optional[str]:
+    """Return the value of the field as compared by list filters."""
+    value = getattr(item, key, None)
+    return None if value is None else str(value)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from gpustack.api.exceptions import raise_if_response_error
 from gpustack.schemas.workers import (
     WorkerStatusPublic,
@@ -12,11 +14,12 @@ class WorkerStatusClient:
         self._client = client
         self._url = "/worker-status"
 
-    def create(self, model_create: WorkerStatusPublic):
+    def create(self, model_create: WorkerStatusPublic, digest: Optional[str] = None):
         response = self._client.get_httpx_client().post(
             self._url,
             content=model_create.model_dump_json(),
             headers={"Content-Type": "application/json"},
+            params={"digest": digest} if digest else None,
         )
         raise_if_response_error(response)
         return None
@@ -30,6 +33,13 @@ class WorkerStatusClient:
         raise_if_response_error(response)
         return None
 
+    def update(self, delta: dict, baseline: str, digest: str):
+        response = self._client.get_httpx_client().patch(
+            self._url, json=delta, params={"baseline": baseline, "digest": digest}
+        )
+        raise_if_response_error(response)
+        return None
+
 
 class WorkerRegistrationClient:
     def __init__(self, client: HTTPClient):
@@ -13,6 +13,20 @@ PROXY_TIMEOUT = int(os.getenv("GPUSTACK_PROXY_TIMEOUT_SECONDS", 1800))
 PROXY_UPSTREAM_IDLE_TIMEOUT = int(
     os.getenv("GPUSTACK_PROXY_UPSTREAM_IDLE_TIMEOUT_SECONDS", 3)
 )
+# Load balancing strategy for the OpenAI proxy: round_robin,
+# least_outstanding_requests, power_of_two_choices or ewma_ttft.
+# Can be overridden per model with the same variable in the model env.
+PROXY_LOAD_BALANCING_STRATEGY = os.getenv(
+    "GPUSTACK_LOAD_BALANCING_STRATEGY", "round_robin"
+)
+PROXY_LOAD_BALANCING_EWMA_DECAY = float(
+    os.getenv("GPUSTACK_LOAD_BALANCING_EWMA_DECAY", 0.8)
+)
+# Forward streaming responses from model instances unchanged, only scanning
+# frames that carry a usage object instead of re-framing every line.
+PROXY_STREAM_PASSTHROUGH = os.getenv(
+    "GPUSTACK_PROXY_STREAM_PASSTHROUGH", "false"
+).lower() in ["true", "1"]
 
 # HTTP client TCP connector configuration
 TCP_CONNECTOR_LIMIT = int(os.getenv("GPUSTACK_TCP_CONNECTOR_LIMIT", 1000))
@@ -31,6 +45,34 @@ SERVER_CACHE_LOCKS_MAX_SIZE = int(
     os.getenv("GPUSTACK_SERVER_CACHE_LOCKS_MAX_SIZE", 10000)
 )
 
+# Event bus
+# Backend sharing change events between servers: local or postgresql.
+EVENT_BUS_BACKEND = os.getenv("GPUSTACK_EVENT_BUS_BACKEND", "local").lower()
+EVENT_BUS_SUBSCRIBER_QUEUE_SIZE = int(
+    os.getenv("GPUSTACK_EVENT_BUS_SUBSCRIBER_QUEUE_SIZE", 1024)
+)
+# Number of latest events kept per topic for watches resuming from a
+# resource version.
+EVENT_BUS_HISTORY_SIZE = int(os.getenv("GPUSTACK_EVENT_BUS_HISTORY_SIZE", 1000))
+# Overflow policy of API watch streams: drop_oldest, coalesce or disconnect.
+# Internal controllers always coalesce.
+EVENT_BUS_WATCH_OVERFLOW_POLICY = os.getenv(
+    "GPUSTACK_EVENT_BUS_WATCH_OVERFLOW_POLICY", "disconnect"
+).lower()
+
+# Server controllers
+# Max number of objects reconciled concurrently by each controller.
+CONTROLLER_CONCURRENCY = int(os.getenv("GPUSTACK_CONTROLLER_CONCURRENCY", 8))
+# Failed reconciles are retried with exponential backoff from the base delay,
+# up to the max delay in seconds and max retries.
+CONTROLLER_MAX_RETRIES = int(os.getenv("GPUSTACK_CONTROLLER_MAX_RETRIES", 5))
+CONTROLLER_RETRY_BASE_DELAY = float(
+    os.getenv("GPUSTACK_CONTROLLER_RETRY_BASE_DELAY", 1.0)
+)
+CONTROLLER_RETRY_MAX_DELAY = float(
+    os.getenv("GPUSTACK_CONTROLLER_RETRY_MAX_DELAY", 60.0)
+)
+
 # Worker configuration
 WORKER_HEARTBEAT_INTERVAL = int(
     os.getenv("GPUSTACK_WORKER_HEARTBEAT_INTERVAL", 30)
@@ -38,6 +80,15 @@ WORKER_HEARTBEAT_INTERVAL = int(
 WORKER_STATUS_SYNC_INTERVAL = int(
     os.getenv("GPUSTACK_WORKER_STATUS_SYNC_INTERVAL", 30)
 )  # in seconds
+# Between full status reports, workers only report the status fields that
+# changed, ignoring numeric changes within this fraction, e.g. GPU memory used
+# within 1% of the total.
+WORKER_STATUS_DELTA_THRESHOLD = float(
+    os.getenv("GPUSTACK_WORKER_STATUS_DELTA_THRESHOLD", 0.01)
+)
+WORKER_STATUS_FULL_SYNC_INTERVAL = int(
+    os.getenv("GPUSTACK_WORKER_STATUS_FULL_SYNC_INTERVAL", 600)
+)  # in seconds, 0 to always report the full status
 WORKER_HEARTBEAT_GRACE_PERIOD = int(
     os.getenv("GPUSTACK_WORKER_HEARTBEAT_GRACE_PERIOD", 150)
 )  # 2.5 minutes in seconds
@@ -55,6 +106,18 @@ WORKER_UNREACHABLE_CHECK_MODE = os.getenv(
     "GPUSTACK_WORKER_UNREACHABLE_CHECK_MODE", "auto"
 ).lower()
 
+# Model file download configuration
+# Files at least this large are downloaded from Hugging Face in byte range
+# chunks fetched concurrently, 0 to disable. Xet storage files are left to the
+# Hugging Face client, which chunks them already.
+DOWNLOAD_CHUNKED_MIN_SIZE = int(
+    os.getenv("GPUSTACK_DOWNLOAD_CHUNKED_MIN_SIZE", 256 * 1024**2)
+)  # in bytes
+DOWNLOAD_CHUNK_SIZE = int(
+    os.getenv("GPUSTACK_DOWNLOAD_CHUNK_SIZE", 64 * 1024**2)
+)  # in bytes
+DOWNLOAD_CHUNK_CONCURRENCY = int(os.getenv("GPUSTACK_DOWNLOAD_CHUNK_CONCURRENCY", 8))
+
 # Model instance configuration
 MODEL_INSTANCE_RESCHEDULE_GRACE_PERIOD = int(
     os.getenv("GPUSTACK_MODEL_INSTANCE_RESCHEDULE_GRACE_PERIOD", 300)
@@ -84,6 +147,33 @@ SCHEDULER_SCALE_UP_PLACEMENT_MAX_SCORE = float(
 SCHEDULER_SCALE_UP_LOCALITY_MAX_SCORE = float(
     os.getenv("GPUSTACK_SCHEDULER_SCALE_UP_LOCALITY_MAX_SCORE", 5)
 )
+# Max number of queued model instances placed in one scheduling pass
+SCHEDULER_BATCH_SIZE = max(int(os.getenv("GPUSTACK_SCHEDULER_BATCH_SIZE", 64)), 1)
+# Estimate GGUF model resource claims from the file header in-process, falling
+# back to gguf-parser for models the native estimator does not support.
+# Estimates may be slightly below gguf-parser ones, so it is opt-in.
+SCHEDULER_GGUF_NATIVE_ESTIMATE = os.getenv(
+    "GPUSTACK_SCHEDULER_GGUF_NATIVE_ESTIMATE", "false"
+).lower() in ["true", "1"]
+# Max number of GPU combinations checked and seconds spent per GGUF model
+# placement, the best candidates found within the budget are used
+SCHEDULER_GGUF_COMBINATION_SEARCH_MAX_COUNT = int(
+    os.getenv("GPUSTACK_SCHEDULER_GGUF_COMBINATION_SEARCH_MAX_COUNT", 1024)
+)
+SCHEDULER_GGUF_COMBINATION_SEARCH_TIMEOUT = float(
+    os.getenv("GPUSTACK_SCHEDULER_GGUF_COMBINATION_SEARCH_TIMEOUT", 60)
+)
+# Resource estimates and pretrained configs shared across scheduling decisions
+SCHEDULER_ESTIMATE_CACHE_MAX_SIZE = int(
+    os.getenv("GPUSTACK_SCHEDULER_ESTIMATE_CACHE_MAX_SIZE", 4096)
+)
+SCHEDULER_ESTIMATE_CACHE_TTL = int(
+    os.getenv("GPUSTACK_SCHEDULER_ESTIMATE_CACHE_TTL", 86400)
+)
+# Persist GGUF estimates under the cache directory to reuse them after restarts
+SCHEDULER_ESTIMATE_CACHE_PERSIST = os.getenv(
+    "GPUSTACK_SCHEDULER_ESTIMATE_CACHE_PERSIST", "true"
+).lower() in ["true", "1"]
 # Scale-down scoring weights (relative, normalized in score chain)
 SCHEDULER_SCALE_DOWN_STATUS_MAX_SCORE = float(
     os.getenv("GPUSTACK_SCHEDULER_SCALE_DOWN_STATUS_MAX_SCORE", 100)
@@ -113,6 +203,14 @@ GATEWAY_MIRROR_INGRESS_NAME = os.getenv(
 
 GATEWAY_EXTERNAL_METRICS_URL = os.getenv("GPUSTACK_GATEWAY_EXTERNAL_METRICS_URL", None)
 
+# Seconds to wait before applying a gateway resource change, so a burst of
+# changes is applied once, and seconds after which a sync applies unchanged
+# gateway resources again.
+GATEWAY_SYNC_DEBOUNCE = float(os.getenv("GPUSTACK_GATEWAY_SYNC_DEBOUNCE", 0.5))
+GATEWAY_SYNC_RESYNC_PERIOD = float(
+    os.getenv("GPUSTACK_GATEWAY_SYNC_RESYNC_PERIOD", 600)
+)
+
 GATEWAY_AI_STATISTICS_PLUGIN_CONTENT_TYPES = [
     ct.strip()
     for ct in os.getenv(
@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from prometheus_client import Counter
+
+from gpustack import envs
+from gpustack.utils.name import metric_name
+
+logger = logging.getLogger(__name__)
+
+gateway_sync_requests = Counter(
+    metric_name("gateway_sync_requests"),
+    "Requests to sync gateway resources, by whether they are applied, failed, "
+    "skipped as unchanged or merged into a pending apply",
+    ["kind", "result"],
+)
+
+
+def spec_digest(desired: Any) -> str:
+    """Return the digest of a desired state made of plain data and models."""
+
+    def default(value):
+        if hasattr(value, "model_dump"):
+            return value.model_dump(exclude_none=True)
+        if hasattr(value, "to_dict"):
+            return value.to_dict()
+        return str(value)
+
+    return hashlib.sha256(
+        json.dumps(desired, sort_keys=True, default=default).encode()
+    ).hexdigest()
+
+
+class GatewaySync:
+    """
+    Apply the desired state of gateway resources, skipping unchanged ones.
+
+    A key identifies the desired state of a gateway object, or of the part of
+    a shared object owned by one model route, e.g. its match rules in the
+    model mapper WasmPlugin. The digest of the state last applied per key is
+    kept, so syncing an unchanged state does not call the Kubernetes API.
+    An unchanged state is applied again when synced after the resync period.
+    There is no timer, states are only applied on syncs and retries.
+
+    Applies run in the background after the debounce delay. A burst of syncs
+    of the same key is applied once, with the latest desired state. Applies
+    to the same object run one at a time. A failed apply is retried with
+    exponential backoff until it succeeds or a newer state replaces it.
+
+    Keys synced as deleted, e.g. the ingress of a deleted model route, may
+    never be synced again. Their entries are dropped once the deletion is
+    applied, except for the state applied last, which is kept until the
+    resync period is over to skip repeated deletions.
+    """
+
+    def __init__(
+        self,
+        debounce: float = envs.GATEWAY_SYNC_DEBOUNCE,
+        resync_period: float = envs.GATEWAY_SYNC_RESYNC_PERIOD,
+        retry_base_delay: float = envs.CONTROLLER_RETRY_BASE_DELAY,
+        retry_max_delay: float = envs.CONTROLLER_RETRY_MAX_DELAY,
+    ):
+        self._debounce = debounce
+        self._resync_period = resync_period
+        self._retry_base_delay = retry_base_delay
+        self._retry_max_delay = retry_max_delay
+        # Digest and time of the state last applied, by key.
+        self._applied: Dict[Hashable, Tuple[str, float]] = {}
+        # Digest, apply function, object and whether the state is a deletion,
+        # of the state to apply, by key.
+        self._pending: Dict[
+            Hashable, Tuple[str, Callable[[], Awaitable[Any]], Hashable, bool]
+        ] = {}
+        # Digest of the state taken from pending and not applied yet, by key.
+        self._in_flight: Dict[Hashable, str] = {}
+        # Failed applies in a row, by key.
+        self._failures: Dict[Hashable, int] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # Keys whose deletion is the state applied last.
+        self._deleted: Set[Hashable] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def sync(
+        self,
+        key: Tuple,
+        desired: Any,
+        apply: Callable[[], Awaitable[Any]],
+        object_key: Optional[Tuple] = None,
+        deleted: bool = False,
+    ) -> bool:
+        """
+        Apply the desired state of the key with the apply function, unless it
+        is the state applied last. The first item of the key is the kind of
+        the object, and object_key identifies the object if it is shared by
+        several keys. deleted tells that the state removes what the key owns.
+        Returns whether an apply is pending.
+        """
+        self._forget_deleted()
+        digest = spec_digest(desired)
+        kind = key[0]
+        if key in self._pending:
+            self._pending[key] = (digest, apply, object_key or key, deleted)
+            gateway_sync_requests.labels(kind, "merged").inc()
+            return True
+
+        # The state being applied wins over the one applied last.
+        in_flight = self._in_flight.get(key)
+        if (
+            in_flight == digest
+            if in_flight is not None
+            else self._is_applied(key, digest)
+        ):
+            gateway_sync_requests.labels(kind, "skipped").inc()
+            return False
+
+        self._pending[key] = (digest, apply, object_key or key, deleted)
+        self._schedule(key, self._debounce)
+        return True
+
+    def lock(self, object_key: Tuple) -> asyncio.Lock:
+        """
+        Return the lock held while applying to the object, to hold when
+        writing the object directly instead of syncing it.
+        """
+        return self._locks.setdefault(object_key, asyncio.Lock())
+
+    async def wait(self):
+        """Wait for the pending applies to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _is_applied(self, key: Hashable, digest: str) -> bool:
+        applied = self._applied.get(key)
+        return (
+            applied is not None
+            and applied[0] == digest
+            and time.monotonic() - applied[1] < self._resync_period
+        )
+
+    def _forget_deleted(self):
+        """Drop the deleted keys whose state applied last has expired."""
+        now = time.monotonic()
+        for key in list(self._deleted):
+            applied = self._applied.get(key)
+            if applied is None or now - applied[1] >= self._resync_period:
+                self._applied.pop(key, None)
+                self._deleted.discard(key)
+
+    def _schedule(self, key: Tuple, delay: float):
+        task = asyncio.create_task(self._apply_later(key, delay))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _apply_later(self, key: Tuple, delay: float):
+        await asyncio.sleep(delay)
+        digest, apply, object_key, deleted = self._pending.pop(key)
+        self._in_flight[key] = digest
+
+        try:
+            async with self.lock(object_key):
+                applied = await self._apply(key, digest, apply)
+        finally:
+            # A later apply of the key may be in flight already.
+            if self._in_flight.get(key) == digest:
+                del self._in_flight[key]
+
+        if applied:
+            self._failures.pop(key, None)
+            if not deleted:
+                self._deleted.discard(key)
+            elif key not in self._pending and key not in self._in_flight:
+                self._deleted.add(key)
+                if object_key == key:
+                    # No other key applies to the object.
+                    self._locks.pop(object_key, None)
+            return
+
+        failures = self._failures.get(key, 0)
+        self._failures[key] = failures + 1
+        if key in self._pending:
+            # A newer state is applied instead.
+            return
+
+        delay = min(self._retry_base_delay * 2**failures, self._retry_max_delay)
+        logger.warning(f"Retrying to sync gateway resource {key} in {delay}s")
+        self._pending[key] = (digest, apply, object_key, deleted)
+        self._schedule(key, delay)
+
+    async def _apply(
+        self, key: Tuple, digest: str, apply: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """Apply the state unless it is applied already, returning whether it is."""
+        if self._is_applied(key, digest):
+            gateway_sync_requests.labels(key[0], "skipped").inc()
+            return True
+
+        # Not skipped on the next sync if the apply fails midway.
+        self._applied.pop(key, None)
+        try:
+            await apply()
+        except Exception as e:
+            gateway_sync_requests.labels(key[0], "failed").inc()
+            logger.error(f"Failed to sync gateway resource {key}: {e}")
+            return False
+
+        self._applied[key] = (digest, time.monotonic())
+        gateway_sync_requests.labels(key[0], "applied").inc()
+        return True
+
+
+gateway_sync = GatewaySync()
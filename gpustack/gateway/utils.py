@@ -929,6 +929,26 @@ async def cleanup_ingresses(
         logger.error(f"Error cleaning up {reason} model ingresses: {e}")
 
 
+def model_mcp_bridge_registries(
+    event_type: EventType,
+    model_instances: List[Union[ModelInstance, ModelInstancePublic]],
+    workers: Optional[Dict[int, Worker]] = None,
+) -> List[McpBridgeRegistry]:
+    desired_registry: List[McpBridgeRegistry] = []
+    if event_type == EventType.DELETED:
+        return desired_registry
+    for model_instance in model_instances:
+        worker = (
+            (workers or {}).get(model_instance.worker_id)
+            if model_instance.worker_id
+            else None
+        )
+        registry = model_instance_registry(model_instance, worker=worker)
+        if registry is not None:
+            desired_registry.append(registry)
+    return desired_registry
+
+
 async def ensure_model_mcp_bridge(
     event_type: EventType,
     model_id: int,
@@ -938,18 +958,8 @@ async def ensure_model_mcp_bridge(
     cluster_id: int,
     workers: Optional[Dict[int, Worker]] = None,
 ) -> List[McpBridgeRegistry]:
-    desired_registry: List[McpBridgeRegistry] = []
+    desired_registry = model_mcp_bridge_registries(event_type, model_instances, workers)
     to_delete_prefix: Optional[str] = model_prefix(model_id)
-    if event_type != EventType.DELETED:
-        for model_instance in model_instances:
-            worker = (
-                (workers or {}).get(model_instance.worker_id)
-                if model_instance.worker_id
-                else None
-            )
-            registry = model_instance_registry(model_instance, worker=worker)
-            if registry is not None:
-                desired_registry.append(registry)
     await ensure_mcp_bridge(
         client=networking_higress_api,
         namespace=namespace,
@@ -1,17 +1,61 @@
-from typing import List
+import logging
+from typing import Dict, List, Optional
 
-from gpustack.http_proxy.strategies import LoadBalancingStrategy, RoundRobinStrategy
-from gpustack.schemas.models import ModelInstance
+from gpustack import envs
+from gpustack.http_proxy.strategies import (
+    STRATEGIES,
+    InstanceLoadTracker,
+    LoadBalancingStrategy,
+    LoadBalancingStrategyEnum,
+)
+from gpustack.schemas.models import Model, ModelInstance
+
+logger = logging.getLogger(__name__)
+
+# Model meta key to select the load balancing strategy per model. The meta
+# stays on the server, unlike the env passed to the inference server.
+MODEL_STRATEGY_META_KEY = "load_balancing_strategy"
 
 
 class LoadBalancer:
     def __init__(self, strategy: LoadBalancingStrategy = None):
+        self._tracker = InstanceLoadTracker()
+        self._strategies: Dict[LoadBalancingStrategyEnum, LoadBalancingStrategy] = {
+            name: cls(self._tracker) for name, cls in STRATEGIES.items()
+        }
         if strategy is None:
-            strategy = RoundRobinStrategy()
+            strategy = self._strategies[
+                self._parse_strategy(envs.PROXY_LOAD_BALANCING_STRATEGY)
+                or LoadBalancingStrategyEnum.ROUND_ROBIN
+            ]
         self._strategy = strategy
 
+    @property
+    def tracker(self) -> InstanceLoadTracker:
+        return self._tracker
+
     def set_strategy(self, strategy: LoadBalancingStrategy):
         self._strategy = strategy
 
-    async def get_instance(self, instances: List[ModelInstance]) -> ModelInstance:
-        return await self._strategy.select_instance(instances)
+    def get_strategy(self, model: Optional[Model] = None) -> LoadBalancingStrategy:
+        if model is not None and model.meta:
+            name = self._parse_strategy(model.meta.get(MODEL_STRATEGY_META_KEY))
+            if name is not None:
+                return self._strategies[name]
+        return self._strategy
+
+    async def get_instance(
+        self, instances: List[ModelInstance], model: Optional[Model] = None
+    ) -> ModelInstance:
+        self._tracker.retain(instances)
+        return await self.get_strategy(model).select_instance(instances)
+
+    @staticmethod
+    def _parse_strategy(value: Optional[str]) -> Optional[LoadBalancingStrategyEnum]:
+        if not value:
+            return None
+        try:
+            return LoadBalancingStrategyEnum(value.lower())
+        except ValueError:
+            logger.warning(f"Unknown load balancing strategy: {value}")
+            return None
@@ -0,0 +1,196 @@
+import logging
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from python_multipart.multipart import parse_options_header
+
+logger = logging.getLogger(__name__)
+
+# Limits for the parts that are parsed, aligned with starlette's form parser.
+MAX_HEADERS_SIZE = 16 * 1024
+MAX_FIELD_SIZE = 1024 * 1024
+# File content read before the required fields are found is spooled to disk
+# past this size.
+SPOOL_MAX_SIZE = 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class MultipartForwarder:
+    """
+    Forward a multipart/form-data body as a stream while extracting a few
+    form fields.
+
+    Only the parts up to the first file after the required fields are
+    parsed, everything after is piped from the incoming stream unchanged.
+    Uploaded files are never held in memory as a whole: file content that
+    precedes a required field is spooled to a temporary file. When a
+    required field is missing, the whole body is parsed to look for it.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterator[bytes],
+        content_type: str,
+        required_fields: Tuple[str, ...] = ("model",),
+    ):
+        _, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise ValueError("Missing boundary in multipart/form-data content type")
+
+        self._content_type = content_type
+        self._delimiter = b"--" + boundary
+        self._required_fields = required_fields
+        self._stream = stream.__aiter__()
+        self._exhausted = False
+        self._buffer = bytearray()
+        self._segments: List[Union[bytes, SpooledTemporaryFile]] = []
+        self._field_segments: Dict[str, int] = {}
+        self.fields: Dict[str, str] = {}
+
+    @property
+    def content_type(self) -> str:
+        return self._content_type
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.fields.get(name, default)
+
+    def set_field(self, name: str, value: str):
+        """Replace the value of a parsed field in the forwarded body."""
+        if name not in self._field_segments:
+            raise KeyError(f"Field {name} was not parsed")
+        self.fields[name] = value
+        self._segments[self._field_segments[name]] = value.encode("utf-8")
+
+    async def parse(self):
+        """Read the body until all required fields are found or it ends."""
+        position = await self._find(self._delimiter, MAX_FIELD_SIZE)
+        self._emit(position + len(self._delimiter))
+
+        while True:
+            await self._ensure(2)
+            if self._buffer[:2] != b"\r\n":
+                # Closing delimiter or malformed body, forward the rest as is.
+                return
+
+            headers_end = await self._find(b"\r\n\r\n", MAX_HEADERS_SIZE)
+            name, filename = self._parse_part_headers(
+                bytes(self._buffer[2:headers_end])
+            )
+            self._emit(headers_end + 4)
+
+            if filename is None:
+                end = await self._find(b"\r\n" + self._delimiter, MAX_FIELD_SIZE)
+                value = bytes(self._buffer[:end])
+                if name is not None and name not in self.fields:
+                    self.fields[name] = value.decode("utf-8")
+                    self._field_segments[name] = len(self._segments)
+                self._emit(end)
+            elif all(field in self.fields for field in self._required_fields):
+                return
+            else:
+                await self._spool_until(b"\r\n" + self._delimiter)
+
+            position = await self._find(self._delimiter, MAX_FIELD_SIZE)
+            self._emit(position + len(self._delimiter))
+
+    async def spool(self):
+        """
+        Read the rest of the body into a temporary file, so that it can be
+        forwarded once the incoming request is no longer readable, e.g. from
+        a streaming response.
+        """
+        if self._exhausted:
+            return
+
+        spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self._segments.append(spool)
+        spool.write(self._buffer)
+        self._buffer.clear()
+        async for chunk in self._stream:
+            spool.write(chunk)
+        self._exhausted = True
+
+    async def iter_body(self) -> AsyncIterator[bytes]:
+        for segment in self._segments:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+            segment.seek(0)
+            try:
+                while data := segment.read(READ_CHUNK_SIZE):
+                    yield data
+            finally:
+                segment.close()
+
+        if self._buffer:
+            yield bytes(self._buffer)
+            self._buffer.clear()
+
+        if not self._exhausted:
+            async for chunk in self._stream:
+                yield chunk
+
+    @staticmethod
+    def _parse_part_headers(headers: bytes) -> Tuple[Optional[str], Optional[str]]:
+        for line in headers.split(b"\r\n"):
+            key, _, value = line.partition(b":")
+            if key.strip().lower() != b"content-disposition":
+                continue
+            _, options = parse_options_header(value.strip())
+            name = options.get(b"name")
+            filename = options.get(b"filename")
+            return (
+                name.decode("utf-8") if name is not None else None,
+                filename.decode("utf-8") if filename is not None else None,
+            )
+        return None, None
+
+    def _emit(self, size: int):
+        self._segments.append(bytes(self._buffer[:size]))
+        del self._buffer[:size]
+
+    async def _fill(self) -> bool:
+        while not self._exhausted:
+            try:
+                chunk = await self._stream.__anext__()
+            except StopAsyncIteration:
+                self._exhausted = True
+                break
+            if chunk:
+                self._buffer.extend(chunk)
+                return True
+        return False
+
+    async def _ensure(self, size: int):
+        while len(self._buffer) < size:
+            if not await self._fill():
+                raise ValueError("Unexpected end of multipart body")
+
+    async def _find(self, pattern: bytes, limit: int) -> int:
+        start = 0
+        while True:
+            position = self._buffer.find(pattern, start)
+            if position >= 0:
+                return position
+            if len(self._buffer) > limit:
+                raise ValueError("Multipart part exceeds the size limit")
+            start = max(len(self._buffer) - len(pattern) + 1, 0)
+            if not await self._fill():
+                raise ValueError("Unexpected end of multipart body")
+
+    async def _spool_until(self, pattern: bytes):
+        spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self._segments.append(spool)
+        while True:
+            position = self._buffer.find(pattern)
+            if position >= 0:
+                spool.write(self._buffer[:position])
+                del self._buffer[:position]
+                return
+            keep = len(pattern) - 1
+            if len(self._buffer) > keep:
+                spool.write(self._buffer[: len(self._buffer) - keep])
+                del self._buffer[: len(self._buffer) - keep]
+            if not await self._fill():
+                raise ValueError("Unexpected end of multipart body")
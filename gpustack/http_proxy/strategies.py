@@ -1,35 +1,161 @@
 from abc import ABC, abstractmethod
+from enum import Enum
 import logging
-from typing import Dict, List
-import itertools
+import random
+from typing import Dict, List, Optional, Set
 
+from gpustack import envs
 from gpustack.schemas.models import ModelInstance
 
 logger = logging.getLogger(__name__)
 
 
+class LoadBalancingStrategyEnum(str, Enum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_OUTSTANDING_REQUESTS = "least_outstanding_requests"
+    POWER_OF_TWO_CHOICES = "power_of_two_choices"
+    EWMA_TTFT = "ewma_ttft"
+
+
+class InstanceLoadTracker:
+    """
+    Tracks in-flight requests and an exponentially weighted moving average
+    of time to first token per model instance.
+    """
+
+    def __init__(self, decay: float = envs.PROXY_LOAD_BALANCING_EWMA_DECAY):
+        self._decay = decay
+        self._outstanding: Dict[int, int] = {}
+        self._ewma_ttft: Dict[int, float] = {}
+        # Tracked instance IDs by model ID.
+        self._tracked: Dict[int, Set[int]] = {}
+
+    def outstanding(self, instance: ModelInstance) -> int:
+        return self._outstanding.get(instance.id, 0)
+
+    def ewma_ttft(self, instance: ModelInstance) -> Optional[float]:
+        return self._ewma_ttft.get(instance.id)
+
+    def retain(self, instances: List[ModelInstance]):
+        """
+        Forget the instances of the models of the given instances that are
+        not among them, e.g. deleted or no longer running.
+        """
+        ids = {i.id for i in instances}
+        for model_id in {i.model_id for i in instances}:
+            tracked = self._tracked.get(model_id)
+            if not tracked:
+                continue
+            for id in tracked - ids:
+                self._outstanding.pop(id, None)
+                self._ewma_ttft.pop(id, None)
+            tracked &= ids
+
+    def request_started(self, instance: ModelInstance):
+        self._track(instance)
+        self._outstanding[instance.id] = self._outstanding.get(instance.id, 0) + 1
+
+    def first_token_received(self, instance: ModelInstance, ttft: float):
+        self._track(instance)
+        previous = self._ewma_ttft.get(instance.id)
+        if previous is None:
+            self._ewma_ttft[instance.id] = ttft
+        else:
+            self._ewma_ttft[instance.id] = (
+                self._decay * previous + (1 - self._decay) * ttft
+            )
+
+    def request_finished(self, instance: ModelInstance):
+        count = self._outstanding.get(instance.id, 0) - 1
+        if count > 0:
+            self._outstanding[instance.id] = count
+        else:
+            self._outstanding.pop(instance.id, None)
+
+    def _track(self, instance: ModelInstance):
+        self._tracked.setdefault(instance.model_id, set()).add(instance.id)
+
+
 class LoadBalancingStrategy(ABC):
 
+    def __init__(self, tracker: Optional[InstanceLoadTracker] = None):
+        self._tracker = tracker or InstanceLoadTracker()
+
     @abstractmethod
     async def select_instance(self, instances: List[ModelInstance]) -> ModelInstance:
         pass
 
 
 class RoundRobinStrategy(LoadBalancingStrategy):
-    def __init__(self):
-        self._iterators: Dict[int, itertools.cycle] = {}
-        self._instance_lists: Dict[int, List[ModelInstance]] = {}
+    def __init__(self, tracker: Optional[InstanceLoadTracker] = None):
+        super().__init__(tracker)
+        self._counters: Dict[int, int] = {}
 
     async def select_instance(self, instances: List[ModelInstance]) -> ModelInstance:
         if len(instances) == 0:
             raise Exception("No instances available")
         model_id = instances[0].model_id
-        if (
-            model_id not in self._iterators
-            or self._instance_lists[model_id] != instances
-        ):
-            logger.debug(f"Creating new iterator for model {model_id}")
-            self._iterators[model_id] = itertools.cycle(instances)
-            self._instance_lists[model_id] = instances
-
-        return next(self._iterators[model_id])
+        counter = self._counters.get(model_id, 0)
+        self._counters[model_id] = counter + 1
+        return instances[counter % len(instances)]
+
+
+class LeastOutstandingRequestsStrategy(LoadBalancingStrategy):
+    """Pick the instance with the fewest in-flight requests."""
+
+    async def select_instance(self, instances: List[ModelInstance]) -> ModelInstance:
+        if len(instances) == 0:
+            raise Exception("No instances available")
+        least = min(self._tracker.outstanding(i) for i in instances)
+        candidates = [i for i in instances if self._tracker.outstanding(i) == least]
+        return random.choice(candidates)
+
+
+class PowerOfTwoChoicesStrategy(LoadBalancingStrategy):
+    """
+    Sample two instances at random and pick the one with fewer in-flight
+    requests. Avoids the herding of a global minimum under bursts.
+    """
+
+    async def select_instance(self, instances: List[ModelInstance]) -> ModelInstance:
+        if len(instances) == 0:
+            raise Exception("No instances available")
+        if len(instances) == 1:
+            return instances[0]
+        first, second = random.sample(instances, 2)
+        if self._tracker.outstanding(second) < self._tracker.outstanding(first):
+            return second
+        return first
+
+
+class EWMATTFTStrategy(LoadBalancingStrategy):
+    """
+    Pick the instance with the lowest expected wait, estimated as the EWMA
+    time to first token scaled by the in-flight requests. Instances without
+    samples are tried first so that every instance gets measured.
+    """
+
+    async def select_instance(self, instances: List[ModelInstance]) -> ModelInstance:
+        if len(instances) == 0:
+            raise Exception("No instances available")
+
+        unmeasured = [i for i in instances if self._tracker.ewma_ttft(i) is None]
+        if unmeasured:
+            least = min(self._tracker.outstanding(i) for i in unmeasured)
+            return random.choice(
+                [i for i in unmeasured if self._tracker.outstanding(i) == least]
+            )
+
+        return min(
+            instances,
+            key=lambda i: self._tracker.ewma_ttft(i)
+            * (self._tracker.outstanding(i) + 1),
+        )
+
+
+STRATEGIES = {
+    LoadBalancingStrategyEnum.ROUND_ROBIN: RoundRobinStrategy,
+    LoadBalancingStrategyEnum.LEAST_OUTSTANDING_REQUESTS: LeastOutstandingRequestsStrategy,
+    LoadBalancingStrategyEnum.POWER_OF_TWO_CHOICES: PowerOfTwoChoicesStrategy,
+    LoadBalancingStrategyEnum.EWMA_TTFT: EWMATTFTStrategy,
+}
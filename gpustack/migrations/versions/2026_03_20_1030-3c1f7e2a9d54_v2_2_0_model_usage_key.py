@@ -0,0 +1,95 @@
+"""v2.2.0 add model usage key
+
+Revision ID: 3c1f7e2a9d54
+Revises: 8bf38a6bb3b5
+Create Date: 2026-03-20 10:30:00.000000
+
+"""
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f7e2a9d54'
+down_revision: Union[str, None] = '8bf38a6bb3b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = ['prompt_token_count', 'completion_token_count', 'request_count']
+
+
+def build_usage_key(row) -> str:
+    # Mirrors gpustack.server.usage_buffer.build_usage_key at this revision.
+    identity = [
+        row.user_id,
+        row.model_id,
+        row.provider_id,
+        row.model_name,
+        row.access_key,
+        row.operation,
+        str(row.date),
+    ]
+    return hashlib.sha256(
+        json.dumps(identity, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('model_usages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('usage_key', sa.String(64), nullable=True))
+
+    # Merge rows sharing the same identity, counters were previously written
+    # without a uniqueness guarantee.
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, user_id, model_id, provider_id, model_name, access_key, "
+            "operation, date, prompt_token_count, completion_token_count, "
+            "request_count FROM model_usages ORDER BY id"
+        )
+    ).all()
+
+    merged = {}
+    duplicate_ids = []
+    for row in rows:
+        key = build_usage_key(row)
+        if key not in merged:
+            merged[key] = {
+                'id': row.id,
+                'usage_key': key,
+                **{column: getattr(row, column) for column in COUNTER_COLUMNS},
+            }
+            continue
+        for column in COUNTER_COLUMNS:
+            merged[key][column] += getattr(row, column)
+        duplicate_ids.append(row.id)
+
+    if duplicate_ids:
+        conn.execute(
+            sa.text("DELETE FROM model_usages WHERE id IN :ids").bindparams(
+                sa.bindparam('ids', expanding=True)
+            ),
+            {'ids': duplicate_ids},
+        )
+    if merged:
+        conn.execute(
+            sa.text(
+                "UPDATE model_usages SET usage_key = :usage_key, "
+                "prompt_token_count = :prompt_token_count, "
+                "completion_token_count = :completion_token_count, "
+                "request_count = :request_count WHERE id = :id"
+            ),
+            list(merged.values()),
+        )
+
+    with op.batch_alter_table('model_usages', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uix_model_usages_usage_key', ['usage_key'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('model_usages', schema=None) as batch_op:
+        batch_op.drop_constraint('uix_model_usages_usage_key', type_='unique')
+        batch_op.drop_column('usage_key')
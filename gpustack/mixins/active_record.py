@@ -1,10 +1,20 @@
 import asyncio
 from datetime import datetime, timedelta, timezone
+import functools
 import importlib
 import json
 import logging
 import math
-from typing import Any, AsyncGenerator, Callable, List, Optional, Union, Tuple
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Union,
+    Tuple,
+)
 
 import anyio
 from fastapi.encoders import jsonable_encoder
@@ -16,13 +26,26 @@ from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import FlushError
 from sqlalchemy.orm.state import InstanceState
 from gpustack.schemas.common import PaginatedList, Pagination
-from gpustack.server.bus import Event, EventType, event_bus
+from gpustack import envs
+from gpustack.server.bus import (
+    Event,
+    EventType,
+    OverflowPolicy,
+    SubscriberDisconnectedError,
+    event_bus,
+    get_event_bus_backend,
+)
 from gpustack.server.cache import locked_cached, delete_cache_by_key, class_key
 from gpustack.server.db import async_session
 
 
 logger = logging.getLogger(__name__)
 
+HEARTBEAT_MESSAGE = b"\n\n"
+
+# Public classes looked up by _public_class, keyed by class.
+_public_classes: Dict[type, Optional[type]] = {}
+
 
 class CommitEvent:
     name: str
@@ -68,6 +91,7 @@ def find_history(session: AsyncSession, flush_context, instances):
 @sa_event.listens_for(Session, "after_commit")
 def send_post_commit_events(session: AsyncSession):
     events: List[CommitEvent] = session.info.pop("pending_events", [])
+    batch = []
     for event in events:
         # copy before submit to avoid mutation
         id = getattr(event.event.data, "id", None)
@@ -76,10 +100,13 @@ def send_post_commit_events(session: AsyncSession):
         try:
             copied_dict = bus_event.data.model_dump(warnings=False)
             bus_event.data = type(bus_event.data).model_validate(copied_dict)
-            asyncio.create_task(event_bus.publish(event.name, bus_event))
+            batch.append((event.name, bus_event))
         except Exception as e:
             logger.exception(f"Failed to publish events: {e}")
 
+    if batch:
+        asyncio.create_task(get_event_bus_backend().publish(batch))
+
 
 class ActiveRecordMixin:
     """ActiveRecordMixin provides a set of methods to interact with the database."""
@@ -745,10 +772,29 @@ class ActiveRecordMixin:
 
     @classmethod
     async def subscribe(
-        cls, source: str, options: Optional[List] = None
+        cls,
+        source: str,
+        options: Optional[List] = None,
+        overflow_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+        resource_version: Optional[int] = None,
     ) -> AsyncGenerator[Event, None]:
+        """Yield events of the class, starting with all existing objects as
+        CREATED events.
+
+        If resource_version is given and the events after it are still in
+        the event bus history, only these events are replayed. Resumable
+        subscribers receive every event in order, and are disconnected
+        instead of dropping events when they fall behind, so they can resume
+        again from the last version they received.
+        """
         topic = cls.__name__.lower()
-        subscriber = event_bus.subscribe(cls.__name__.lower())
+        resumable = resource_version is not None
+        if resumable:
+            subscriber = event_bus.subscribe(
+                topic, OverflowPolicy.DISCONNECT, squash=False
+            )
+        else:
+            subscriber = event_bus.subscribe(topic, overflow_policy)
         logger.info(
             "subscribed, source=%s topic=%s subscriber=%s",
             source,
@@ -756,10 +802,28 @@ class ActiveRecordMixin:
             id(subscriber),
         )
 
-        initial_items = await cls.cached_all(options=options)
+        missed_events = None
+        if resumable:
+            missed_events = event_bus.events_since(topic, resource_version)
+        # Events published from now on are queued for the subscriber.
+        snapshot_version = event_bus.topic_version(topic)
 
-        for item in initial_items:
-            yield Event(type=EventType.CREATED, data=item)
+        if missed_events is not None:
+            for event in missed_events:
+                yield event
+        else:
+            initial_items = await cls.cached_all(options=options)
+
+            for i, item in enumerate(initial_items):
+                # Only the last one carries the version, resuming from it
+                # before the end of the list would skip the rest.
+                yield Event(
+                    type=EventType.CREATED,
+                    data=item,
+                    resource_version=(
+                        snapshot_version if i == len(initial_items) - 1 else None
+                    ),
+                )
 
         heartbeat_interval = timedelta(seconds=15)
         last_event_time = datetime.now(timezone.utc)
@@ -788,39 +852,82 @@ class ActiveRecordMixin:
         fuzzy_fields: Optional[dict] = None,
         filter_func: Optional[Callable[[Any], bool]] = None,
         options: Optional[List] = None,
-    ) -> AsyncGenerator[str, None]:
-        """Stream events matching the given criteria as JSON strings.
+        resource_version: Optional[int] = None,
+        filter_keys: Optional[List[str]] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream events matching the given criteria as encoded JSON.
+
+        Events are encoded once and the bytes are shared by all streams. An
+        update changing a filtered field of an object that no longer matches
+        is streamed as DELETED, so clients drop the object.
 
         Args:
             fields: Exact match filters as key-value pairs
             fuzzy_fields: Fuzzy match filters
             filter_func: Optional filter function to apply to event data
             options: SQLAlchemy options for eager loading relationships (e.g., selectinload)
+            resource_version: Resume after this version, events include their
+                resource version when set
+            filter_keys: Fields filter_func depends on
         """
+        resumable = resource_version is not None
+        encoder = functools.partial(
+            cls._encode_public_event, include_resource_version=resumable
+        )
+        deleted_encoder = functools.partial(
+            cls._encode_public_event,
+            include_resource_version=resumable,
+            type=EventType.DELETED,
+        )
+        filtered_keys = (
+            set(fields or {}) | set(fuzzy_fields or {}) | set(filter_keys or [])
+        )
         try:
-            async for event in cls.subscribe(source="streaming", options=options):
+            async for event in cls.subscribe(
+                source="streaming",
+                options=options,
+                overflow_policy=OverflowPolicy(envs.EVENT_BUS_WATCH_OVERFLOW_POLICY),
+                resource_version=resource_version,
+            ):
                 if event.type == EventType.HEARTBEAT:
-                    yield "\n\n"
+                    if resumable:
+                        # Tell the client how far it got, including the
+                        # events filtered out.
+                        yield cls._format_event(
+                            Event(
+                                type=EventType.HEARTBEAT,
+                                data=None,
+                                resource_version=resource_version,
+                            )
+                        ).encode()
+                    else:
+                        yield HEARTBEAT_MESSAGE
                     continue
 
-                if not cls._match_fields(event, fields):
-                    continue
-
-                if not cls._match_fuzzy_fields(event, fuzzy_fields):
-                    continue
+                if event.resource_version is not None:
+                    resource_version = event.resource_version
 
-                if filter_func and not filter_func(event.data):
+                if (
+                    not cls._match_fields(event, fields)
+                    or not cls._match_fuzzy_fields(event, fuzzy_fields)
+                    or (filter_func and not filter_func(event.data))
+                ):
+                    if (
+                        event.type == EventType.UPDATED
+                        and not filtered_keys.isdisjoint(event.changed_fields)
+                    ):
+                        # The object may have matched before the update.
+                        yield event.encode(
+                            (cls, resumable, EventType.DELETED), deleted_encoder
+                        )
                     continue
 
-                public_event = Event(
-                    type=event.type,
-                    data=cls._convert_to_public_class(event.data),
-                    changed_fields=event.changed_fields,
-                    id=event.id,
-                )
-                yield cls._format_event(public_event)
+                yield event.encode((cls, resumable), encoder)
         except asyncio.CancelledError:
             pass
+        except SubscriberDisconnectedError as e:
+            # The client falls behind, let it reconnect and list again.
+            logger.warning(f"Stopped streaming {cls.__name__}: {e}")
         except Exception as e:
             logger.error(f"Error in streaming {cls.__name__}: {e}")
 
@@ -841,13 +948,42 @@ class ActiveRecordMixin:
                 return True
         return not fuzzy_fields
 
+    @classmethod
+    def _public_class(cls) -> Optional[type]:
+        """Return the corresponding Public class if it exists."""
+        if cls not in _public_classes:
+            class_module = importlib.import_module(cls.__module__)
+            _public_classes[cls] = getattr(class_module, f"{cls.__name__}Public", None)
+        return _public_classes[cls]
+
     @classmethod
     def _convert_to_public_class(cls, data: Any) -> Any:
         """Convert the instance to the corresponding Public class if it exists."""
-        class_module = importlib.import_module(cls.__module__)
-        public_class = getattr(class_module, f"{cls.__name__}Public", None)
+        public_class = cls._public_class()
         return public_class.model_validate(data) if public_class else data
 
+    @classmethod
+    def _encode_public_event(
+        cls,
+        event: Event,
+        include_resource_version: bool = True,
+        type: Optional[EventType] = None,
+    ) -> bytes:
+        """Encode the event with the data converted to the Public class."""
+        public_event = jsonable_encoder(
+            Event(
+                type=type or event.type,
+                data=cls._convert_to_public_class(event.data),
+                changed_fields=event.changed_fields,
+                id=event.id,
+                resource_version=event.resource_version,
+            )
+        )
+        if not include_resource_version:
+            # Keep the format of watches that don't resume for older clients.
+            del public_event["resource_version"]
+        return cls._format_event(public_event).encode()
+
     @staticmethod
     def _format_event(event: Any) -> str:
         """Format the event as a JSON string."""
@@ -983,14 +983,13 @@ class ScheduleCandidatesSelector(ABC):
         """
         instances = get_worker_model_instances(self._model_instances, worker)
         for instance in instances:
+            # The model relationship is not loaded for indexed instances.
+            backend = instance.model.backend if instance.model else instance.backend
             if (
                 instance.distributed_servers
                 and instance.distributed_servers.subordinate_workers
-                and (
-                    instance.model
-                    and instance.model.backend
-                    and instance.model.backend == self._model.backend
-                )
+                and backend
+                and backend == self._model.backend
             ):
                 self._messages = [
                     str(
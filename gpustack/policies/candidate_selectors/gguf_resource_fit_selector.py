@@ -3,7 +3,19 @@ import logging
 import os
 import copy
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from gpustack import envs
 
 from gpustack.policies.event_recorder.recorder import EventCollector, EventLevelEnum
 from gpustack.policies.utils import get_worker_allocatable_resource, ListMessageBuilder
@@ -37,6 +49,8 @@ from gpustack.utils.unit import byte_to_gib, byte_to_kib
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 DEFAULT_MAX_RPC_SERVER_COUNT = 8
 DEFAULT_MAX_RPC_COMBINATION_GENERATE_GPU_COUNT = 16
 default_max_rpc_server_count = int(
@@ -57,6 +71,7 @@ EVENT_REASON_MAX_RPC_COMBINATION_GENERATE_GPU_COUNT_EXCEED = (
 EVENT_REASON_INSUFFICIENT_RESOURCES_GPU_SELECTED = "INSUFFICIENT_RESOURCES_GPU_SELECTED"
 EVENT_REASON_SELECTED_INVALID_GPU = "SELECTED_INVALID_GPU"
 EVENT_REASON_INVALID_BACKEND_PARAMETER = "INVALID_BACKEND_PARAMETER"
+EVENT_REASON_COMBINATION_SEARCH_BUDGET_EXCEEDED = "COMBINATION_SEARCH_BUDGET_EXCEEDED"
 
 # event action
 EVENT_ACTION_SINGLE_WORKER_SINGLE_GPU_FULL_OFFLOADING = (
@@ -129,10 +144,10 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
         self._rpc_non_uma_single_layer_vram = 0
         self._rpc_uma_single_layer_vram = 0
 
-        # Cached complex claim data.
-        self._multi_workers_multi_gpus_partial_offload_resource_claim_cache = {}
-        self._single_worker_multi_gpus_partial_offload_resource_claim_cache = {}
-        self._cache_max_size = 50
+        # GPU combinations checked in this selection, bounded by the budget.
+        self._searched_combinations = 0
+        self._search_deadline = 0.0
+        self._search_budget_exceeded = False
 
     def _initialize_model_parameters(self, model: Model):
         """Initialize model parameters."""
@@ -379,6 +394,11 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
 
         # Save workers reference for remote parsing
         self._workers = workers
+        self._searched_combinations = 0
+        self._search_deadline = (
+            time.monotonic() + envs.SCHEDULER_GGUF_COMBINATION_SEARCH_TIMEOUT
+        )
+        self._search_budget_exceeded = False
 
         # reset the data with input workers.
         await self._set_offload_resource_claim()
@@ -821,12 +841,16 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
             if allocatable.ram < self._non_uma_single_gpu_full_offload_ram:
                 return None
 
+        full_offload_vram = self._non_uma_single_gpu_full_offload_vram
+        if is_unified_memory:
+            full_offload_vram = self._uma_single_gpu_full_offload_vram
+
         candidates = []
         begin_gpu_count = max(2, self._approximate_full_offload_required_gpu_number)
         for gpu_count in range(begin_gpu_count, total_gpu + 1):
             gpu_combinations, equal_vram = (
                 self._generate_combinations_for_single_worker_multi_gpus(
-                    allocatable, worker, gpu_count
+                    allocatable, worker, gpu_count, full_offload_vram
                 )
             )
 
@@ -834,10 +858,12 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
                 continue
 
             logger.debug(
-                f"Input {len(gpu_combinations)} intermediate candidates for combinations with {gpu_count} gpus for worker: {worker.name}"
+                f"Checking combinations with {gpu_count} gpus for worker: {worker.name}"
             )
 
-            for i, gpu_combination in enumerate(gpu_combinations):
+            for i, gpu_combination in enumerate(
+                self._within_search_budget(gpu_combinations)
+            ):
                 satisfied_candidate = await self._find_single_worker_multi_gpu_full_offloading_candidates_with_combinations(
                     worker, allocatable, gpu_combination, is_unified_memory
                 )
@@ -852,9 +878,6 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
                     # Skip subsequent combinations because they have same vram
                     break
 
-            # clear cache each count
-            self._single_worker_multi_gpus_partial_offload_resource_claim_cache.clear()
-
             if candidates:
                 break
 
@@ -882,15 +905,8 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
             # Skip subsequent combinations with same gpu count because they have less vram
             return None
 
-        cache_key = self._cache_key_for_single_worker_multi_gpus_combination(
-            gpu_combination
-        )
         tensor_splitting = [value[-1] for value in gpu_combination]
-        estimate = await self._get_or_calculate_model_resource_claim(
-            self._single_worker_multi_gpus_partial_offload_resource_claim_cache,
-            cache_key,
-            tensor_splitting,
-        )
+        estimate = await self._get_or_calculate_model_resource_claim(tensor_splitting)
         full_offload_item = estimate.items[-1]
 
         # ram
@@ -1222,10 +1238,13 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
                 continue
 
             logger.debug(
-                f"Input {len(gpu_combinations)} intermediate candidates for combinations with {gpu_count} gpus for worker: {worker.name}, max_offload_layers: {current_max_offload_layers}"
+                f"Checking combinations with {gpu_count} gpus for worker: "
+                f"{worker.name}, max_offload_layers: {current_max_offload_layers}"
             )
 
-            for i, gpu_combination in enumerate(gpu_combinations):
+            for i, gpu_combination in enumerate(
+                self._within_search_budget(gpu_combinations)
+            ):
                 sum_vram = sum([value[-1] for value in gpu_combination])
                 if sum_vram < vram_claim_for_current_max_offload_layers:
                     # Skip subsequent combinations with same gpu count because they have less vram
@@ -1450,35 +1469,35 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
 
         combinations = self._generate_combinations_for_worker_with_rpcs(workers)
 
-        if combinations is None:
+        if not combinations:
             return []
 
-        combinations_count = sum(len(value) for value in combinations.values())
         combinations_sorted_keys = sorted(combinations.keys())
 
         logger.debug(
-            f"Input {combinations_count} intermediate candidates from combinations: 1 main + rpcs({combinations_sorted_keys[0] - 1} to {combinations_sorted_keys[-1] - 1})"
+            "Checking combinations: 1 main + rpcs("
+            f"{combinations_sorted_keys[0] - 1} to {combinations_sorted_keys[-1] - 1})"
         )
 
         candidates = []
         is_full_offloading = False
         max_offload_layers = -1
         for count in combinations_sorted_keys:
+            count_combinations = iter(combinations[count])
+            first_combination = next(count_combinations, None)
 
-            logger.debug(
-                f"Input {len(combinations[count])} intermediate candidates for combinations: 1 main + {count - 1} rpcs"
-            )
-
-            # Pre filter.
-            sum_first_vram = sum([value[-1] for value in combinations[count][0]])
-
+            # Pre filter, the first combination has the most vram.
             begin_layers, end_layers = (
                 self._find_multi_worker_multi_gpu_candidates_determine_layer_range(
-                    sum_first_vram, max_offload_layers
+                    sum([value[-1] for value in first_combination]),
+                    max_offload_layers,
                 )
+                if first_combination is not None
+                else (-1, -1)
             )
 
-            # Skip since the pre filter can't find begin layers for this combinations.
+            # Skip since all combinations are pruned, or the pre filter can't
+            # find begin layers for this combinations.
             if begin_layers == -1:
                 continue
 
@@ -1487,7 +1506,9 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
                 f"Checking combinations: 1 main + {count - 1} rpcs, begin_layers: {begin_layers}, end_layers: {end_layers}"
             )
 
-            for combination in combinations[count]:
+            for combination in self._within_search_budget(
+                itertools.chain([first_combination], count_combinations)
+            ):
                 satisfied_candidate = (
                     await self._find_multi_worker_multi_gpu_candidate_with_combination(
                         combination,
@@ -1518,9 +1539,6 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
                         f"Found intermediate candidate: {satisfied_candidate.to_log_string()}"
                     )
 
-            # Clean cache after each count.
-            self._multi_workers_multi_gpus_partial_offload_resource_claim_cache.clear()
-
             if self._param_gpu_layers and len(candidates) > 0:
                 # Skip subsequent counts because they use more rpc servers to offload same layers.
                 break
@@ -1632,10 +1650,7 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
 
         flag_tensor_spliting.extend([value[1] for value in main_worker_gpus])
 
-        cache_key = self._cache_key_for_main_with_rpcs_combination(combination)
         estimate_result: Estimate = await self._get_or_calculate_model_resource_claim(  # type: ignore
-            self._multi_workers_multi_gpus_partial_offload_resource_claim_cache,
-            cache_key,
             flag_tensor_spliting,
             flag_rpc_servers,
         )
@@ -1852,7 +1867,6 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
             if vram != list(allocatable.vram.values())[0]:
                 equal_vram = False
 
-        total_gpu = len(filterd_gpus)
         sorted_gpus_memory = sorted(
             filterd_gpus, key=lambda item: item[1], reverse=True
         )
@@ -1864,7 +1878,14 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
             ):
                 return None, False
 
-        gpu_combinations = list(itertools.combinations(sorted_gpus_memory, gpu_count))
+        # GPUs of a worker with the same allocatable vram are interchangeable.
+        gpu_combinations = _vram_combinations(
+            sorted_gpus_memory,
+            gpu_count,
+            vram=lambda item: item[1],
+            identity=lambda item: item[1],
+            at_least_vram=at_least_vram or 0,
+        )
 
         # gpu_combinations examples:
         # (($gpu_index, $gpu_allocatable), ($gpu_index, $gpu_allocatable))
@@ -2087,18 +2108,45 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
             )
             return None
 
+        # Skip the combinations can't fit the layers to offload at least.
+        rpc_at_least_vram = 0
+        required_layers = self._param_gpu_layers
+        if not required_layers and not self._model.cpu_offloading:
+            required_layers = self._total_layers
+        if required_layers:
+            # The servers of a combination may have either memory type, so the
+            # smallest claim of the memory types present is a lower bound of
+            # the VRAM they need together.
+            memory_types = {
+                self._worker_id_to_worker.get(gpu[0]).status.memory.is_unified_memory
+                for gpu in filtered_gpus
+            }
+            memory_types.add(main_worker.status.memory.is_unified_memory)
+            vram_claim = min(
+                self._get_claim_with_layers(required_layers, is_uma=is_uma)[0]
+                for is_uma in memory_types
+            )
+            rpc_at_least_vram = vram_claim - main_worker_vram[1]
+
+        def rpc_identity(gpu):
+            # RPC servers with the same memory type and allocatable vram are
+            # interchangeable.
+            worker = self._worker_id_to_worker.get(gpu[0])
+            return worker.status.memory.is_unified_memory, gpu[2]
+
         combinations = {}
         key_range = min(len(filtered_gpus), self._max_rpc_server_count)
         for i in range(1, (key_range + 1)):
-            c = [
-                (main_worker_vram, *v) for v in itertools.combinations(filtered_gpus, i)
-            ]
-
-            key = i + 1
-            if key not in combinations:
-                combinations[key] = []
-
-            combinations[key].extend(c)
+            combinations[i + 1] = (
+                (main_worker_vram, *v)
+                for v in _vram_combinations(
+                    filtered_gpus,
+                    i,
+                    vram=lambda gpu: gpu[2],
+                    identity=rpc_identity,
+                    at_least_vram=rpc_at_least_vram,
+                )
+            )
 
         logger.debug(
             f"Generated combinations with main: {main_worker.name} and rpcs number: 1-{len(filtered_gpus)}"
@@ -2199,41 +2247,39 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
 
         return main_worker_vram, main_worker
 
-    def _update_cache_for_multi_workers_multi_gpus_partial_offload_resource_claim(
-        self, key: str, value: Any
-    ):
-        if (
-            len(self._multi_workers_multi_gpus_partial_offload_resource_claim_cache)
-            < self._cache_max_size
-        ):
-            self._multi_workers_multi_gpus_partial_offload_resource_claim_cache[key] = (
-                value
-            )
+    def _within_search_budget(self, combinations: Iterable[T]) -> Iterator[T]:
+        """
+        Yield the combinations until the number of combinations checked or
+        the time spent in this selection exceeds the search budget.
+        """
+        for combination in combinations:
+            if (
+                self._searched_combinations
+                >= envs.SCHEDULER_GGUF_COMBINATION_SEARCH_MAX_COUNT
+                or time.monotonic() > self._search_deadline
+            ):
+                self._on_search_budget_exceeded()
+                return
 
-    def _update_cache_for_single_worker_multi_gpus_partial_offload_resource_claim(
-        self, key: str, value: Any
-    ):
-        if (
-            len(self._single_worker_multi_gpus_partial_offload_resource_claim_cache)
-            < self._cache_max_size
-        ):
-            self._single_worker_multi_gpus_partial_offload_resource_claim_cache[key] = (
-                value
-            )
+            self._searched_combinations += 1
+            yield combination
 
-    def _cache_key_for_single_worker_multi_gpus_combination(self, combination):
-        # combination example:
-        # ( ($gpu_index, $gpu_allocatable), ($gpu_index, $gpu_allocatable) )
-        values = [str(item[-1]) for item in combination]
-        key = '|'.join(values)
-        return key
+    def _on_search_budget_exceeded(self):
+        if self._search_budget_exceeded:
+            return
 
-    def _cache_key_for_main_with_rpcs_combination(self, combination):
-        # combination example:
-        # ( ($worker_id, $worker_allocatable_vram), ($worker_id, $gpu_index, $gpu_allocatable), ($worker_id, $gpu_index, $gpu_allocatable) )
-        values = [str(item[-1]) for item in combination]
-        key = '|'.join(values)
-        return key
+        self._search_budget_exceeded = True
+        message = (
+            f"Stopped searching GPU combinations after checking "
+            f"{self._searched_combinations} of them, candidates may not be optimal."
+        )
+        logger.warning(f"{message} Model: {self._model.name}")
+        self._event_collector.add(
+            EventLevelEnum.WARNING,
+            EVENT_ACTION_PRE_CHECK,
+            str(ListMessageBuilder(message)),
+            reason=EVENT_REASON_COMBINATION_SEARCH_BUDGET_EXCEEDED,
+        )
 
     async def _calculate_model_resource_claim(
         self, offload: GPUOffloadEnum = GPUOffloadEnum.Partial, **kwargs
@@ -2247,20 +2293,16 @@ class GGUFResourceFitSelector(ScheduleCandidatesSelector):
         )
 
     async def _get_or_calculate_model_resource_claim(
-        self, cache, cache_key, tensor_split=None, rpc=None
+        self, tensor_split=None, rpc=None
     ) -> Estimate:
         """
-        Get the resource claim estimate from cache or calculate it if not present in cache.
+        Get the resource claim estimate of the placement, which is cached
+        across scheduling decisions by calculate_gguf_model_resource_claim.
         """
-        if cache_key in cache:
-            return cache[cache_key]
-
         result = await self._calculate_model_resource_claim(
             tensor_split=tensor_split, rpc=rpc
         )
-        estimate = result.resource_claim_estimate
-        cache[cache_key] = estimate
-        return estimate
+        return result.resource_claim_estimate
 
     def _create_candidate(
         self,
@@ -2517,6 +2559,51 @@ def _filter_candidates_by_max_offload_layers(
     ]
 
 
+def _vram_combinations(
+    items: List[T],
+    count: int,
+    vram: Callable[[T], int],
+    identity: Callable[[T], Hashable],
+    at_least_vram: int = 0,
+) -> Iterator[Tuple[T, ...]]:
+    """
+    Yield the combinations of count items in descending vram order, skipping
+    those whose summed vram is less than at_least_vram, and those made of the
+    same identities as a combination yielded before.
+
+    Items are searched depth first in descending vram, so the most vram a
+    partial combination can reach is that of the next items, and branches
+    that cannot reach at_least_vram are pruned with all the following ones.
+    Items of the same identity are interchangeable, so only the first one
+    left is tried at each depth.
+    """
+    items = sorted(items, key=lambda item: (-vram(item), identity(item)))
+    vrams = [vram(item) for item in items]
+    identities = [identity(item) for item in items]
+    vram_sums = [0, *itertools.accumulate(vrams)]
+    chosen: List[T] = []
+
+    def search(start: int, chosen_vram: int) -> Iterator[Tuple[T, ...]]:
+        remaining = count - len(chosen)
+        if remaining == 0:
+            yield tuple(chosen)
+            return
+
+        for i in range(start, len(items) - remaining + 1):
+            reachable_vram = chosen_vram + vram_sums[i + remaining] - vram_sums[i]
+            if reachable_vram < at_least_vram:
+                return
+            if i > start and identities[i] == identities[i - 1]:
+                continue
+
+            chosen.append(items[i])
+            yield from search(i + 1, chosen_vram + vrams[i])
+            chosen.pop()
+
+    if count > 0:
+        yield from search(0, 0)
+
+
 def _sort_and_group_worker_gpu_vram(
     workers_vram: List[Tuple[int, int]],
     gpus_allocatable_vram: List[Tuple[int, int, int]],
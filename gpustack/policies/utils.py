@@ -9,6 +9,7 @@ from gpustack.policies.base import (
     Allocatable,
     Allocated,
 )
+from gpustack.scheduler.allocation_index import AllocationIndex
 from gpustack.scheduler.calculator import calculate_local_model_weight_size
 from gpustack.schemas.models import (
     ModelInstance,
@@ -47,43 +48,13 @@ def get_worker_allocatable_resource(  # noqa: C901
     Get the worker with the latest allocatable resources, if gpu_type is provided, only consider the GPUs of that type.
     """
 
-    def update_allocated_vram(allocated, resource_claim):
-        for gpu_index, vram in resource_claim.vram.items():
-            allocated.vram[gpu_index] = allocated.vram.get(gpu_index, 0) + vram
-
     is_unified_memory = worker.status.memory.is_unified_memory
-    model_instances = get_worker_model_instances(all_model_instances, worker)
-    allocated = Allocated(ram=0, vram={})
-
-    for model_instance in model_instances:
-        # Handle resource allocation for main worker
-        if model_instance.worker_id == worker.id and (
-            gpu_type is None
-            or model_instance.gpu_type is None
-            or model_instance.gpu_type == gpu_type
-        ):
-            allocated.ram += model_instance.computed_resource_claim.ram or 0
-            if model_instance.gpu_indexes:
-                update_allocated_vram(allocated, model_instance.computed_resource_claim)
-
-        # Handle resource allocation for subordinate workers
-        if (
-            model_instance.distributed_servers
-            and model_instance.distributed_servers.subordinate_workers
-        ):
-            for (
-                subordinate_worker
-            ) in model_instance.distributed_servers.subordinate_workers:
-                if subordinate_worker.worker_id != worker.id:
-                    continue
-
-                if subordinate_worker.computed_resource_claim and (
-                    gpu_type is None or model_instance.gpu_type == gpu_type
-                ):
-                    # rpc server only consider the vram
-                    update_allocated_vram(
-                        allocated, subordinate_worker.computed_resource_claim
-                    )
+    if isinstance(all_model_instances, AllocationIndex):
+        allocated = all_model_instances.allocated(worker.id, gpu_type)
+    else:
+        allocated = _get_worker_allocated_resource(
+            all_model_instances, worker, gpu_type
+        )
 
     allocatable = Allocatable(ram=0, vram={})
     if worker.status.gpu_devices:
@@ -399,6 +370,51 @@ async def estimate_diffusion_model_vram(
     return weight_size
 
 
+def _get_worker_allocated_resource(
+    all_model_instances: List[ModelInstance],
+    worker: Worker,
+    gpu_type: Optional[str] = None,
+) -> Allocated:
+    def update_allocated_vram(allocated, resource_claim):
+        for gpu_index, vram in resource_claim.vram.items():
+            allocated.vram[gpu_index] = allocated.vram.get(gpu_index, 0) + vram
+
+    model_instances = get_worker_model_instances(all_model_instances, worker)
+    allocated = Allocated(ram=0, vram={})
+
+    for model_instance in model_instances:
+        # Handle resource allocation for main worker
+        if model_instance.worker_id == worker.id and (
+            gpu_type is None
+            or model_instance.gpu_type is None
+            or model_instance.gpu_type == gpu_type
+        ):
+            allocated.ram += model_instance.computed_resource_claim.ram or 0
+            if model_instance.gpu_indexes:
+                update_allocated_vram(allocated, model_instance.computed_resource_claim)
+
+        # Handle resource allocation for subordinate workers
+        if (
+            model_instance.distributed_servers
+            and model_instance.distributed_servers.subordinate_workers
+        ):
+            for (
+                subordinate_worker
+            ) in model_instance.distributed_servers.subordinate_workers:
+                if subordinate_worker.worker_id != worker.id:
+                    continue
+
+                if subordinate_worker.computed_resource_claim and (
+                    gpu_type is None or model_instance.gpu_type == gpu_type
+                ):
+                    # rpc server only consider the vram
+                    update_allocated_vram(
+                        allocated, subordinate_worker.computed_resource_claim
+                    )
+
+    return allocated
+
+
 def get_worker_model_instances(
     all_model_instances: List[ModelInstance], worker: Worker
 ) -> List[ModelInstance]:
@@ -407,6 +423,9 @@ def get_worker_model_instances(
     1. Model instances assigned to this worker (main worker)
     2. Model instances that use this worker as a subordinate worker in distributed inference
     """
+    if isinstance(all_model_instances, AllocationIndex):
+        return all_model_instances.worker_instances(worker.id)
+
     # Filter to get only the relevant instances:
     # 1. Instances assigned to this worker (main worker)
     # 2. Instances that use this worker as a subordinate worker
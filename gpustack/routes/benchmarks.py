@@ -130,6 +130,7 @@ async def _get_benchmarks(
                 fields=fields,
                 fuzzy_fields=fuzzy_fields,
                 filter_func=lambda data: gpu_summary_filter(data, gpu_summary),
+                resource_version=params.resource_version,
             ),
             media_type="text/event-stream",
         )
@@ -611,7 +611,9 @@ async def get_inference_backends(  # noqa: C901
 
     if params.watch:
         return StreamingResponse(
-            InferenceBackend.streaming(fields=fields),
+            InferenceBackend.streaming(
+                fields=fields, resource_version=params.resource_version
+            ),
             media_type="text/event-stream",
         )
 
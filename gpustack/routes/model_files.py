@@ -47,6 +47,7 @@ async def get_model_files(
             ModelFile.streaming(
                 fields=fields,
                 filter_func=get_filter_func(search),
+                resource_version=params.resource_version,
             ),
             media_type="text/event-stream",
         )
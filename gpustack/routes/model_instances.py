@@ -1,9 +1,12 @@
-from typing import Optional
+import functools
+import math
+from typing import Callable, List, Optional
 import aiohttp
 from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.responses import PlainTextResponse, StreamingResponse, RedirectResponse
 from urllib.parse import urlencode
 from sqlalchemy.orm import selectinload
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from gpustack.api.responses import StreamingResponseWithStatusCode
 from gpustack import envs
@@ -18,8 +21,10 @@ from gpustack.schemas.workers import Worker
 from gpustack.schemas.clusters import Cluster
 from gpustack.server.db import async_session
 from gpustack.server.deps import ListParamsDep, SessionDep
+from gpustack.schemas.common import ListParams, PaginatedList, Pagination
 from gpustack.schemas.models import (
     ModelInstance,
+    ModelInstanceBatchUpdate,
     ModelInstanceCreate,
     ModelInstancePublic,
     ModelInstanceUpdate,
@@ -39,6 +44,7 @@ async def get_model_instances(
     id: Optional[int] = None,
     model_id: Optional[int] = None,
     worker_id: Optional[int] = None,
+    assigned_worker_id: Optional[int] = None,
     state: Optional[str] = None,
 ):
     fields = {}
@@ -54,13 +60,30 @@ async def get_model_instances(
     if state:
         fields["state"] = state
 
+    # Instances assigned to the worker as the main or a subordinate worker.
+    filter_func = None
+    if assigned_worker_id:
+        filter_func = functools.partial(
+            ModelInstance.is_assigned_to, worker_id=assigned_worker_id
+        )
+
     if params.watch:
         return StreamingResponse(
-            ModelInstance.streaming(fields=fields),
+            ModelInstance.streaming(
+                fields=fields,
+                filter_func=filter_func,
+                filter_keys=["worker_id", "distributed_servers"],
+                resource_version=params.resource_version,
+            ),
             media_type="text/event-stream",
         )
 
     async with async_session() as session:
+        if filter_func:
+            return await get_assigned_model_instances(
+                session, params, fields, filter_func
+            )
+
         return await ModelInstance.paginated_by_query(
             session=session,
             fields=fields,
@@ -69,6 +92,36 @@ async def get_model_instances(
         )
 
 
+async def get_assigned_model_instances(
+    session: AsyncSession,
+    params: ListParams,
+    fields: dict,
+    filter_func: Callable[[ModelInstance], bool],
+) -> PaginatedList[ModelInstance]:
+    # Subordinate workers are kept in a JSON column, filter them in Python.
+    instances = [
+        instance
+        for instance in await ModelInstance.all_by_fields(session, fields=fields)
+        if filter_func(instance)
+    ]
+    instances.sort(key=lambda instance: instance.created_at, reverse=True)
+
+    count = len(instances)
+    start_index = (params.page - 1) * params.perPage
+    end_index = start_index + params.perPage
+
+    pagination = Pagination(
+        page=params.page,
+        perPage=params.perPage,
+        total=count,
+        totalPage=math.ceil(count / params.perPage),
+    )
+
+    return PaginatedList[ModelInstance](
+        items=instances[start_index:end_index], pagination=pagination
+    )
+
+
 @router.get("/{id}", response_model=ModelInstancePublic)
 async def get_model_instance(
     session: SessionDep,
@@ -212,6 +265,28 @@ async def create_model_instance(
     return model_instance
 
 
+@router.put("/batch", response_model=List[ModelInstancePublic])
+async def batch_update_model_instances(
+    session: SessionDep, model_instances_in: List[ModelInstanceBatchUpdate]
+):
+    model_instances = []
+    # Lock in ID order so concurrent batches don't deadlock.
+    for model_instance_in in sorted(model_instances_in, key=lambda mi: mi.id):
+        model_instance = await ModelInstance.one_by_id(
+            session, model_instance_in.id, for_update=True
+        )
+        if not model_instance:
+            # Deleted since the client read it.
+            continue
+
+        for key in model_instance_in.model_fields_set - {"id"}:
+            setattr(model_instance, key, getattr(model_instance_in, key))
+        model_instances.append(model_instance)
+
+    await ModelInstanceService(session).batch_update(model_instances)
+    return model_instances
+
+
 @router.put("/{id}", response_model=ModelInstancePublic)
 async def update_model_instance(
     session: SessionDep, id: int, model_instance_in: ModelInstanceUpdate
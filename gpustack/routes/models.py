@@ -96,6 +96,7 @@ async def get_models(
                 fields=fields,
                 fuzzy_fields=fuzzy_fields,
                 filter_func=lambda data: categories_filter(data, categories),
+                resource_version=params.resource_version,
             ),
             media_type="text/event-stream",
         )
@@ -196,7 +197,9 @@ async def get_model_instances(id: int, params: ListParamsDep):
     if params.watch:
         fields = {"model_id": id}
         return StreamingResponse(
-            ModelInstance.streaming(fields=fields),
+            ModelInstance.streaming(
+                fields=fields, resource_version=params.resource_version
+            ),
             media_type="text/event-stream",
         )
 
@@ -1,6 +1,7 @@
 import re
 import random
 import asyncio
+import time
 from typing import AsyncGenerator, List, Optional, Tuple
 import aiohttp
 import logging
@@ -10,7 +11,6 @@ from openai.types import Model as OAIModel
 from openai.pagination import SyncPage
 from sqlmodel import or_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from starlette.datastructures import UploadFile
 
 from gpustack.api.exceptions import (
     BadRequestException,
@@ -24,16 +24,20 @@ from gpustack.api.exceptions import (
 from gpustack.api.responses import StreamingResponseWithStatusCode
 from gpustack import envs
 from gpustack.http_proxy.load_balancer import LoadBalancer
+from gpustack.http_proxy.multipart import MultipartForwarder
 from gpustack.routes.model_common import build_category_conditions
 from gpustack.schemas.models import (
     BackendEnum,
     Model,
+    ModelInstance,
 )
 from gpustack.schemas.model_routes import (
     ModelRoute,
     MyModel,
 )
+from gpustack.schemas.workers import Worker
 from gpustack.server.deps import SessionDep, CurrentUserDep
+from gpustack.server.routing_table import routing_table
 from gpustack.server.services import (
     ModelInstanceService,
     ModelRouteService,
@@ -117,28 +121,12 @@ async def proxy_request_by_model(
             message="Model not found",
             is_openai_exception=True,
         )
-    models: List[Model] = await ModelRouteService(
-        session
-    ).get_model_ids_by_model_route_name(model_name)
-    if len(models) == 0:
-        raise NotFoundException(
-            message="Model not found or no running instances available",
-            is_openai_exception=True,
-        )
+    model, instance, worker = await resolve_upstream(session, model_name)
     request.state.stream = stream
-    model = random.choice(models)
     request.state.model = model
 
     mutate_request(request, model_name, body_json, form_data)
 
-    instance = await get_running_instance(session, model.id)
-    worker = await WorkerService(session).get_by_id(instance.worker_id)
-    if not worker:
-        raise InternalServerErrorException(
-            message=f"Worker with ID {instance.worker_id} not found",
-            is_openai_exception=True,
-        )
-
     url = f"http://{instance.worker_ip}:{worker.port}/proxy/v1/{endpoint}"
     token = worker.token
     extra_headers = {
@@ -157,11 +145,11 @@ async def proxy_request_by_model(
     try:
         if stream:
             return await handle_streaming_request(
-                request, url, body_json, form_data, extra_headers
+                request, url, body_json, form_data, extra_headers, instance
             )
         else:
             return await handle_standard_request(
-                request, url, body_json, form_data, extra_headers
+                request, url, body_json, form_data, extra_headers, instance
             )
     except asyncio.TimeoutError as e:
         error_message = f"Request to {url} timed out"
@@ -204,23 +192,19 @@ async def parse_request_body(request: Request):
     return model_name, stream, body_json, form_data
 
 
-async def parse_form_data(request: Request) -> Tuple[aiohttp.FormData, str, bool]:
+async def parse_form_data(request: Request) -> Tuple[MultipartForwarder, str, bool]:
     try:
-        form = await request.form()
-        model_name = form.get("model")
-        stream = form.get("stream", False)
-
-        form_data = aiohttp.FormData()
-        for key, value in form.items():
-            if isinstance(value, UploadFile):
-                form_data.add_field(
-                    key,
-                    await value.read(),
-                    filename=value.filename,
-                    content_type=value.content_type,
-                )
-            else:
-                form_data.add_field(key, value)
+        # Only the fields before the first file after the model are parsed,
+        # so the upload is piped through. A stream field after a file is not
+        # seen, and the request is then not streamed.
+        form_data = MultipartForwarder(
+            request.stream(),
+            request.headers.get("content-type"),
+            required_fields=("model",),
+        )
+        await form_data.parse()
+        model_name = form_data.get("model")
+        stream = form_data.get("stream", "false").lower() in ["true", "1"]
 
         return form_data, model_name, stream
     except Exception as e:
@@ -263,6 +247,15 @@ async def _stream_response_chunks(
         yield _process_line(chunk_buffer)
 
 
+async def _stream_response_passthrough(
+    resp: aiohttp.ClientResponse,
+) -> AsyncGenerator[bytes, None]:
+    """Stream the response content as received, without re-framing lines."""
+
+    async for data in resp.content.iter_any():
+        yield data
+
+
 def _process_line(line_bytes: bytes) -> str:
     """Process a line of bytes to ensure it is properly formatted for streaming."""
     line = line_bytes.decode("utf-8").strip()
@@ -273,20 +266,37 @@ async def handle_streaming_request(
     request: Request,
     url: str,
     body_json: Optional[dict],
-    form_data: Optional[aiohttp.FormData],
+    form_data: Optional[MultipartForwarder],
     extra_headers: Optional[dict] = None,
+    instance: Optional[ModelInstance] = None,
 ):
     timeout = aiohttp.ClientTimeout(total=envs.PROXY_TIMEOUT)
     headers = filter_headers(request.headers)
     if extra_headers:
         headers.update(extra_headers)
+    if form_data is not None:
+        headers["Content-Type"] = form_data.content_type
+        # The request body can not be read once the streaming response
+        # starts, as starlette then listens to the request for disconnects.
+        await form_data.spool()
 
     if body_json and "stream_options" not in body_json:
         # Defaults to include usage.
         # TODO Record usage without client awareness.
         body_json["stream_options"] = {"include_usage": True}
 
+    passthrough = envs.PROXY_STREAM_PASSTHROUGH
+    request.state.stream_passthrough = passthrough
+    iter_chunks = (
+        _stream_response_passthrough if passthrough else _stream_response_chunks
+    )
+
     async def stream_generator():
+        tracker = load_balancer.tracker
+        if instance is not None:
+            tracker.request_started(instance)
+        start_time = time.monotonic()
+        first_chunk = True
         try:
             use_proxy_env = use_proxy_env_for_url(url)
             http_client: aiohttp.ClientSession = (
@@ -299,14 +309,19 @@ async def handle_streaming_request(
                 url=url,
                 headers=headers,
                 json=body_json if body_json else None,
-                data=form_data,
+                data=form_data.iter_body() if form_data is not None else None,
                 timeout=timeout,
             ) as resp:
                 if resp.status >= 400:
                     yield await resp.read(), resp.headers, resp.status
                     return
 
-                async for chunk in _stream_response_chunks(resp):
+                async for chunk in iter_chunks(resp):
+                    if first_chunk and instance is not None:
+                        first_chunk = False
+                        tracker.first_token_received(
+                            instance, time.monotonic() - start_time
+                        )
                     yield chunk, resp.headers, resp.status
         except aiohttp.ClientError as e:
             error_response = OpenAIAPIErrorResponse(
@@ -326,6 +341,9 @@ async def handle_streaming_request(
                 ),
             )
             yield error_response.model_dump_json(), {}, status.HTTP_500_INTERNAL_SERVER_ERROR
+        finally:
+            if instance is not None:
+                tracker.request_finished(instance)
 
     return StreamingResponseWithStatusCode(
         stream_generator(), media_type="text/event-stream"
@@ -336,12 +354,15 @@ async def handle_standard_request(
     request: Request,
     url: str,
     body_json: Optional[dict],
-    form_data: Optional[aiohttp.FormData],
+    form_data: Optional[MultipartForwarder],
     extra_headers: Optional[dict] = None,
+    instance: Optional[ModelInstance] = None,
 ):
     headers = filter_headers(request.headers)
     if extra_headers:
         headers.update(extra_headers)
+    if form_data is not None:
+        headers["Content-Type"] = form_data.content_type
 
     use_proxy_env = use_proxy_env_for_url(url)
     http_client: aiohttp.ClientSession = (
@@ -350,20 +371,32 @@ async def handle_standard_request(
         else request.app.state.http_client_no_proxy
     )
     timeout = aiohttp.ClientTimeout(total=envs.PROXY_TIMEOUT)
-    async with http_client.request(
-        method=request.method,
-        url=url,
-        headers=headers,
-        json=body_json if body_json else None,
-        data=form_data,
-        timeout=timeout,
-    ) as response:
-        content = await response.read()
-        return Response(
-            status_code=response.status,
-            headers=dict(response.headers),
-            content=content,
-        )
+    tracker = load_balancer.tracker
+    if instance is not None:
+        tracker.request_started(instance)
+    start_time = time.monotonic()
+    try:
+        async with http_client.request(
+            method=request.method,
+            url=url,
+            headers=headers,
+            json=body_json if body_json else None,
+            data=form_data.iter_body() if form_data is not None else None,
+            timeout=timeout,
+        ) as response:
+            content = await response.read()
+            if instance is not None and response.status < 400:
+                # Non-streaming responses arrive at once, so the full
+                # latency stands in for time to first token.
+                tracker.first_token_received(instance, time.monotonic() - start_time)
+            return Response(
+                status_code=response.status,
+                headers=dict(response.headers),
+                content=content,
+            )
+    finally:
+        if instance is not None:
+            tracker.request_finished(instance)
 
 
 def filter_headers(headers):
@@ -378,23 +411,58 @@ def filter_headers(headers):
     }
 
 
-async def get_running_instance(session: AsyncSession, model_id: int):
+async def resolve_upstream(
+    session: AsyncSession, model_name: str
+) -> Tuple[Model, ModelInstance, Worker]:
+    """
+    Pick the model, instance and worker to proxy to. The in-memory routing
+    table is consulted first, and the database is used on a miss.
+    """
+    route = routing_table.lookup(model_name)
+    if route is not None:
+        model, running_instances = route
+        instance = await load_balancer.get_instance(running_instances, model)
+        worker = routing_table.resolve_worker(instance)
+        if worker is not None:
+            return model, instance, worker
+
+    models: List[Model] = await ModelRouteService(
+        session
+    ).get_model_ids_by_model_route_name(model_name)
+    if len(models) == 0:
+        raise NotFoundException(
+            message="Model not found or no running instances available",
+            is_openai_exception=True,
+        )
+    model = random.choice(models)
+
+    instance = await get_running_instance(session, model)
+    worker = await WorkerService(session).get_by_id(instance.worker_id)
+    if not worker:
+        raise InternalServerErrorException(
+            message=f"Worker with ID {instance.worker_id} not found",
+            is_openai_exception=True,
+        )
+    return model, instance, worker
+
+
+async def get_running_instance(session: AsyncSession, model: Model):
     running_instances = await ModelInstanceService(session).get_running_instances(
-        model_id
+        model.id
     )
     if not running_instances:
         raise ServiceUnavailableException(
             message="No running instances available",
             is_openai_exception=True,
         )
-    return await load_balancer.get_instance(running_instances)
+    return await load_balancer.get_instance(running_instances, model)
 
 
 def mutate_request(
     request: Request,
     model_name: str,
     body_json: Optional[dict],
-    form_data: Optional[aiohttp.FormData],
+    form_data: Optional[MultipartForwarder],
 ):
     path = request.url.path
     model: Model = request.state.model
@@ -409,7 +477,7 @@ def mutate_request(
         if body_json is not None:
             body_json["model"] = model.name
         elif form_data is not None:
-            form_data.add_field("model", model.name)
+            form_data.set_field("model", model.name)
 
 
 def apply_qwen3_reranker_templates(body_json: dict):
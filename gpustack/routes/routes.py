@@ -135,6 +135,12 @@ worker_client_router.add_api_route(
     methods=["POST"],
     include_in_schema=False,
 )
+worker_client_router.add_api_route(
+    path="/worker-status",
+    endpoint=workers.update_worker_status,
+    methods=["PATCH"],
+    include_in_schema=False,
+)
 worker_client_router.add_api_route(
     path="/worker-heartbeat",
     endpoint=workers.heartbeat,
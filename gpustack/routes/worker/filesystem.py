@@ -4,9 +4,11 @@ import logging
 import os
 import subprocess
 import traceback
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
+from gpustack import envs
 from gpustack.api.auth import worker_auth
 from gpustack.config.config import get_global_config
 from gpustack.schemas.filesystem import (
@@ -18,7 +20,9 @@ from gpustack.schemas.models import Model
 from gpustack.scheduler.calculator import (
     _gguf_parser_command,
     _gguf_parser_env,
+    GGUFParserOutput,
     GPUOffloadEnum,
+    calculate_gguf_model_resource_claim_natively,
     calculate_local_model_weight_size,
 )
 
@@ -249,6 +253,28 @@ async def get_model_weight_size(
         )
 
 
+async def _parse_gguf_file_natively(
+    model: Model, offload: GPUOffloadEnum, **kwargs
+) -> Optional[GGUFParseResponse]:
+    """Estimate from the GGUF header, or return None to use gguf-parser."""
+    if not envs.SCHEDULER_GGUF_NATIVE_ESTIMATE:
+        return None
+
+    try:
+        claim = await calculate_gguf_model_resource_claim_natively(
+            model, offload, **kwargs
+        )
+    except Exception as e:
+        logger.debug(f"Falling back to gguf-parser for {model.local_path}: {e}")
+        return None
+
+    output = GGUFParserOutput(
+        estimate=claim.resource_claim_estimate,
+        architecture=claim.resource_architecture,
+    )
+    return GGUFParseResponse(success=True, output=output.to_json())
+
+
 @router.post("/files/parse-gguf", response_model=GGUFParseResponse)
 async def parse_gguf_file(request: GGUFParseRequest):
     """
@@ -296,6 +322,11 @@ async def parse_gguf_file(request: GGUFParseRequest):
         worker_config = get_global_config()
         kwargs["cache_dir"] = worker_config.cache_dir
 
+        # Estimate from the file header in-process when supported.
+        response = await _parse_gguf_file_natively(model, offload_enum, **kwargs)
+        if response is not None:
+            return response
+
         # 5. Reuse _gguf_parser_command to build command
         command = await _gguf_parser_command(model, offload_enum, **kwargs)
         env = _gguf_parser_env(model)
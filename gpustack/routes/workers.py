@@ -9,10 +9,12 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from urllib.parse import urlencode
 from fastapi import APIRouter, Depends, Response, Request
+from pydantic import ValidationError
 from fastapi.responses import StreamingResponse, RedirectResponse
 
 from gpustack.api.exceptions import (
     AlreadyExistsException,
+    ConflictException,
     InternalServerErrorException,
     NotFoundException,
     ForbiddenException,
@@ -29,6 +31,9 @@ from gpustack.server.worker_status_buffer import (
     heartbeat_flush_buffer_lock,
     worker_status_flush_buffer,
     worker_status_flush_buffer_lock,
+    forget_worker_status,
+    worker_status_digests,
+    worker_status_reports,
 )
 from gpustack.schemas.workers import (
     WorkerCreate,
@@ -40,6 +45,7 @@ from gpustack.schemas.workers import (
     WorkerRegistrationPublic,
     WorkerStatusStored,
     WorkerStateEnum,
+    merge_worker_status,
 )
 from gpustack.schemas.clusters import Cluster, Credential, ClusterStateEnum
 from gpustack.schemas.users import User, UserRole
@@ -95,7 +101,11 @@ async def get_workers(
 
     if params.watch:
         return StreamingResponse(
-            Worker.streaming(fields=fields, fuzzy_fields=fuzzy_fields),
+            Worker.streaming(
+                fields=fields,
+                fuzzy_fields=fuzzy_fields,
+                resource_version=params.resource_version,
+            ),
             media_type="text/event-stream",
         )
     if me and user.worker is not None:
@@ -555,21 +565,82 @@ async def delete_worker(session: SessionDep, id: int):
         await WorkerService(session).delete(worker, soft=soft)
     except Exception as e:
         raise InternalServerErrorException(message=f"Failed to delete worker: {e}")
+    forget_worker_status(id)
 
 
-async def create_worker_status(user: CurrentUserDep, input: WorkerStatusStored):
+async def create_worker_status(
+    user: CurrentUserDep, input: WorkerStatusStored, digest: Optional[str] = None
+):
+    """
+    Store the full status reported by the worker. The digest identifies the
+    report for the deltas the worker computes against it.
+    """
     if user.worker is None:
         raise ForbiddenException(message="Failed to find related worker")
 
+    report = input.model_dump(mode="json", exclude_unset=True)
+    await buffer_worker_status(user.worker.id, report, input, digest)
+
+    return Response(status_code=204)
+
+
+async def update_worker_status(
+    user: CurrentUserDep,
+    input: Dict[str, Any],
+    baseline: Optional[str] = None,
+    digest: Optional[str] = None,
+):
+    """
+    Apply a status delta to the last status reported by the worker. The
+    baseline is the digest of the report the delta was computed against, and
+    the digest that of the report with the delta applied.
+    """
+    if user.worker is None:
+        raise ForbiddenException(message="Failed to find related worker")
+
+    # Another server may have received the reports in between.
+    report = worker_status_reports.get(user.worker.id)
+    if (
+        report is None
+        or baseline is None
+        or worker_status_digests.get(user.worker.id) != baseline
+    ):
+        raise ConflictException(
+            message="Worker status delta does not apply to the last known status, "
+            "report the full status"
+        )
+
+    report = merge_worker_status(report, input)
+    try:
+        worker_status = WorkerStatusStored.model_validate(report)
+    except ValidationError as e:
+        raise InvalidException(message=f"Invalid worker status delta: {e}")
+    await buffer_worker_status(user.worker.id, report, worker_status, digest)
+
+    return Response(status_code=204)
+
+
+async def buffer_worker_status(
+    worker_id: int,
+    report: dict,
+    worker_status: WorkerStatusStored,
+    digest: Optional[str] = None,
+):
+    worker_status_digests[worker_id] = digest
+    if worker_status_reports.get(worker_id) == report:
+        # Nothing changed, refresh the heartbeat only.
+        async with heartbeat_flush_buffer_lock:
+            heartbeat_flush_buffer.add(worker_id)
+        return
+
+    worker_status_reports[worker_id] = report
     heartbeat_time = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
-    input_dict = input.model_dump(exclude_unset=True)
+    input_dict = worker_status.model_dump(exclude_unset=True)
     input_dict["heartbeat_time"] = heartbeat_time
 
     # Add worker status to buffer for batch update
     async with worker_status_flush_buffer_lock:
-        worker_status_flush_buffer[user.worker.id] = input_dict
-
-    return Response(status_code=204)
+        worker_status_flush_buffer[worker_id] = input_dict
 
 
 async def heartbeat(user: CurrentUserDep):
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from gpustack.policies.base import Allocated
+from gpustack.schemas.models import ModelInstance
+from gpustack.schemas.workers import Worker
+from gpustack.server.bus import Event, EventType
+from gpustack.server.db import async_session
+
+logger = logging.getLogger(__name__)
+
+# (is main worker, gpu type of the model instance)
+BucketKey = Tuple[bool, Optional[str]]
+
+
+class AllocationIndex:
+    """
+    Snapshot of workers and model instances for the scheduler, with the
+    resources allocated on each worker kept up to date as instances change.
+
+    Allocations are aggregated per worker into buckets keyed by the role of
+    the worker (main or subordinate) and the GPU type of the instance, so
+    looking up what is allocated on a worker does not scan the instances.
+    The index is iterable over the model instances, and can be passed where
+    a list of model instances is expected.
+    """
+
+    def __init__(self):
+        self._workers: Dict[int, Worker] = {}
+        self._instances: Dict[int, ModelInstance] = {}
+        self._contributions: Dict[int, List[Tuple[int, BucketKey, Allocated]]] = {}
+        self._allocated: Dict[int, Dict[BucketKey, Allocated]] = {}
+        self._worker_instances: Dict[int, Dict[int, ModelInstance]] = {}
+        self._ready = asyncio.Event()
+
+    def __iter__(self) -> Iterator[ModelInstance]:
+        return iter(list(self._instances.values()))
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    async def start(self):
+        async with async_session() as session:
+            workers = await Worker.all(session)
+            instances = await ModelInstance.all(session)
+        for worker in workers:
+            self.upsert_worker(worker)
+        for instance in instances:
+            self.upsert(instance)
+        self._ready.set()
+        logger.debug(
+            f"Allocation index loaded {len(workers)} workers "
+            f"and {len(instances)} model instances"
+        )
+
+        await asyncio.gather(
+            self._watch(Worker, self._apply_worker_event),
+            self._watch(ModelInstance, self._apply_instance_event),
+        )
+
+    async def wait_ready(self):
+        await self._ready.wait()
+
+    async def _watch(self, cls, apply):
+        topic = cls.__name__.lower()
+        while True:
+            try:
+                async for event in cls.subscribe(source="allocation_index"):
+                    if event.type == EventType.HEARTBEAT:
+                        continue
+                    apply(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Allocation index failed to watch {topic}: {e}")
+                await asyncio.sleep(1)
+
+    def _apply_worker_event(self, event: Event):
+        worker: Worker = event.data
+        if worker is None or worker.id is None:
+            return
+
+        if event.type == EventType.DELETED:
+            self._workers.pop(worker.id, None)
+            return
+
+        self.upsert_worker(worker)
+
+    def _apply_instance_event(self, event: Event):
+        instance: ModelInstance = event.data
+        if instance is None or instance.id is None:
+            return
+
+        if event.type == EventType.DELETED:
+            self.remove(instance.id)
+            return
+
+        self.upsert(instance)
+
+    def workers(self) -> List[Worker]:
+        """
+        Return copies of the workers, callers such as worker filters are free
+        to modify them.
+        """
+        return [self._workers[id].model_copy(deep=True) for id in sorted(self._workers)]
+
+    def upsert_worker(self, worker: Worker):
+        self._workers[worker.id] = worker.model_copy(deep=True)
+
+    def upsert(self, instance: ModelInstance):
+        """
+        Add or update a model instance. Updates older than the indexed
+        instance are ignored, so that applying the scheduler's own decision
+        before its event arrives is safe.
+        """
+        existing = self._instances.get(instance.id)
+        if (
+            existing is not None
+            and existing.updated_at is not None
+            and instance.updated_at is not None
+            and _utc(instance.updated_at) < _utc(existing.updated_at)
+        ):
+            return
+
+        self.remove(instance.id)
+        instance = instance.model_copy(deep=True)
+        self._instances[instance.id] = instance
+
+        contributions = _contributions(instance)
+        self._contributions[instance.id] = contributions
+        for worker_id, key, allocated in contributions:
+            bucket = self._allocated.setdefault(worker_id, {}).setdefault(
+                key, Allocated(ram=0, vram={})
+            )
+            bucket.ram += allocated.ram
+            for gpu_index, vram in allocated.vram.items():
+                bucket.vram[gpu_index] = bucket.vram.get(gpu_index, 0) + vram
+
+        for worker_id in _worker_ids(instance):
+            self._worker_instances.setdefault(worker_id, {})[instance.id] = instance
+
+    def remove(self, instance_id: int):
+        instance = self._instances.pop(instance_id, None)
+        if instance is not None:
+            for worker_id in _worker_ids(instance):
+                instances = self._worker_instances.get(worker_id, {})
+                instances.pop(instance_id, None)
+                if not instances:
+                    self._worker_instances.pop(worker_id, None)
+
+        for worker_id, key, allocated in self._contributions.pop(instance_id, []):
+            buckets = self._allocated[worker_id]
+            bucket = buckets[key]
+            bucket.ram -= allocated.ram
+            for gpu_index, vram in allocated.vram.items():
+                bucket.vram[gpu_index] -= vram
+                if bucket.vram[gpu_index] == 0:
+                    del bucket.vram[gpu_index]
+            if bucket.ram == 0 and not bucket.vram:
+                del buckets[key]
+            if not buckets:
+                del self._allocated[worker_id]
+
+    def worker_instances(self, worker_id: int) -> List[ModelInstance]:
+        """
+        Return the model instances running on the worker, as main worker or
+        as subordinate worker of distributed inference.
+        """
+        instances = self._worker_instances.get(worker_id, {})
+        return [instances[id] for id in sorted(instances)]
+
+    def allocated(self, worker_id: int, gpu_type: Optional[str] = None) -> Allocated:
+        """
+        Return the resources allocated on the worker. If gpu_type is provided,
+        only instances of that GPU type are considered, see
+        get_worker_allocatable_resource.
+        """
+        result = Allocated(ram=0, vram={})
+        for (is_main, instance_gpu_type), bucket in self._allocated.get(
+            worker_id, {}
+        ).items():
+            if gpu_type is not None and instance_gpu_type != gpu_type:
+                # Instances without a GPU type count on all GPUs of the main worker.
+                if not (is_main and instance_gpu_type is None):
+                    continue
+            result.ram += bucket.ram
+            for gpu_index, vram in bucket.vram.items():
+                result.vram[gpu_index] = result.vram.get(gpu_index, 0) + vram
+        return result
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _worker_ids(instance: ModelInstance) -> Set[int]:
+    """Return the main and subordinate workers of the instance."""
+    worker_ids = set()
+    if instance.worker_id is not None:
+        worker_ids.add(instance.worker_id)
+    if (
+        instance.distributed_servers
+        and instance.distributed_servers.subordinate_workers
+    ):
+        for subordinate_worker in instance.distributed_servers.subordinate_workers:
+            worker_ids.add(subordinate_worker.worker_id)
+    return worker_ids
+
+
+def _contributions(
+    instance: ModelInstance,
+) -> List[Tuple[int, BucketKey, Allocated]]:
+    contributions = []
+    claim = instance.computed_resource_claim
+    if instance.worker_id is not None and claim is not None:
+        contributions.append(
+            (
+                instance.worker_id,
+                (True, instance.gpu_type),
+                Allocated(
+                    ram=claim.ram or 0,
+                    vram=dict(claim.vram or {}) if instance.gpu_indexes else {},
+                ),
+            )
+        )
+
+    if (
+        instance.distributed_servers
+        and instance.distributed_servers.subordinate_workers
+    ):
+        for subordinate_worker in instance.distributed_servers.subordinate_workers:
+            subordinate_claim = subordinate_worker.computed_resource_claim
+            if subordinate_claim is None:
+                continue
+            # rpc server only consider the vram
+            contributions.append(
+                (
+                    subordinate_worker.worker_id,
+                    (False, instance.gpu_type),
+                    Allocated(ram=0, vram=dict(subordinate_claim.vram or {})),
+                )
+            )
+
+    return contributions
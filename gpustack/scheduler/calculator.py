@@ -8,15 +8,30 @@ import os
 import subprocess
 from dataclasses import dataclass
 import time
-from typing import List, Optional, Dict, Tuple, Any
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Dict,
+    Tuple,
+    Any,
+)
 from dataclasses_json import dataclass_json
+from huggingface_hub import hf_hub_url
+from huggingface_hub.utils import build_hf_headers
+from modelscope.hub.file_download import get_file_download_url
 from transformers import PretrainedConfig
 
+from gpustack import envs
+
 from gpustack.client.worker_filesystem_client import WorkerFilesystemClient
 from gpustack.config.config import get_global_config
 from gpustack.policies.worker_filters.gpu_matching_filter import GPUMatchingFilter
 from gpustack.policies.worker_filters.label_matching_filter import LabelMatchingFilter
 from gpustack.policies.worker_filters.local_path_filter import LocalPathFilter
+from gpustack.scheduler.estimate_cache import EstimateCache
 from gpustack.schemas.models import (
     BackendEnum,
     Model,
@@ -37,6 +52,10 @@ from gpustack.utils.hub import (
     read_repo_file_content,
 )
 from gpustack.utils import platform
+from gpustack.utils.gguf import gguf_split_paths
+
+if TYPE_CHECKING:
+    from gpustack.scheduler.gguf_estimator import GGUFModelTable
 
 logger = logging.getLogger(__name__)
 fetch_file_timeout_in_seconds = 15
@@ -171,6 +190,21 @@ class ModelResourceClaim:
         return False
 
 
+# Estimates and pretrained configs shared across scheduling decisions.
+gguf_estimate_cache = EstimateCache(
+    "gguf",
+    max_size=envs.SCHEDULER_ESTIMATE_CACHE_MAX_SIZE,
+    ttl=envs.SCHEDULER_ESTIMATE_CACHE_TTL,
+    dumps=GGUFParserOutput.to_dict if envs.SCHEDULER_ESTIMATE_CACHE_PERSIST else None,
+    loads=GGUFParserOutput.from_dict,
+)
+pretrained_config_cache = EstimateCache(
+    "pretrained_config",
+    max_size=envs.SCHEDULER_ESTIMATE_CACHE_MAX_SIZE,
+    ttl=envs.SCHEDULER_ESTIMATE_CACHE_TTL,
+)
+
+
 def _get_empty_estimate(n_gpu: int = 1) -> Tuple[Estimate, Architecture]:
     empty_layer_memory_estimate = LayerMemoryEstimate(
         uma=0, nonuma=0, handleLayers=None
@@ -578,16 +612,9 @@ async def _gguf_parser_command(
     elif offload == GPUOffloadEnum.Disable:
         command.extend(["--gpu-layers", "0"])
 
-    tensor_split = kwargs.get("tensor_split")
+    tensor_split = _normalize_tensor_split(kwargs.get("tensor_split"))
     if tensor_split:
-        if all(i < 1024 * 1024 for i in tensor_split):
-            # user provided
-            tensor_split_str = ",".join([str(i) for i in tensor_split])
-        else:
-            # computed by the system, convert to MiB to prevent overflow
-            tensor_split_str = ",".join(
-                [str(int(i / (1024 * 1024))) for i in tensor_split]
-            )
+        tensor_split_str = ",".join([str(i) for i in tensor_split])
         command.extend(["--tensor-split", tensor_split_str])
 
     rpc = kwargs.get("rpc")
@@ -602,6 +629,14 @@ async def _gguf_parser_command(
     return command
 
 
+def _normalize_tensor_split(tensor_split: Optional[List[int]]) -> Optional[List[int]]:
+    if not tensor_split or all(i < 1024 * 1024 for i in tensor_split):
+        # user provided
+        return tensor_split
+    # computed by the system, convert to MiB to prevent overflow
+    return [int(i / (1024 * 1024)) for i in tensor_split]
+
+
 async def _try_parse_on_workers(
     model: Model,
     workers: List[Worker],
@@ -666,6 +701,35 @@ async def get_pretrained_config_with_workers(
     model: Model,
     workers: Optional[List[Worker]] = None,
     trust_remote_code: bool = False,
+) -> Optional[Any]:
+    """
+    Get the pretrained config of the model, cached across scheduling
+    decisions. See _get_pretrained_config_with_workers.
+    """
+    trust_remote_code = trust_remote_code or (
+        "--trust-remote-code" in (model.backend_parameters or [])
+    )
+    config_path = None
+    if model.source == SourceEnum.LOCAL_PATH:
+        config_path = os.path.join(model.local_path, "config.json")
+    cache_key = (
+        model.source,
+        model.huggingface_repo_id,
+        model.model_scope_model_id,
+        model.local_path,
+        _file_fingerprint(config_path),
+        trust_remote_code,
+    )
+    return await pretrained_config_cache.get_or_compute(
+        cache_key,
+        lambda: _get_pretrained_config_with_workers(model, workers, trust_remote_code),
+    )
+
+
+async def _get_pretrained_config_with_workers(
+    model: Model,
+    workers: Optional[List[Worker]] = None,
+    trust_remote_code: bool = False,
 ) -> Optional[Any]:
     """
     Unified async entry point for getting pretrained config.
@@ -1020,14 +1084,20 @@ async def calculate_gguf_model_resource_claim(
         offload: GPU offload strategy.
         workers: Optional list of available workers for remote parsing.
         kwargs: Additional arguments to pass to the GGUF parser.
+
+    Claims are cached across scheduling decisions, keyed by the model source,
+    backend parameters, offload strategy and placement.
     """
 
     if model.source == SourceEnum.LOCAL_PATH and not os.path.exists(model.local_path):
         # Try to calculate on worker if workers are provided
         if workers:
             try:
-                result = await _calculate_from_workers(
-                    model, workers, offload, **kwargs
+                result = await _cached_gguf_model_resource_claim(
+                    model,
+                    offload,
+                    lambda: _calculate_from_workers(model, workers, offload, **kwargs),
+                    **kwargs,
                 )
                 if result:
                     return result
@@ -1048,6 +1118,93 @@ async def calculate_gguf_model_resource_claim(
             resource_architecture=a,
         )
 
+    return await _cached_gguf_model_resource_claim(
+        model,
+        offload,
+        lambda: _calculate_gguf_model_resource_claim(model, offload, **kwargs),
+        **kwargs,
+    )
+
+
+async def _cached_gguf_model_resource_claim(
+    model: Model,
+    offload: GPUOffloadEnum,
+    calculate: Callable[[], Awaitable[Optional[ModelResourceClaim]]],
+    **kwargs,
+) -> Optional[ModelResourceClaim]:
+    async def compute() -> Optional[GGUFParserOutput]:
+        claim = await calculate()
+        if claim is None:
+            return None
+        return GGUFParserOutput(
+            estimate=claim.resource_claim_estimate,
+            architecture=claim.resource_architecture,
+        )
+
+    output = await gguf_estimate_cache.get_or_compute(
+        _gguf_estimate_cache_key(model, offload, **kwargs),
+        compute,
+        cache_dir=kwargs.get("cache_dir"),
+    )
+    if output is None:
+        return None
+
+    return ModelResourceClaim(
+        model=model,
+        resource_claim_estimate=output.estimate,
+        resource_architecture=output.architecture,
+    )
+
+
+def _gguf_estimate_cache_key(model: Model, offload: GPUOffloadEnum, **kwargs) -> Tuple:
+    local_files = None
+    if model.source == SourceEnum.LOCAL_PATH:
+        local_files = tuple(
+            _file_fingerprint(path) for path in gguf_split_paths(model.local_path)
+        )
+    tensor_split = _normalize_tensor_split(kwargs.get("tensor_split"))
+    return (
+        model.source,
+        model.huggingface_repo_id,
+        model.huggingface_filename,
+        model.model_scope_model_id,
+        model.model_scope_file_path,
+        model.local_path,
+        local_files,
+        model.backend_version,
+        tuple(model.backend_parameters or []),
+        offload,
+        tuple(tensor_split or []),
+        # Estimates depend on the number of RPC servers, not their addresses.
+        len(kwargs.get("rpc") or []),
+        envs.SCHEDULER_GGUF_NATIVE_ESTIMATE,
+    )
+
+
+def _file_fingerprint(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+async def _calculate_gguf_model_resource_claim(
+    model: Model,
+    offload: GPUOffloadEnum = GPUOffloadEnum.Full,
+    **kwargs,
+) -> ModelResourceClaim:
+    if envs.SCHEDULER_GGUF_NATIVE_ESTIMATE:
+        try:
+            return await calculate_gguf_model_resource_claim_natively(
+                model, offload, **kwargs
+            )
+        except Exception as e:
+            logger.debug(
+                f"Falling back to gguf-parser for model {model.name}, "
+                f"native estimate failed: {e}"
+            )
+
     command = await _gguf_parser_command(model, offload, **kwargs)
     env = _gguf_parser_env(model)
     try:
@@ -1109,6 +1266,85 @@ async def calculate_gguf_model_resource_claim(
         )
 
 
+async def calculate_gguf_model_resource_claim_natively(
+    model: Model,
+    offload: GPUOffloadEnum = GPUOffloadEnum.Full,
+    **kwargs,
+) -> ModelResourceClaim:
+    """
+    Calculate the resource claim of the model in-process from the GGUF header,
+    which is read once per file and cached by digest.
+    Raise if the model is not supported by the native estimator.
+    Args:
+        model: Model to calculate the resource claim for.
+        offload: GPU offload strategy.
+        kwargs: The tensor_split and rpc of the placement to estimate.
+    """
+    from gpustack.scheduler.gguf_estimator import GGUFEstimator
+
+    params = GGUFParserCommandMutableParameters(backend_version=model.backend_version)
+    params.from_args(model.backend_parameters)
+
+    table = await _load_gguf_table(model, params)
+    estimator = GGUFEstimator(table, params)
+    estimate = estimator.estimate(
+        offload,
+        tensor_split=_normalize_tensor_split(kwargs.get("tensor_split")),
+        rpc=kwargs.get("rpc"),
+    )
+    claim = GGUFParserOutput(
+        estimate=estimate,
+        architecture=Architecture(type="model", architecture=table.architecture),
+    )
+    if offload == GPUOffloadEnum.Disable:
+        clear_vram_claim(claim)
+
+    return ModelResourceClaim(
+        model=model,
+        resource_claim_estimate=claim.estimate,
+        resource_architecture=claim.architecture,
+    )
+
+
+async def _load_gguf_table(
+    model: Model, params: GGUFParserCommandMutableParameters
+) -> "GGUFModelTable":
+    from gpustack.scheduler.gguf_estimator import (
+        UnsupportedGGUFError,
+        load_local_gguf_table,
+        load_remote_gguf_table,
+    )
+
+    if model.source == SourceEnum.LOCAL_PATH:
+        return await asyncio.to_thread(load_local_gguf_table, model.local_path)
+
+    if model.source not in [SourceEnum.HUGGING_FACE, SourceEnum.MODEL_SCOPE]:
+        raise UnsupportedGGUFError(f"Unsupported source: {model.source}")
+
+    repo_id, model_filename, mmproj_filename = await _gguf_repo_files(
+        model, params.cache_expiration
+    )
+    if mmproj_filename:
+        raise UnsupportedGGUFError("Multimodal projector")
+
+    filenames = gguf_split_paths(model_filename)
+    if model.source == SourceEnum.HUGGING_FACE:
+        urls = [hf_hub_url(repo_id, filename) for filename in filenames]
+        headers = build_hf_headers(token=get_global_config().huggingface_token)
+    else:
+        urls = [
+            get_file_download_url(repo_id, filename, "master") for filename in filenames
+        ]
+        headers = None
+
+    cache_expiration = params.cache_expiration
+    if cache_expiration and cache_expiration != "0":
+        cache_expiration = parse_duration(cache_expiration)
+    return await asyncio.to_thread(
+        load_remote_gguf_table, urls, headers, safe_int(cache_expiration)
+    )
+
+
 def clear_vram_claim(claim: GGUFParserOutput):
     for item in claim.estimate.items:
         # gguf-parser provides vram claim when offloadLayers is 0 due to current llama.cpp behavior, but llama-box won't allocate such vram.
@@ -1132,57 +1368,73 @@ async def _gguf_parser_command_args_from_source(model: Model, **kwargs) -> List[
     ]:
         raise ValueError(f"Unsupported source: {model.source}")
 
+    if model.source == SourceEnum.LOCAL_PATH:
+        return ["--path", model.local_path]
+
+    if model.source == SourceEnum.HUGGING_FACE:
+        repo_arg, file_arg, mmproj_arg = [
+            "--hf-repo",
+            "--hf-file",
+            "--hf-mmproj-file",
+        ]
+    else:
+        repo_arg, file_arg, mmproj_arg = [
+            "--ms-repo",
+            "--ms-file",
+            "--ms-mmproj-file",
+        ]
+
+    repo_id, model_filename, mmproj_filename = await _gguf_repo_files(
+        model, kwargs.get("cache_expiration")
+    )
+    args = [repo_arg, repo_id, file_arg, model_filename]
+    if mmproj_filename:
+        args.extend([mmproj_arg, mmproj_filename])
+    return args
+
+
+async def _gguf_repo_files(
+    model: Model, cache_expiration: Optional[str] = None
+) -> Tuple[str, str, Optional[str]]:
+    """
+    Get the repo ID, model file and mmproj file, if any, of a GGUF model
+    from Hugging Face or ModelScope.
+    """
     try:
-        if model.source in [SourceEnum.HUGGING_FACE, SourceEnum.MODEL_SCOPE]:
-            cache_expiration = kwargs.get("cache_expiration")
-            if cache_expiration and cache_expiration != "0":
-                cache_expiration = parse_duration(cache_expiration)
-            cache_expiration = safe_int(cache_expiration)
-            if model.source == SourceEnum.HUGGING_FACE:
-                repo_arg, file_arg, mmproj_arg = [
-                    "--hf-repo",
-                    "--hf-file",
-                    "--hf-mmproj-file",
-                ]
-                repo_id = model.huggingface_repo_id
-                file_name = model.huggingface_filename
-            else:
-                repo_arg, file_arg, mmproj_arg = [
-                    "--ms-repo",
-                    "--ms-file",
-                    "--ms-mmproj-file",
-                ]
-                repo_id = model.model_scope_model_id
-                file_name = model.model_scope_file_path
-
-            args = [repo_arg, repo_id]
-
-            global_config = get_global_config()
-            repo_file_infos = await asyncio.wait_for(
-                asyncio.to_thread(
-                    list_repo,
-                    repo_id,
-                    model.source,
-                    global_config.huggingface_token,
-                    cache_expiration,
-                ),
-                timeout=fetch_file_timeout_in_seconds,
-            )
-            repo_files = [file.get("name", "") for file in repo_file_infos]
-            model_filename = filter_filename(file_name, repo_files)
-            if len(model_filename) == 0:
-                raise ValueError(f"File {model_filename} not found in {repo_id}")
+        if cache_expiration and cache_expiration != "0":
+            cache_expiration = parse_duration(cache_expiration)
+        cache_expiration = safe_int(cache_expiration)
+        if model.source == SourceEnum.HUGGING_FACE:
+            repo_id = model.huggingface_repo_id
+            file_name = model.huggingface_filename
+        else:
+            repo_id = model.model_scope_model_id
+            file_name = model.model_scope_file_path
 
-            args.extend([file_arg, model_filename[0]])
+        global_config = get_global_config()
+        repo_file_infos = await asyncio.wait_for(
+            asyncio.to_thread(
+                list_repo,
+                repo_id,
+                model.source,
+                global_config.huggingface_token,
+                cache_expiration,
+            ),
+            timeout=fetch_file_timeout_in_seconds,
+        )
+        repo_files = [file.get("name", "") for file in repo_file_infos]
+        model_filename = filter_filename(file_name, repo_files)
+        if len(model_filename) == 0:
+            raise ValueError(f"File {model_filename} not found in {repo_id}")
 
-            mmproj_filename = get_mmproj_filename(model)
-            mmproj_filename = filter_filename(mmproj_filename, repo_files)
-            if mmproj_filename:
-                args.extend([mmproj_arg, mmproj_filename[0]])
+        mmproj_filename = get_mmproj_filename(model)
+        mmproj_filename = filter_filename(mmproj_filename, repo_files)
 
-            return args
-        elif model.source == SourceEnum.LOCAL_PATH:
-            return ["--path", model.local_path]
+        return (
+            repo_id,
+            model_filename[0],
+            mmproj_filename[0] if mmproj_filename else None,
+        )
     except asyncio.TimeoutError:
         raise Exception(
             f"Timeout when getting the file for model {model.name or model.readable_source}"
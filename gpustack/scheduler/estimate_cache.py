@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+from prometheus_client import Counter
+
+from gpustack.utils.name import metric_name
+
+logger = logging.getLogger(__name__)
+
+estimate_cache_lookups = Counter(
+    metric_name("estimate_cache_lookups"),
+    "Lookups of resource estimates shared across scheduling decisions",
+    labelnames=["cache", "result"],
+)
+
+
+class EstimateCache:
+    """
+    Cache of resource estimates shared across scheduling decisions.
+
+    Entries are evicted least recently used first, and expire after the TTL.
+    With a serializer, entries are also persisted as JSON files under the
+    cache directory passed to lookups, so they survive restarts. Concurrent
+    lookups of a missing key wait for a single computation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        ttl: float,
+        dumps: Optional[Callable[[Any], Any]] = None,
+        loads: Optional[Callable[[Any], Any]] = None,
+    ):
+        self._name = name
+        self._ttl = ttl
+        self._dumps = dumps
+        self._loads = loads
+        self._max_size = max_size
+        self._entries = TTLCache(maxsize=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        cache_dir: Optional[str] = None,
+    ) -> Any:
+        """
+        Return the cached value of the key, or compute and cache it.
+        None results and errors are not cached.
+        """
+        value = await self.get(key, cache_dir)
+        if value is not None:
+            return value
+
+        while key in self._pending:
+            pending = self._pending[key]
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Compute it here if the computation waited on was cancelled.
+                if not pending.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await compute()
+            if value is not None:
+                await self.put(key, value, cache_dir)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it, do not warn about it being unretrieved.
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+    async def get(self, key: Hashable, cache_dir: Optional[str] = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+        if value is None and self._persistent(cache_dir):
+            value = await asyncio.to_thread(self._read, key, cache_dir)
+            if value is not None:
+                with self._lock:
+                    self._entries[key] = value
+
+        self._record(value is not None)
+        return value
+
+    async def put(self, key: Hashable, value: Any, cache_dir: Optional[str] = None):
+        with self._lock:
+            self._entries[key] = value
+        if self._persistent(cache_dir):
+            await asyncio.to_thread(self._write, key, value, cache_dir)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        estimate_cache_lookups.labels(
+            cache=self._name, result="hit" if hit else "miss"
+        ).inc()
+
+    def _persistent(self, cache_dir: Optional[str]) -> bool:
+        return bool(cache_dir and self._dumps and self._loads)
+
+    def _path(self, key: Hashable, cache_dir: str) -> str:
+        digest = hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return os.path.join(cache_dir, "estimates", self._name, f"{digest}.json")
+
+    def _read(self, key: Hashable, cache_dir: str) -> Any:
+        path = self._path(key, cache_dir)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            if entry["expires_at"] > time.time():
+                return self._loads(entry["value"])
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Failed to read cached estimate {path}: {e}")
+        return None
+
+    def _write(self, key: Hashable, value: Any, cache_dir: str):
+        path = self._path(key, cache_dir)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {
+                        "expires_at": time.time() + self._ttl,
+                        "value": self._dumps(value),
+                    },
+                    f,
+                )
+            os.replace(tmp_path, path)
+            self._prune(os.path.dirname(path))
+        except Exception as e:
+            logger.debug(f"Failed to persist estimate {path}: {e}")
+
+    def _prune(self, directory: str):
+        # Keep at most max_size entries on disk, dropping the oldest written.
+        with os.scandir(directory) as it:
+            entries = [e for e in it if e.name.endswith(".json")]
+        if len(entries) <= self._max_size:
+            return
+
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[: len(entries) - self._max_size]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -1,5 +1,4 @@
 import asyncio
-import hashlib
 import json
 import logging
 import os
@@ -117,41 +116,54 @@ async def evaluate_models(
     return results
 
 
-def make_hashable_key(model: ModelSpec, workers: List[Worker]) -> str:
-    key_data = json.dumps(
-        {
-            "model": model.model_dump(mode="json"),
-            "workers": [
-                w.model_dump(
-                    mode="json",
-                    exclude={
-                        "status": {
-                            "cpu": True,
-                            "swap": True,
-                            "filesystem": True,
-                            "os": True,
-                            "kernel": True,
-                            "uptime": True,
-                            "memory": {"utilization_rate", "used"},
-                            "gpu_devices": {
-                                "__all__": {
-                                    "temperature": True,
-                                    "core": {"utilization_rate"},
-                                    "memory": {"utilization_rate", "used"},
-                                },
-                            },
-                        },
-                        "heartbeat_time": True,
-                        "created_at": True,
-                        "updated_at": True,
-                    },
-                )
-                for w in workers
-            ],
-        },
-        sort_keys=True,
+def make_hashable_key(model: ModelSpec, workers: List[Worker]) -> Tuple:
+    """
+    Build the evaluation cache key from the model spec and the worker fields
+    evaluation depends on, leaving out status fields that change with every
+    heartbeat like utilization, temperature and uptime.
+    """
+    return (
+        json.dumps(model.model_dump(mode="json"), sort_keys=True),
+        tuple(_worker_key(w) for w in workers),
+    )
+
+
+def _worker_key(worker: Worker) -> Tuple:
+    status = worker.status
+    memory = status.memory if status else None
+    gpus = (status.gpu_devices if status else None) or []
+    system_reserved = worker.system_reserved
+    return (
+        worker.id,
+        worker.name,
+        worker.cluster_id,
+        worker.state,
+        worker.unreachable,
+        worker.worker_version,
+        tuple(sorted((worker.labels or {}).items())),
+        bool(worker.maintenance and worker.maintenance.enabled),
+        system_reserved.ram if system_reserved else None,
+        system_reserved.vram if system_reserved else None,
+        memory.total if memory else None,
+        memory.allocated if memory else None,
+        memory.is_unified_memory if memory else None,
+        tuple(
+            (
+                gpu.index,
+                gpu.vendor,
+                gpu.type,
+                gpu.name,
+                gpu.arch_family,
+                gpu.compute_capability,
+                gpu.driver_version,
+                gpu.runtime_version,
+                gpu.memory.total if gpu.memory else None,
+                gpu.memory.allocated if gpu.memory else None,
+                gpu.memory.is_unified_memory if gpu.memory else None,
+            )
+            for gpu in gpus
+        ),
     )
-    return hashlib.md5(key_data.encode()).hexdigest()
 
 
 async def evaluate_model_with_cache(
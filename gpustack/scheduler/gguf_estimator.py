@@ -0,0 +1,483 @@
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from gpustack.scheduler.calculator import (
+    Estimate,
+    GGUFParserCommandMutableParameters,
+    GPUOffloadEnum,
+    LayerMemoryEstimate,
+    MemoryEstimate,
+)
+from gpustack.utils.gguf import (
+    GGML_TYPE_IDS,
+    GGUFHeader,
+    GGUFSkippedArray,
+    fetch_gguf_header,
+    ggml_row_size,
+    gguf_split_paths,
+    read_gguf_header,
+)
+
+logger = logging.getLogger(__name__)
+
+_LAYER_TENSOR_PATTERN = re.compile(r"^blk\.(\d+)\.")
+_INPUT_TENSOR_PREFIXES = ("token_embd", "token_types", "position_embd")
+
+# Metadata key fragments of recurrent and encoder-decoder models, whose
+# memory usage does not follow the per-layer KV cache model.
+_UNSUPPORTED_KEY_FRAGMENTS = (".ssm.", ".wkv.", ".shortconv.", ".decoder_start_")
+
+# llama.cpp pooling types of embedding and reranking models.
+_POOLING_TYPE_NONE = 0
+_POOLING_TYPE_RANK = 4
+
+# Copies of the graph inputs llama.cpp keeps for pipeline parallelism.
+_PIPELINE_PARALLEL_COPIES = 4
+
+_MAX_CACHED_TABLES = 64
+
+
+class UnsupportedGGUFError(Exception):
+    """The model or parameters are not supported by the native estimator."""
+
+
+@dataclass(frozen=True)
+class GGUFModelTable:
+    """
+    Per-layer sizes of a GGUF model, read from its header, which are all
+    that is needed to estimate its memory usage for any placement.
+    """
+
+    architecture: str
+    block_count: int
+    context_length: int
+    embedding_length: int
+    vocab_size: int
+    head_count: int
+    # Width of the feed forward activations, of all used experts if any.
+    feed_forward_length: int
+    causal: bool
+    pooling_type: int
+    # Weight bytes of each repeating layer.
+    layer_weights: Tuple[int, ...]
+    # Key and value elements cached per token by each repeating layer.
+    layer_key_lengths: Tuple[int, ...]
+    layer_value_lengths: Tuple[int, ...]
+    # Weight bytes of the input embeddings, kept on the CPU.
+    input_weights: int
+    # Weight bytes of the output head, offloaded last.
+    output_weights: int
+
+    @property
+    def embedding_only(self) -> bool:
+        return not self.causal or self.pooling_type != _POOLING_TYPE_NONE
+
+    @property
+    def reranking(self) -> bool:
+        return self.pooling_type == _POOLING_TYPE_RANK
+
+    @classmethod
+    def from_headers(cls, headers: List[GGUFHeader]) -> "GGUFModelTable":  # noqa: C901
+        """Build the table from the headers of all shards of a model."""
+        metadata = headers[0].metadata
+        general_type = metadata.get("general.type", "model")
+        architecture = metadata.get("general.architecture")
+        if general_type != "model" or not architecture or architecture == "clip":
+            raise UnsupportedGGUFError(
+                f"Unsupported GGUF file of type {general_type}, "
+                f"architecture {architecture}"
+            )
+        for key in metadata:
+            if any(fragment in key for fragment in _UNSUPPORTED_KEY_FRAGMENTS):
+                raise UnsupportedGGUFError(
+                    f"Unsupported GGUF architecture {architecture}"
+                )
+
+        def get(key: str, default: Any = None) -> Any:
+            return metadata.get(f"{architecture}.{key}", default)
+
+        block_count = get("block_count")
+        embedding_length = get("embedding_length")
+        if not block_count or not embedding_length:
+            raise UnsupportedGGUFError(
+                f"Missing block count or embedding length of {architecture}"
+            )
+
+        head_counts = _per_layer(get("attention.head_count", 0), block_count)
+        head_count_kvs = _per_layer(
+            get("attention.head_count_kv", head_counts), block_count
+        )
+        head_count = max(head_counts) or 1
+        key_length = get("attention.key_length", embedding_length // head_count)
+        value_length = get("attention.value_length", embedding_length // head_count)
+
+        feed_forward_length = max(
+            _per_layer(get("feed_forward_length", 0), block_count)
+        )
+        expert_count = get("expert_count", 0)
+        if expert_count:
+            expert_feed_forward_length = get(
+                "expert_feed_forward_length", feed_forward_length
+            )
+            feed_forward_length = max(
+                feed_forward_length,
+                expert_feed_forward_length * get("expert_used_count", 1) + expert_count,
+            )
+
+        layer_weights = [0] * block_count
+        input_weights = 0
+        output_weights = 0
+        token_embd_weights = 0
+        has_output = False
+        vocab_size = get("vocab_size", 0)
+        for header in headers:
+            for tensor in header.tensors:
+                nbytes = tensor.nbytes
+                match = _LAYER_TENSOR_PATTERN.match(tensor.name)
+                if match:
+                    layer = int(match.group(1))
+                    if layer < block_count:
+                        layer_weights[layer] += nbytes
+                    continue
+                if tensor.name.startswith(_INPUT_TENSOR_PREFIXES):
+                    input_weights += nbytes
+                    if tensor.name == "token_embd.weight":
+                        token_embd_weights = nbytes
+                        vocab_size = vocab_size or tensor.dims[-1]
+                    continue
+                if tensor.name == "output.weight":
+                    has_output = True
+                    vocab_size = vocab_size or tensor.dims[-1]
+                output_weights += nbytes
+
+        tokens = metadata.get("tokenizer.ggml.tokens")
+        if isinstance(tokens, GGUFSkippedArray):
+            vocab_size = vocab_size or tokens.length
+        elif isinstance(tokens, list):
+            vocab_size = vocab_size or len(tokens)
+
+        causal = get("attention.causal", True)
+        pooling_type = get("pooling_type", _POOLING_TYPE_NONE)
+        if not has_output and causal and pooling_type == _POOLING_TYPE_NONE:
+            # Tied embeddings, duplicated for the output head.
+            output_weights += token_embd_weights
+
+        return cls(
+            architecture=architecture,
+            block_count=block_count,
+            context_length=get("context_length", 0),
+            embedding_length=embedding_length,
+            vocab_size=vocab_size,
+            head_count=head_count,
+            feed_forward_length=feed_forward_length,
+            causal=causal,
+            pooling_type=pooling_type,
+            layer_weights=tuple(layer_weights),
+            layer_key_lengths=tuple(key_length * n for n in head_count_kvs),
+            layer_value_lengths=tuple(value_length * n for n in head_count_kvs),
+            input_weights=input_weights,
+            output_weights=output_weights,
+        )
+
+
+def _per_layer(value: Any, block_count: int) -> List[int]:
+    if isinstance(value, list):
+        return (value + [0] * block_count)[:block_count]
+    return [value] * block_count
+
+
+class _LRUCache:
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+
+
+# Tables by digest of the model headers, so a model reached through
+# different paths or URLs is read once.
+_tables = _LRUCache(_MAX_CACHED_TABLES)
+# Header digests by model file location.
+_digests = _LRUCache(_MAX_CACHED_TABLES * 4)
+
+
+def _load_table(
+    location_key: Hashable, read_headers: Callable[[], List[GGUFHeader]]
+) -> GGUFModelTable:
+    digest = _digests.get(location_key)
+    table = _tables.get(digest) if digest else None
+    if table is not None:
+        return table
+
+    headers = read_headers()
+    digest = "|".join(header.digest for header in headers)
+    table = _tables.get(digest)
+    if table is None:
+        table = GGUFModelTable.from_headers(headers)
+        _tables.put(digest, table)
+    _digests.put(location_key, digest)
+    return table
+
+
+def load_local_gguf_table(path: str) -> GGUFModelTable:
+    """Load the table of a local GGUF file, or of all shards of a split one."""
+    paths = gguf_split_paths(os.path.realpath(path))
+    stats = [os.stat(p) for p in paths]
+    location_key = tuple(
+        (p, stat.st_size, stat.st_mtime_ns) for p, stat in zip(paths, stats)
+    )
+    return _load_table(location_key, lambda: [read_gguf_header(p) for p in paths])
+
+
+def load_remote_gguf_table(
+    urls: List[str],
+    headers: Optional[Dict[str, str]] = None,
+    cache_expiration: Optional[int] = None,
+) -> GGUFModelTable:
+    """
+    Load the table of a remote GGUF file from the URLs of all its shards.
+    Headers fetched before are reused until the cache expiration.
+    """
+    location_key = tuple(urls)
+    if cache_expiration:
+        # Expire entries by moving to a new key every period.
+        location_key += (int(time.time() // cache_expiration),)
+    return _load_table(
+        location_key,
+        lambda: [fetch_gguf_header(url, headers=headers) for url in urls],
+    )
+
+
+@dataclass
+class _Device:
+    remote: bool = False
+    layers: int = 0
+    last_layer: int = -1
+    output: bool = False
+    weights: int = 0
+    kv_cache: int = 0
+    compute: int = 0
+    footprint: int = 0
+
+    def to_estimate(self) -> LayerMemoryEstimate:
+        nonuma = self.weights + self.kv_cache + self.compute + self.footprint
+        # Weights are shared with the host on unified memory, except for
+        # remote devices which load them over RPC.
+        uma = self.kv_cache + self.compute + (self.weights if self.remote else 0)
+        return LayerMemoryEstimate(uma=uma, nonuma=nonuma, handleLayers=self.layers)
+
+
+class GGUFEstimator:
+    """
+    Estimate the memory usage of a GGUF model from its table, the same way
+    gguf-parser reports it, for any offload mode and tensor split.
+
+    Layers are assigned to devices the way llama.cpp does, with weights and
+    KV cache summed per layer and compute buffers sized after the largest
+    activations of a micro batch, so each estimate is plain arithmetic.
+    """
+
+    def __init__(
+        self,
+        table: GGUFModelTable,
+        params: GGUFParserCommandMutableParameters,
+    ):
+        if params.override_tensor or params.no_kv_offload:
+            raise UnsupportedGGUFError("Tensor overrides and CPU KV cache")
+        if params.split_mode and params.split_mode != "layer":
+            raise UnsupportedGGUFError(f"Split mode {params.split_mode}")
+        if (
+            params.main_gpu is not None
+            or params.parallel_size != GGUFParserCommandMutableParameters.parallel_size
+        ):
+            raise UnsupportedGGUFError("Main GPU and parallel size")
+
+        self._table = table
+        self._params = params
+
+        n_ctx = params.ctx_size or table.context_length
+        n_batch = min(params.batch_size or 2048, n_ctx)
+        n_tokens = min(params.ubatch_size or 512, n_batch)
+        self._n_ctx = n_ctx
+
+        # KV cache of each layer, with prefix sums to sum ranges of layers.
+        kv_cache = [0] * table.block_count
+        if table.causal:
+            key_type = _cache_type(params.cache_type_k)
+            value_type = _cache_type(params.cache_type_v)
+            kv_cache = [
+                ggml_row_size(key_type, (k * n_ctx,))
+                + ggml_row_size(value_type, (v * n_ctx,))
+                for k, v in zip(table.layer_key_lengths, table.layer_value_lengths)
+            ]
+        self._weights_sums = [0, *accumulate(table.layer_weights)]
+        self._kv_cache_sums = [0, *accumulate(kv_cache)]
+
+        # Compute buffers, in f32 activations of a micro batch of tokens.
+        n_embd = table.embedding_length
+        f32 = 4
+        mask = n_ctx * n_tokens * (2 if params.flash_attention else f32)
+        self._inputs = n_embd * n_tokens * f32 + mask
+        if params.flash_attention:
+            attention = 4 * n_embd * n_tokens * f32
+        else:
+            attention = (
+                n_ctx * n_tokens * table.head_count * f32 + 3 * n_embd * n_tokens * f32
+            )
+        feed_forward = 2 * (table.feed_forward_length + n_embd) * n_tokens * f32
+        self._layer_compute = max(attention, feed_forward)
+        self._output_compute = (table.vocab_size + n_embd) * n_tokens * f32
+        # Token IDs and positions, plus the logits of a micro batch.
+        self._host_buffers = 2 * n_tokens * 4 + table.vocab_size * n_tokens * f32
+
+        ram_footprint, vram_footprint = _parse_footprint(params.platform_footprint)
+        self._ram_footprint = ram_footprint
+        self._vram_footprint = vram_footprint
+
+    def estimate(
+        self,
+        offload: GPUOffloadEnum = GPUOffloadEnum.Full,
+        tensor_split: Optional[List[int]] = None,
+        rpc: Optional[List[str]] = None,
+    ) -> Estimate:
+        """Estimate for the offload mode over the devices of the tensor split."""
+        n_layer = self._table.block_count
+        splits = _cumulative_splits(tensor_split, len(rpc or []))
+        remotes = len(rpc or [])
+
+        if offload == GPUOffloadEnum.Full:
+            offload_layers = [n_layer + 1]
+        elif offload == GPUOffloadEnum.Partial:
+            offload_layers = list(range(n_layer + 2))
+        else:
+            offload_layers = [0]
+
+        items = [self._estimate_item(n, splits, remotes) for n in offload_layers]
+        return Estimate(
+            items=items,
+            architecture=self._table.architecture,
+            embeddingOnly=self._table.embedding_only,
+            imageOnly=False,
+            distributable=True,
+            reranking=self._table.reranking,
+            contextSize=self._n_ctx,
+        )
+
+    def _estimate_item(
+        self, gpu_layers: int, splits: List[float], remotes: int
+    ) -> MemoryEstimate:
+        table = self._table
+        n_layer = table.block_count
+        start = max(n_layer - gpu_layers, 0)
+        offloaded = min(gpu_layers, n_layer + 1)
+
+        devices = [_Device(remote=i < remotes) for i in range(len(splits))]
+        if offloaded:
+            # Layer i of the offloaded ones, the output head last, goes to
+            # the first device whose cumulative split exceeds i / offloaded.
+            first = start
+            for device, split in zip(devices[:-1], splits):
+                end = min(max(start + _ceil_fraction(split, offloaded), first), n_layer)
+                self._assign(device, first, end)
+                first = end
+            self._assign(devices[-1], first, start + offloaded)
+
+        ram = _Device(layers=start, last_layer=start - 1, output=offloaded <= n_layer)
+        ram.kv_cache = self._kv_cache_sums[start]
+        # The host only stages inputs and outputs, the GPUs compute even the
+        # layers left on the CPU.
+        ram.compute = self._inputs + self._host_buffers
+        if not self._params.mmap:
+            ram.weights = table.input_weights + self._weights_sums[start]
+            if ram.output:
+                ram.weights += table.output_weights
+
+        # Pipeline parallelism over local GPUs keeps copies of the inputs.
+        inputs = self._inputs
+        if len(devices) > 1 and not remotes and gpu_layers > n_layer:
+            inputs *= _PIPELINE_PARALLEL_COPIES
+        for i, device in enumerate(devices):
+            device.footprint = self._vram_footprint
+            device.compute = self._layer_compute + inputs
+            # The main GPU computes the output head left on the CPU.
+            if device.output or (ram.output and i == 0):
+                device.compute = max(device.compute, self._output_compute + inputs)
+
+        ram_estimate = ram.to_estimate()
+        ram_estimate.uma = ram_estimate.nonuma
+        ram_estimate.nonuma += self._ram_footprint
+        return MemoryEstimate(
+            offloadLayers=gpu_layers,
+            fullOffloaded=gpu_layers > n_layer,
+            ram=ram_estimate,
+            vrams=[device.to_estimate() for device in devices],
+        )
+
+    def _assign(self, device: _Device, first: int, end: int):
+        n_layer = self._table.block_count
+        if end > n_layer:
+            device.output = True
+            device.weights += self._table.output_weights
+        layers_end = min(end, n_layer)
+        if layers_end > first:
+            device.layers = layers_end - first
+            device.last_layer = layers_end - 1
+            device.weights += self._weights_sums[layers_end] - self._weights_sums[first]
+            device.kv_cache += (
+                self._kv_cache_sums[layers_end] - self._kv_cache_sums[first]
+            )
+
+
+def _cumulative_splits(tensor_split: Optional[List[int]], remotes: int) -> List[float]:
+    if not tensor_split:
+        tensor_split = [1] * (remotes + 1)
+    total = sum(tensor_split)
+    if total <= 0:
+        tensor_split, total = [1] * len(tensor_split), len(tensor_split)
+    return [value / total for value in accumulate(tensor_split)]
+
+
+def _ceil_fraction(split: float, n: int) -> int:
+    """Return the first i with i / n >= split, compared as llama.cpp does."""
+    i = max(math.floor(split * n) - 1, 0)
+    while i / n < split:
+        i += 1
+    return i
+
+
+def _cache_type(name: Optional[str]) -> int:
+    if not name:
+        return GGML_TYPE_IDS["f16"]
+    if name.lower() not in GGML_TYPE_IDS:
+        raise UnsupportedGGUFError(f"Unknown cache type {name}")
+    return GGML_TYPE_IDS[name.lower()]
+
+
+def _parse_footprint(value: Optional[str]) -> Tuple[int, int]:
+    """Parse the platform footprint in MiB as RAM and VRAM bytes."""
+    try:
+        ram, vram = (int(v) for v in (value or "0,0").split(","))
+    except ValueError:
+        raise UnsupportedGGUFError(f"Invalid platform footprint {value}")
+    return ram * 1024**2, vram * 1024**2
@@ -24,6 +24,18 @@ class AsyncUniqueQueue:
             self.set.remove(item)
         return item
 
+    async def get_batch(self, max_items: int):
+        """
+        Wait for an item, then take the items already queued, up to max_items.
+        """
+        items = [await self.queue.get()]
+        while len(items) < max_items and not self.queue.empty():
+            items.append(self.queue.get_nowait())
+        async with self.lock:
+            for item in items:
+                self.set.remove(item)
+        return items
+
     def qsize(self):
         return self.queue.qsize()
 
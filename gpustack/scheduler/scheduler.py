@@ -4,9 +4,8 @@ import json
 import logging
 import os
 import queue
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
@@ -42,6 +41,7 @@ from gpustack.scheduler.model_registry import detect_model_type
 from gpustack.scheduler.meta_registry import get_model_meta
 from gpustack.scheduler.queue import AsyncUniqueQueue
 from gpustack.policies.worker_filters.status_filter import StatusFilter
+from gpustack.scheduler.allocation_index import AllocationIndex
 from gpustack import envs
 from gpustack.schemas.inference_backend import is_built_in_backend
 from gpustack.schemas.workers import Worker
@@ -92,6 +92,7 @@ class Scheduler:
         self._config = cfg
         self._check_interval = check_interval
         self._queue = AsyncUniqueQueue()
+        self._allocation_index = AllocationIndex()
         self._cache_dir = None
 
         if self._config.cache_dir is not None:
@@ -107,6 +108,10 @@ class Scheduler:
         """
 
         try:
+            # workers and model instances snapshot for scheduling decisions.
+            asyncio.create_task(self._allocation_index.start())
+            await self._allocation_index.wait_ready()
+
             # scheduler queue.
             asyncio.create_task(self._schedule_cycle())
 
@@ -169,7 +174,7 @@ class Scheduler:
                     await ModelInstanceService(session).update(instance)
 
                 # Get available workers for potential remote parsing
-                workers = await Worker.all(session)
+                workers = self._allocation_index.workers()
                 sorted_workers = await prioritize_workers_with_model_files(
                     session, model, workers
                 )
@@ -277,59 +282,68 @@ class Scheduler:
     async def _schedule_cycle(self):
         while True:
             try:
-                item = await self._queue.get()
-                try:
-                    await self._schedule_one(item)
-                    self._queue.task_done()
-                except Exception as e:
-                    logger.error(f"Failed to schedule model instance: {e}")
+                items = await self._queue.get_batch(envs.SCHEDULER_BATCH_SIZE)
+                groups: Dict[int, List[ModelInstance]] = {}
+                for item in items:
+                    groups.setdefault(item.model_id, []).append(item)
+
+                for group in groups.values():
+                    try:
+                        await self._schedule_batch(group)
+                        for _ in group:
+                            self._queue.task_done()
+                    except Exception as e:
+                        logger.error(f"Failed to schedule model instances: {e}")
             except queue.Empty:
                 continue
             except Exception as e:
                 logger.error(f"Failed to get item from schedule queue: {e}")
 
-    async def _schedule_one(self, instance: ModelInstance):  # noqa: C901
+    async def _schedule_batch(self, instances: List[ModelInstance]):  # noqa: C901
         """
-        Schedule a model instance by picking one candidate.
+        Schedule model instances of the same model in one pass.
         Args:
-            item: Model instance to schedule.
+            instances: Model instances to schedule.
         """
-        logger.debug(f"Scheduling model instance {instance.name}")
-
-        state_message = ""
+        model_id = instances[0].model_id
+        logger.debug(
+            f"Scheduling {len(instances)} model instance(s) of model(ID: {model_id})"
+        )
 
         async with async_session() as session:
-            workers = await Worker.all(session)
-            if not workers:
-                state_message = "No available workers"
-
-            model = await Model.one_by_id(session, instance.model_id)
-            if model is None:
-                state_message = "Model not found"
+            model = await Model.one_by_id(session, model_id)
+
+            model_instances = []
+            for instance in instances:
+                model_instance = await ModelInstance.one_by_id(session, instance.id)
+                if model_instance is None:
+                    logger.debug(
+                        f"Model instance(ID: {instance.id}) was deleted before scheduling due"
+                    )
+                    continue
+                model_instances.append(model_instance)
 
-            model_instance = await ModelInstance.one_by_id(session, instance.id)
-            if model_instance is None:
-                logger.debug(
-                    f"Model instance(ID: {instance.id}) was deleted before scheduling due"
-                )
+            if not model_instances:
                 return
 
-            model_instances = await ModelInstance.all(
-                session, options=[selectinload(ModelInstance.model)]
-            )
+            previous_instances = [mi.model_copy(deep=True) for mi in model_instances]
+            if model is None:
+                results = [(None, [], "Model not found")] * len(model_instances)
+            else:
+                results = await place_instances(
+                    self._config, model, model_instances, self._allocation_index
+                )
 
-            candidate = None
-            messages = []
-            if workers and model:
-                try:
-                    candidate, messages = await find_candidate(
-                        self._config, model, workers, model_instances
+            for model_instance, (candidate, messages, state_message) in zip(
+                model_instances, results
+            ):
+                if candidate is not None:
+                    logger.debug(
+                        f"Scheduled model instance {model_instance.name} to worker "
+                        f"{model_instance.worker_name} gpu {candidate.gpu_indexes}"
                     )
-                except Exception as e:
-                    state_message = f"Failed to find candidate: {e}"
+                    continue
 
-            if candidate is None:
-                # update model instance.
                 if model_instance.state in (
                     ModelInstanceStateEnum.SCHEDULED,
                     ModelInstanceStateEnum.ANALYZING,
@@ -340,46 +354,95 @@ class Scheduler:
                     )
                 if state_message != "":
                     model_instance.state_message = state_message
-
-                await ModelInstanceService(session).update(model_instance)
                 logger.debug(
                     f"No suitable workers for model instance {model_instance.name}, state: {model_instance.state}"
                 )
-            else:
-                # update model instance.
-                model_instance.state = ModelInstanceStateEnum.SCHEDULED
-                model_instance.state_message = ""
-                model_instance.worker_id = candidate.worker.id
-                model_instance.worker_name = candidate.worker.name
-                model_instance.worker_ip = candidate.worker.ip
-                model_instance.worker_advertise_address = (
-                    candidate.worker.advertise_address
-                )
-                model_instance.worker_ifname = candidate.worker.ifname
-                model_instance.computed_resource_claim = (
-                    candidate.computed_resource_claim
-                )
-                model_instance.gpu_type = candidate.gpu_type
-                model_instance.gpu_indexes = candidate.gpu_indexes
-                model_instance.gpu_addresses = candidate.gpu_addresses
-                model_instance.distributed_servers = DistributedServers(
-                    subordinate_workers=candidate.subordinate_workers,
-                )
-                if get_backend(model) in (
-                    BackendEnum.VLLM,
-                    BackendEnum.ASCEND_MINDIE,
-                    BackendEnum.SGLANG,
-                ):
-                    model_instance.distributed_servers.mode = (
-                        DistributedServerCoordinateModeEnum.INITIALIZE_LATER
-                    )
 
-                await ModelInstanceService(session).update(model_instance)
+            # Placements of the pass are saved together, and withdrawn from
+            # the allocation index if saving fails.
+            try:
+                await ModelInstanceService(session).batch_update(model_instances)
+            except Exception:
+                for previous_instance in previous_instances:
+                    self._allocation_index.remove(previous_instance.id)
+                    self._allocation_index.upsert(previous_instance)
+                raise
+
 
-                logger.debug(
-                    f"Scheduled model instance {model_instance.name} to worker "
-                    f"{model_instance.worker_name} gpu {candidate.gpu_indexes}"
-                )
+async def place_instances(
+    config: Config,
+    model: Model,
+    model_instances: List[ModelInstance],
+    allocation_index: AllocationIndex,
+) -> List[Tuple[Optional[ModelInstanceScheduleCandidate], List[str], str]]:
+    """
+    Place model instances of the same model one after another. Each placement
+    is applied to the model instance and to the allocation index before the
+    next instance is placed, so the placements of the pass don't overlap. A
+    distributed placement reserves the main worker and all subordinate
+    workers at once, or nothing if no candidate fits.
+    :param config: GPUStack configuration.
+    :param model: Model of the model instances.
+    :param model_instances: Model instances to place.
+    :param allocation_index: Workers and allocated resources.
+    :return: A list with a tuple per model instance containing:
+                - The schedule candidate, or None.
+                - A list of messages for the scheduling process.
+                - A state message if the placement failed, or an empty string.
+    """
+    results = []
+    for model_instance in model_instances:
+        workers = allocation_index.workers()
+        if not workers:
+            results.append((None, [], "No available workers"))
+            continue
+
+        try:
+            candidate, messages = await find_candidate(
+                config, model, workers, allocation_index
+            )
+        except Exception as e:
+            results.append((None, [], f"Failed to find candidate: {e}"))
+            continue
+
+        if candidate is not None:
+            apply_candidate(model_instance, model, candidate)
+            allocation_index.upsert(model_instance)
+        results.append((candidate, messages, ""))
+
+    return results
+
+
+def apply_candidate(
+    model_instance: ModelInstance,
+    model: Model,
+    candidate: ModelInstanceScheduleCandidate,
+):
+    """
+    Assign the model instance to the candidate.
+    """
+    model_instance.state = ModelInstanceStateEnum.SCHEDULED
+    model_instance.state_message = ""
+    model_instance.worker_id = candidate.worker.id
+    model_instance.worker_name = candidate.worker.name
+    model_instance.worker_ip = candidate.worker.ip
+    model_instance.worker_advertise_address = candidate.worker.advertise_address
+    model_instance.worker_ifname = candidate.worker.ifname
+    model_instance.computed_resource_claim = candidate.computed_resource_claim
+    model_instance.gpu_type = candidate.gpu_type
+    model_instance.gpu_indexes = candidate.gpu_indexes
+    model_instance.gpu_addresses = candidate.gpu_addresses
+    model_instance.distributed_servers = DistributedServers(
+        subordinate_workers=candidate.subordinate_workers,
+    )
+    if get_backend(model) in (
+        BackendEnum.VLLM,
+        BackendEnum.ASCEND_MINDIE,
+        BackendEnum.SGLANG,
+    ):
+        model_instance.distributed_servers.mode = (
+            DistributedServerCoordinateModeEnum.INITIALIZE_LATER
+        )
 
 
 async def find_candidate(
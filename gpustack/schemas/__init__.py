@@ -29,6 +29,7 @@ from gpustack.schemas.models import (
     ModelInstance,
     ModelInstanceCreate,
     ModelInstanceUpdate,
+    ModelInstanceBatchUpdate,
     ModelInstancePublic,
     ModelInstancesPublic,
     ComputedResourceClaim,
@@ -120,6 +121,7 @@ __all__ = [
     "ModelInstance",
     "ModelInstanceCreate",
     "ModelInstanceUpdate",
+    "ModelInstanceBatchUpdate",
     "ModelInstancePublic",
     "ModelInstancesPublic",
     "ComputedResourceClaim",
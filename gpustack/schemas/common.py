@@ -32,6 +32,10 @@ class ListParams(BaseModel):
     # FIXME It uses camelCase but most APIs use snake_case. We might want to migrate to snake_case later.
     perPage: int = Query(default=100)
     watch: bool = Query(default=False)
+    resource_version: Optional[int] = Query(
+        default=None,
+        description="Resume a watch after this resource version. Events of the watch include their resource version.",
+    )
     sort_by: Optional[str] = Query(
         default=None,
         description="Sorting in the format: field1,-field2,field3. A leading '-' indicates descending order.",
@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Optional
 
 from pydantic import ConfigDict
-from sqlalchemy import BigInteger, Column
+from sqlalchemy import BigInteger, Column, String, UniqueConstraint
 from sqlmodel import Field, SQLModel
 from gpustack.mixins.active_record import ActiveRecordMixin
 
@@ -20,6 +20,7 @@ class OperationEnum(str, Enum):
 
 class ModelUsage(SQLModel, ActiveRecordMixin, table=True):
     __tablename__ = 'model_usages'
+    __table_args__ = (UniqueConstraint('usage_key', name='uix_model_usages_usage_key'),)
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[int] = Field(default=None, foreign_key="users.id")
     model_id: Optional[int] = Field(default=None, foreign_key="models.id")
@@ -37,5 +38,10 @@ class ModelUsage(SQLModel, ActiveRecordMixin, table=True):
         default=..., sa_column=Column(BigInteger, nullable=False)
     )
     operation: Optional[OperationEnum] = Field(default=None)
+    # Digest of the fields identifying the row, used to add usage deltas to
+    # it atomically. See gpustack.server.usage_buffer.build_usage_key.
+    usage_key: Optional[str] = Field(
+        default=None, sa_column=Column(String(64), nullable=True)
+    )
 
     model_config = ConfigDict(protected_namespaces=())
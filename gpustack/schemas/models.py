@@ -485,6 +485,23 @@ class ModelInstanceBase(SQLModel, ModelSource):
 
     cluster_id: Optional[int] = Field(default=None, foreign_key="clusters.id")
 
+    def is_assigned_to(self, worker_id: int) -> bool:
+        """
+        Return whether the model instance is assigned to the given worker,
+        as the main worker or one of the subordinate workers.
+        """
+
+        if self.worker_id == worker_id:
+            return True
+
+        dservers = self.distributed_servers
+        subworkers = (
+            dservers.subordinate_workers
+            if dservers and dservers.subordinate_workers
+            else []
+        )
+        return any(subworker.worker_id == worker_id for subworker in subworkers)
+
     def get_deployment_metadata(
         self,
         worker_id: int,
@@ -575,6 +592,10 @@ class ModelInstanceUpdate(ModelInstanceBase):
     pass
 
 
+class ModelInstanceBatchUpdate(ModelInstanceUpdate):
+    id: int
+
+
 class ModelInstancePublic(
     ModelInstanceBase,
 ):
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from datetime import datetime, timezone
 from enum import Enum
 from typing import ClassVar, Dict, Optional, Any
@@ -306,6 +308,82 @@ class WorkerStatusPublic(WorkerStatusStored):
     gateway_endpoint: Optional[str] = None
 
 
+def diff_worker_status(previous: dict, current: dict, threshold: float = 0) -> dict:
+    """
+    Compute the delta between two worker status reports dumped in JSON mode.
+
+    Top level fields are compared as a whole, and so are the fields of
+    `status`, e.g. `status.gpu_devices`. A numeric value counts as changed
+    only if it moved by more than the threshold, relative to the `total` next
+    to it, to 100 for utilization rates, or to its previous value otherwise.
+    """
+    delta = {}
+    for key, value in current.items():
+        previous_value = previous.get(key)
+        if (
+            key == "status"
+            and isinstance(value, dict)
+            and isinstance(previous_value, dict)
+        ):
+            status_delta = {
+                k: v
+                for k, v in value.items()
+                if k not in previous_value
+                or _status_changed(previous_value[k], v, threshold)
+            }
+            if status_delta:
+                delta[key] = status_delta
+        elif key not in previous or previous_value != value:
+            delta[key] = value
+    return delta
+
+
+def worker_status_digest(report: dict) -> str:
+    """Return the digest of a worker status report dumped in JSON mode."""
+    return hashlib.sha256(json.dumps(report, sort_keys=True).encode()).hexdigest()
+
+
+def merge_worker_status(report: dict, delta: dict) -> dict:
+    """Apply a delta computed by `diff_worker_status` to a status report."""
+    merged = {**report, **delta}
+    if isinstance(report.get("status"), dict) and isinstance(delta.get("status"), dict):
+        merged["status"] = {**report["status"], **delta["status"]}
+    return merged
+
+
+def _status_changed(
+    previous: Any,
+    current: Any,
+    threshold: float,
+    key: Optional[str] = None,
+    siblings: Optional[dict] = None,
+) -> bool:
+    if isinstance(previous, dict) and isinstance(current, dict):
+        if previous.keys() != current.keys():
+            return True
+        return any(
+            _status_changed(previous[k], v, threshold, k, current)
+            for k, v in current.items()
+        )
+    if isinstance(previous, list) and isinstance(current, list):
+        if len(previous) != len(current):
+            return True
+        return any(_status_changed(p, c, threshold) for p, c in zip(previous, current))
+    if _is_number(previous) and _is_number(current):
+        if key == "utilization_rate":
+            scale = 100
+        elif key != "total" and siblings and _is_number(siblings.get("total")):
+            scale = siblings["total"]
+        else:
+            scale = abs(previous)
+        return abs(current - previous) > threshold * scale
+    return previous != current
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
 class WorkerUpdate(SQLModel):
     """
     WorkerUpdate: updatable fields for Worker
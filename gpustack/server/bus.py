@@ -1,9 +1,16 @@
 import asyncio
+from collections import deque
 from dataclasses import dataclass, field
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 from enum import Enum
 
+from prometheus_client import Counter, Gauge, Histogram
+
+from gpustack import envs
+from gpustack.utils.name import metric_name
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +31,8 @@ class Event:
     data: Any
     changed_fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
     id: Optional[Any] = None
+    # Assigned by the event bus on publish, increasing with every event.
+    resource_version: Optional[int] = None
 
     def __post_init__(self):
         if isinstance(self.type, int):
@@ -32,6 +41,20 @@ class Event:
         if self.id is None:
             self.id = self._derive_id_from_data()
 
+        # Not a dataclass field, so it stays out of comparisons and encoding.
+        self._encoded: Dict[Any, bytes] = {}
+
+    def encode(self, key: Any, encoder: Callable[["Event"], bytes]) -> bytes:
+        """
+        Encode the event with the encoder once per key. The same event is
+        delivered to all subscribers of a topic, so they share the bytes.
+        """
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            encoded = encoder(self)
+            self._encoded[key] = encoded
+        return encoded
+
     def _derive_id_from_data(self) -> Optional[Any]:
         if self.data is None:
             return None
@@ -56,65 +79,356 @@ def event_decoder(obj):
     return obj
 
 
+class OverflowPolicy(str, Enum):
+    """
+    What a subscriber does when its queue is full.
+
+    - drop_oldest: drop the oldest queued event.
+    - coalesce: merge queued events of the same object into one. No event is
+      dropped, so the queue may grow past its size, up to about one event
+      per object. For subscribers keeping state, such as controllers.
+    - disconnect: drop the queue and disconnect the subscriber.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class SubscriberDisconnectedError(Exception):
+    """Raised to a subscriber disconnected by the disconnect overflow policy."""
+
+
+event_bus_subscribers = Gauge(
+    metric_name("event_bus_subscribers"),
+    "Number of event bus subscribers",
+    ["topic"],
+)
+event_bus_queue_depth = Gauge(
+    metric_name("event_bus_queue_depth"),
+    "Number of events queued for all subscribers of a topic",
+    ["topic"],
+)
+event_bus_delivery_lag = Histogram(
+    metric_name("event_bus_delivery_lag_seconds"),
+    "Time between publishing an event and a subscriber receiving it",
+    ["topic"],
+)
+event_bus_publish_duration = Histogram(
+    metric_name("event_bus_publish_duration_seconds"),
+    "Time spent fanning out an event to the subscribers of a topic",
+    ["topic"],
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+)
+event_bus_dropped_events = Counter(
+    metric_name("event_bus_dropped_events"),
+    "Events dropped or merged because a subscriber queue was full",
+    ["topic", "policy"],
+)
+
+
+def _object_key(event: Event) -> Optional[Any]:
+    if event.id is not None:
+        return event.id
+    if hasattr(event.data, "id"):
+        return event.data.id
+    if isinstance(event.data, dict):
+        return event.data.get("id")
+    return None
+
+
+def _merge_events(previous: Event, event: Event) -> Optional[Event]:
+    """
+    Merge two queued events of the same object into the event a subscriber
+    would end up with. Returns None when they cancel each other out.
+    """
+    if event.type == EventType.DELETED:
+        if previous.type == EventType.CREATED:
+            return None
+        return event
+
+    if previous.type == EventType.CREATED:
+        return Event(
+            type=EventType.CREATED,
+            data=event.data,
+            resource_version=event.resource_version,
+        )
+
+    changed_fields = dict(previous.changed_fields)
+    for key, (old, new) in event.changed_fields.items():
+        if key in previous.changed_fields:
+            old = previous.changed_fields[key][0]
+        changed_fields[key] = (old, new)
+    return Event(
+        type=event.type,
+        data=event.data,
+        changed_fields=changed_fields,
+        id=event.id,
+        resource_version=event.resource_version,
+    )
+
+
 class Subscriber:
-    def __init__(self):
-        self.queue = asyncio.Queue(maxsize=1024)
-        self.latest_by_key = {}
-        self.lock = asyncio.Lock()
+    """
+    A bounded queue of events for one consumer of a topic.
+
+    Enqueuing never blocks. UPDATED events are squashed by keeping only the
+    latest per key unless squash is disabled, and the overflow policy
+    applies when the queue is full.
+    """
+
+    def __init__(
+        self,
+        topic: str = "",
+        maxsize: int = 1024,
+        overflow_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+        squash: bool = True,
+    ):
+        self.topic = topic
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.squash = squash
+        self.queue: Deque[Tuple[Event, float]] = deque()
+        self.latest_by_key: Dict[Any, Event] = {}
+        self.disconnected = False
+        self._ready = asyncio.Event()
+
+    def enqueue(self, event: Event):
+        if self.disconnected:
+            return
 
-    async def enqueue(self, event: Event):
         # Squash UPDATED events by keeping only the latest per key
-        if event.type == EventType.UPDATED and event.id is not None:
-            async with self.lock:
-                if event.id in self.latest_by_key:
-                    self.latest_by_key[event.id] = event
-                    return
+        if self.squash and event.type == EventType.UPDATED and event.id is not None:
+            if event.id in self.latest_by_key:
                 self.latest_by_key[event.id] = event
+                return
+            self.latest_by_key[event.id] = event
+
+        if len(self.queue) >= self.maxsize:
+            self._overflow()
+            if self.disconnected:
+                return
 
-            try:
-                self.queue.put_nowait(event)
-            except asyncio.QueueFull:
-                # If the queue is full, skip adding the event, relying on latest_by_key, could receive it later
-                logger.warning(
-                    "Subscriber:%s queue full, skipping UPDATED event for id=%s",
-                    id(self),
-                    event.id,
+        self.queue.append((event, time.monotonic()))
+        event_bus_queue_depth.labels(self.topic).inc()
+        self._ready.set()
+
+    async def receive(self) -> Event:
+        while not self.queue:
+            if self.disconnected:
+                raise SubscriberDisconnectedError(
+                    f"Subscriber of {self.topic} disconnected, queue overflowed"
                 )
+            self._ready.clear()
+            await self._ready.wait()
+
+        event, enqueued_at = self.queue.popleft()
+        event_bus_queue_depth.labels(self.topic).dec()
+        event_bus_delivery_lag.labels(self.topic).observe(
+            time.monotonic() - enqueued_at
+        )
+        if self.squash and event.type == EventType.UPDATED and event.id is not None:
+            return self.latest_by_key.pop(event.id, event)
+
+        return event
+
+    def close(self):
+        event_bus_queue_depth.labels(self.topic).dec(len(self.queue))
+        self.queue.clear()
+        self.latest_by_key.clear()
+
+    def _overflow(self):
+        if self.overflow_policy == OverflowPolicy.DISCONNECT:
+            logger.warning(
+                "Subscriber:%s of %s queue full, disconnecting", id(self), self.topic
+            )
+            event_bus_dropped_events.labels(self.topic, self.overflow_policy.value).inc(
+                len(self.queue)
+            )
+            self.close()
+            self.disconnected = True
+            self._ready.set()
             return
 
-        # For other event types, enqueue directly
-        await self.queue.put(event)
+        if self.overflow_policy == OverflowPolicy.COALESCE:
+            # Never drop events, a missed CREATED or DELETED event would leave
+            # the subscriber with a stale view of the objects.
+            self._coalesce()
+            return
 
-    async def receive(self) -> Any:
-        event = await self.queue.get()
+        event, _ = self.queue.popleft()
         if event.type == EventType.UPDATED and event.id is not None:
-            async with self.lock:
-                return self.latest_by_key.pop(event.id, event)
+            self.latest_by_key.pop(event.id, None)
+        event_bus_queue_depth.labels(self.topic).dec()
+        event_bus_dropped_events.labels(
+            self.topic, OverflowPolicy.DROP_OLDEST.value
+        ).inc()
 
-        return event
+    def _coalesce(self):
+        """Merge the queued events of each object into a single event."""
+        merged: List[Optional[Tuple[Event, float]]] = []
+        positions: Dict[Any, int] = {}
+        for event, enqueued_at in self.queue:
+            if event.type == EventType.UPDATED and event.id is not None:
+                event = self.latest_by_key.get(event.id, event)
+
+            key = _object_key(event)
+            position = positions.get(key)
+            if key is None or position is None or merged[position] is None:
+                if key is not None:
+                    positions[key] = len(merged)
+                merged.append((event, enqueued_at))
+                continue
+
+            previous, previous_enqueued_at = merged[position]
+            if previous.type == EventType.DELETED:
+                # The object was recreated, keep both events.
+                positions[key] = len(merged)
+                merged.append((event, enqueued_at))
+                continue
+
+            result = _merge_events(previous, event)
+            merged[position] = (
+                (result, previous_enqueued_at) if result is not None else None
+            )
+
+        entries = [entry for entry in merged if entry is not None]
+        dropped = len(self.queue) - len(entries)
+        if dropped == 0:
+            return
+
+        self.queue = deque(entries)
+        self.latest_by_key = {
+            event.id: event
+            for event, _ in entries
+            if event.type == EventType.UPDATED and event.id is not None
+        }
+        event_bus_queue_depth.labels(self.topic).dec(dropped)
+        event_bus_dropped_events.labels(self.topic, OverflowPolicy.COALESCE.value).inc(
+            dropped
+        )
 
 
 class EventBus:
-    def __init__(self):
+    """
+    Fan out events to the subscribers of a topic.
+
+    Publishing only appends the event to the subscriber queues and never
+    waits on a subscriber, so a slow consumer cannot hold up the others.
+
+    Published events get increasing resource versions and the latest ones
+    are kept per topic, so a subscriber can catch up on the events after a
+    version instead of listing everything again. Versions follow the clock
+    in microseconds. Servers sharing events number them on their own, so
+    only versions handed out by this bus can be resumed from.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = envs.EVENT_BUS_SUBSCRIBER_QUEUE_SIZE,
+        history_size: int = envs.EVENT_BUS_HISTORY_SIZE,
+    ):
+        self.maxsize = maxsize
         self.subscribers: Dict[str, List[Subscriber]] = {}
+        self.history_size = history_size
+        self.history: Dict[str, Deque[Event]] = {}
+        self.resource_version = time.time_ns() // 1000
+        # Events up to these versions are not in the history.
+        self._history_start: Dict[str, int] = {}
+        self._initial_version = self.resource_version
 
-    def subscribe(self, topic: str) -> Subscriber:
-        subscriber = Subscriber()
+    def subscribe(
+        self,
+        topic: str,
+        overflow_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+        squash: bool = True,
+    ) -> Subscriber:
+        subscriber = Subscriber(topic, self.maxsize, overflow_policy, squash)
         if topic not in self.subscribers:
             self.subscribers[topic] = []
         self.subscribers[topic].append(subscriber)
+        event_bus_subscribers.labels(topic).inc()
         return subscriber
 
     def unsubscribe(self, topic: str, subscriber: Subscriber):
-        if topic in self.subscribers:
+        if topic in self.subscribers and subscriber in self.subscribers[topic]:
             self.subscribers[topic].remove(subscriber)
+            subscriber.close()
+            event_bus_subscribers.labels(topic).dec()
             if not self.subscribers[topic]:
                 del self.subscribers[topic]
 
+    def topic_version(self, topic: str) -> int:
+        """Return the resource version of the latest event of the topic."""
+        history = self.history.get(topic)
+        if history:
+            return history[-1].resource_version
+        return self._history_start.get(topic, self._initial_version)
+
+    def events_since(self, topic: str, resource_version: int) -> Optional[List[Event]]:
+        """
+        Return the events of the topic published after the resource version,
+        or None if the version was not handed out by this bus for the topic
+        or some of the events are no longer in the history.
+        """
+        history = list(self.history.get(topic, ()))
+        if resource_version == self._history_start.get(topic, self._initial_version):
+            return history
+
+        for i in range(len(history) - 1, -1, -1):
+            if history[i].resource_version == resource_version:
+                return history[i + 1 :]
+        return None
+
     async def publish(self, topic: str, event: Event):
-        if topic in self.subscribers:
-            for subscriber in self.subscribers[topic]:
-                await subscriber.enqueue(event)
+        self.resource_version = max(self.resource_version + 1, time.time_ns() // 1000)
+        event.resource_version = self.resource_version
+
+        history = self.history.setdefault(topic, deque())
+        if len(history) >= self.history_size:
+            self._history_start[topic] = history.popleft().resource_version
+        history.append(event)
+
+        subscribers = self.subscribers.get(topic)
+        if not subscribers:
+            return
+
+        start_time = time.perf_counter()
+        for subscriber in subscribers:
+            subscriber.enqueue(event)
+        event_bus_publish_duration.labels(topic).observe(
+            time.perf_counter() - start_time
+        )
+
+
+class EventBusBackend:
+    """
+    Deliver the change events of committed transactions to the event bus.
+
+    The default backend delivers to the in-process bus only. Backends that
+    share events across server replicas override it.
+    """
+
+    def __init__(self, bus: EventBus):
+        self.bus = bus
+
+    async def start(self):
+        pass
+
+    async def publish(self, events: List[Tuple[str, Event]]):
+        """Publish the events of one commit, as (topic, event) pairs."""
+        for topic, event in events:
+            await self.bus.publish(topic, event)
 
 
 event_bus = EventBus()
+_event_bus_backend: EventBusBackend = EventBusBackend(event_bus)
+
+
+def get_event_bus_backend() -> EventBusBackend:
+    return _event_bus_backend
+
+
+def set_event_bus_backend(backend: EventBusBackend):
+    global _event_bus_backend
+    _event_bus_backend = backend
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import asyncpg
+from fastapi.encoders import jsonable_encoder
+
+from gpustack import envs
+from gpustack.mixins.active_record import ActiveRecordMixin
+from gpustack.server.bus import Event, EventBus, EventBusBackend, EventType
+from gpustack.server.init_db import parse_postgres_url
+from gpustack.server.services import invalidate_service_caches
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads must be shorter than 8000 bytes. Messages are split into
+# pieces small enough to stay under the limit after JSON escaping.
+NOTIFY_PIECE_SIZE = 3500
+
+
+def _topic_classes() -> Dict[str, Type[ActiveRecordMixin]]:
+    classes = {}
+    pending = list(ActiveRecordMixin.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if getattr(cls, "__table__", None) is not None:
+            classes[cls.__name__.lower()] = cls
+    return classes
+
+
+class PostgresEventBusBackend(EventBusBackend):
+    """
+    Share change events between server replicas with PostgreSQL
+    LISTEN/NOTIFY.
+
+    The events of a commit are delivered to the local bus right away, and
+    sent to the other replicas as one notification, split into pieces sent
+    in a single transaction when it exceeds the payload limit. Events
+    published while the listener is reconnecting are only delivered locally.
+    """
+
+    channel = "gpustack_events"
+
+    def __init__(
+        self,
+        bus: EventBus,
+        dsn: str,
+        connect_args: Optional[dict] = None,
+        reconnect_interval: float = 5,
+        keepalive_interval: float = 30,
+    ):
+        super().__init__(bus)
+        self._dsn = dsn
+        self._connect_args = connect_args or {}
+        self._reconnect_interval = reconnect_interval
+        self._keepalive_interval = keepalive_interval
+        self._origin = uuid.uuid4().hex
+        self._conn: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._pieces: Dict[str, List[Optional[str]]] = {}
+        self._classes: Dict[str, Type[ActiveRecordMixin]] = {}
+
+    async def start(self):
+        dispatcher = asyncio.create_task(self._dispatch_loop())
+        try:
+            while True:
+                try:
+                    await self._listen()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Event bus listener disconnected: {e}")
+                await asyncio.sleep(self._reconnect_interval)
+        finally:
+            dispatcher.cancel()
+
+    async def publish(self, events: List[Tuple[str, Event]]):
+        await super().publish(events)
+
+        conn = self._conn
+        if conn is None:
+            logger.warning(
+                "Event bus listener is not connected, events are delivered locally"
+            )
+            return
+
+        try:
+            payloads = self.encode(events)
+            async with self._lock:
+                async with conn.transaction():
+                    for payload in payloads:
+                        await conn.execute(
+                            "SELECT pg_notify($1, $2)", self.channel, payload
+                        )
+        except Exception as e:
+            logger.error(f"Failed to share events with other servers: {e}")
+
+    def encode(self, events: List[Tuple[str, Event]]) -> List[str]:
+        """Encode the events of a commit as NOTIFY payloads."""
+        message = json.dumps(
+            {
+                "o": self._origin,
+                "e": [
+                    {
+                        "t": topic,
+                        "y": event.type.name,
+                        "i": event.id,
+                        "d": jsonable_encoder(event.data.model_dump()),
+                        "c": jsonable_encoder(event.changed_fields),
+                    }
+                    for topic, event in events
+                ],
+            },
+            separators=(",", ":"),
+        )
+        if len(message) <= NOTIFY_PIECE_SIZE:
+            return [message]
+
+        message_id = uuid.uuid4().hex
+        pieces = [
+            message[i : i + NOTIFY_PIECE_SIZE]
+            for i in range(0, len(message), NOTIFY_PIECE_SIZE)
+        ]
+        return [
+            json.dumps(
+                {
+                    "o": self._origin,
+                    "m": message_id,
+                    "s": sequence,
+                    "n": len(pieces),
+                    "p": piece,
+                },
+                separators=(",", ":"),
+            )
+            for sequence, piece in enumerate(pieces)
+        ]
+
+    def receive(self, payload: str):
+        """Queue the events of a notification sent by another replica."""
+        envelope = json.loads(payload)
+        if envelope["o"] == self._origin:
+            return
+
+        if "e" not in envelope:
+            pieces = self._pieces.setdefault(envelope["m"], [None] * envelope["n"])
+            pieces[envelope["s"]] = envelope["p"]
+            if any(piece is None for piece in pieces):
+                return
+            envelope = json.loads("".join(self._pieces.pop(envelope["m"])))
+
+        self._inbox.put_nowait(envelope["e"])
+
+    async def _listen(self):
+        conn = await asyncpg.connect(self._dsn, **self._connect_args)
+        terminated = asyncio.Event()
+        conn.add_termination_listener(lambda _: terminated.set())
+        try:
+            await conn.add_listener(self.channel, self._on_notification)
+            self._pieces.clear()
+            self._conn = conn
+            logger.info("Event bus listener connected")
+            while not terminated.is_set():
+                try:
+                    await asyncio.wait_for(
+                        terminated.wait(), timeout=self._keepalive_interval
+                    )
+                except asyncio.TimeoutError:
+                    async with self._lock:
+                        await conn.fetchval("SELECT 1")
+        finally:
+            self._conn = None
+            if not conn.is_closed():
+                await conn.close()
+
+    def _on_notification(self, conn, pid: int, channel: str, payload: str):
+        try:
+            self.receive(payload)
+        except Exception as e:
+            logger.error(f"Failed to decode event bus notification: {e}")
+
+    async def _dispatch_loop(self):
+        while True:
+            records = await self._inbox.get()
+            try:
+                await self.dispatch(records)
+            except Exception as e:
+                logger.error(f"Failed to dispatch events from other servers: {e}")
+
+    async def dispatch(self, records: List[Dict[str, Any]]):
+        """Publish the events of a commit made by another replica locally."""
+        events = []
+        for record in records:
+            event = self._decode(record)
+            if event is not None:
+                events.append((record["t"], event))
+
+        for changed_topic in {topic for topic, _ in events}:
+            # The change was committed by another server, so the cached list
+            # of this server is stale.
+            await self._classes[changed_topic]._invalidate_cached_all()
+
+        for topic, event in events:
+            await invalidate_service_caches(topic, event)
+            await self.bus.publish(topic, event)
+
+    def _decode(self, record: Dict[str, Any]) -> Optional[Event]:
+        topic = record["t"]
+        if topic not in self._classes:
+            self._classes = _topic_classes()
+        cls = self._classes.get(topic)
+        if cls is None:
+            logger.warning(f"Skipped event of unknown topic {topic}")
+            return None
+
+        try:
+            return Event(
+                type=EventType[record["y"]],
+                data=cls.model_validate(record["d"]),
+                changed_fields={
+                    key: tuple(value) for key, value in record["c"].items()
+                },
+                id=record["i"],
+            )
+        except Exception as e:
+            logger.error(f"Failed to decode {topic} event: {e}")
+            return None
+
+
+def create_event_bus_backend(bus: EventBus, db_url: str) -> EventBusBackend:
+    backend = envs.EVENT_BUS_BACKEND
+    if backend == "local":
+        return EventBusBackend(bus)
+
+    if backend == "postgresql":
+        if not db_url.startswith("postgresql://"):
+            logger.warning(
+                "The postgresql event bus backend requires a PostgreSQL database, "
+                "falling back to the local backend"
+            )
+            return EventBusBackend(bus)
+        url, connect_args = parse_postgres_url(db_url)
+        dsn = url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        return PostgresEventBusBackend(bus, dsn, connect_args)
+
+    raise ValueError(f"Unsupported event bus backend: {backend}")
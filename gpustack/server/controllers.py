@@ -71,6 +71,7 @@ from gpustack.schemas.users import (
     is_default_cluster_user,
 )
 from gpustack.server.bus import Event, EventType, event_bus
+from gpustack.server.work_queue import WorkQueue
 from gpustack.utils.model_source import get_draft_model_source
 from gpustack import envs
 from gpustack.server.db import async_session
@@ -106,6 +107,7 @@ from gpustack.gateway.client.networking_istio_io_v1alpha3_api import (
 )
 from gpustack.gateway import utils as mcp_handler
 from gpustack.gateway import get_async_k8s_config
+from gpustack.gateway.sync import gateway_sync
 from gpustack.schemas.model_provider import (
     ModelProvider,
 )
@@ -130,11 +132,9 @@ class ModelController:
             base_client = k8s_client.ApiClient(configuration=self._k8s_config)
             self._higress_network_api = NetworkingHigressIoV1Api(base_client)
 
-        async for event in Model.subscribe(source="model_controller"):
-            if event.type == EventType.HEARTBEAT:
-                continue
-
-            await self._reconcile(event)
+        await WorkQueue("model", self._reconcile).run(
+            Model.subscribe(source="model_controller")
+        )
 
     async def _ensure_model_mcp_bridge(
         self, session: AsyncSession, event_type: EventType, model: Model
@@ -158,14 +158,24 @@ class ModelController:
             )
             worker_by_id = {worker.id: worker for worker in workers}
 
-        await mcp_handler.ensure_model_mcp_bridge(
-            event_type=event_type,
-            model_id=model.id,
-            model_instances=model_instances,
-            networking_higress_api=self._higress_network_api,
-            namespace=self._config.gateway_namespace,
-            cluster_id=model.cluster_id,
-            workers=worker_by_id,
+        namespace = self._config.gateway_namespace
+        mcp_bridge_name = mcp_handler.model_mcp_bridge_name(model.cluster_id)
+        registries = mcp_handler.model_mcp_bridge_registries(
+            event_type, model_instances, worker_by_id
+        )
+        gateway_sync.sync(
+            key=("McpBridge", namespace, mcp_bridge_name, model.id),
+            desired=registries,
+            apply=partial(
+                mcp_handler.ensure_mcp_bridge,
+                client=self._higress_network_api,
+                namespace=namespace,
+                mcp_bridge_name=mcp_bridge_name,
+                desired_registries=registries,
+                to_delete_prefix=mcp_handler.model_prefix(model.id),
+            ),
+            object_key=("McpBridge", namespace, mcp_bridge_name),
+            deleted=event_type == EventType.DELETED,
         )
 
     async def _reconcile(self, event: Event):
@@ -197,11 +207,13 @@ class ModelInstanceController:
         Start the controller.
         """
 
-        async for event in ModelInstance.subscribe(source="model_instance_controller"):
-            if event.type == EventType.HEARTBEAT:
-                continue
-
-            await self._reconcile(event)
+        # Instances of the same model are reconciled one at a time, as they
+        # all sync the ready replicas of the model.
+        await WorkQueue(
+            "model_instance",
+            self._reconcile,
+            key=lambda event: getattr(event.data, "model_id", None),
+        ).run(ModelInstance.subscribe(source="model_instance_controller"))
 
     async def _reconcile(self, event: Event):
         """
@@ -625,11 +637,23 @@ async def sync_model_route_mapper(
         current_spec.matchRules = to_keep_rules
         return current_spec
 
-    await mcp_handler.ensure_wasm_plugin(
-        api=extensions_api,
-        name=mcp_handler.gpustack_model_mapper_name,
-        namespace=cfg.gateway_namespace,
-        spec_diff=spec_diff,
+    object_key = (
+        "WasmPlugin",
+        cfg.gateway_namespace,
+        mcp_handler.gpustack_model_mapper_name,
+    )
+    gateway_sync.sync(
+        key=(*object_key, ingress_name),
+        desired=expected_rules,
+        apply=partial(
+            mcp_handler.ensure_wasm_plugin,
+            api=extensions_api,
+            name=mcp_handler.gpustack_model_mapper_name,
+            namespace=cfg.gateway_namespace,
+            spec_diff=spec_diff,
+        ),
+        object_key=object_key,
+        deleted=not expected_rules,
     )
 
 
@@ -672,7 +696,7 @@ async def ensure_route_ai_proxy_config(
                     "activeProviderId": operating_id,
                 },
                 configDisable=False,
-                service=list(unique_registry_services),
+                service=sorted(unique_registry_services),
                 ingress=[f"{service_namespace_prefix}{ingress_name}"],
             )
         )
@@ -684,21 +708,33 @@ async def ensure_route_ai_proxy_config(
                     "activeProviderId": operating_id,
                 },
                 configDisable=False,
-                service=list(unique_fallback_registry_services),
+                service=sorted(unique_fallback_registry_services),
                 ingress=[f"{service_namespace_prefix}{fallback_ingress_name}"],
             )
         )
 
-    await mcp_handler.ensure_wasm_plugin(
-        api=extensions_api,
-        name=mcp_handler.gpustack_ai_proxy_name,
-        namespace=cfg.gateway_namespace,
-        spec_diff=partial(
-            mcp_handler.ai_proxy_diff_spec,
-            expected_providers=expected_providers,
-            expected_match_rules=expected_match_rules,
-            operating_id_prefix=operating_id,
+    object_key = (
+        "WasmPlugin",
+        cfg.gateway_namespace,
+        mcp_handler.gpustack_ai_proxy_name,
+    )
+    gateway_sync.sync(
+        key=(*object_key, operating_id),
+        desired=(expected_providers, expected_match_rules),
+        apply=partial(
+            mcp_handler.ensure_wasm_plugin,
+            api=extensions_api,
+            name=mcp_handler.gpustack_ai_proxy_name,
+            namespace=cfg.gateway_namespace,
+            spec_diff=partial(
+                mcp_handler.ai_proxy_diff_spec,
+                expected_providers=expected_providers,
+                expected_match_rules=expected_match_rules,
+                operating_id_prefix=operating_id,
+            ),
         ),
+        object_key=object_key,
+        deleted=not expected_providers and not expected_match_rules,
     )
 
 
@@ -746,7 +782,7 @@ async def sync_gateway(
     # route is always hit when fallback is configured, even if the main route has no valid
     # destination. This is to avoid potential misconfiguration that causes the main route to
     # have no destination and the fallback route is not hit at all.
-    await mcp_handler.ensure_model_ingress(
+    sync_model_ingress(
         event_type=event_type,
         ingress_name=ingress_name,
         route_name=model_route.name,
@@ -760,7 +796,7 @@ async def sync_gateway(
     if not has_fallback_target:
         fallback_event_type = EventType.DELETED
     # Fallback ingress
-    await mcp_handler.ensure_model_ingress(
+    sync_model_ingress(
         event_type=fallback_event_type,
         ingress_name=mcp_handler.fallback_ingress_name(ingress_name),
         route_name=model_route.name,
@@ -774,11 +810,17 @@ async def sync_gateway(
         ),
     )
     # Fallback filter
-    await mcp_handler.ensure_fallback_filter(
-        event_type=fallback_event_type,
-        ingress_name=ingress_name,
-        namespace=cfg.get_namespace(),
-        networking_istio_api=istio_networking_api,
+    gateway_sync.sync(
+        key=("EnvoyFilter", cfg.get_namespace(), ingress_name),
+        desired=fallback_event_type == EventType.DELETED,
+        apply=partial(
+            mcp_handler.ensure_fallback_filter,
+            event_type=fallback_event_type,
+            ingress_name=ingress_name,
+            namespace=cfg.get_namespace(),
+            networking_istio_api=istio_networking_api,
+        ),
+        deleted=fallback_event_type == EventType.DELETED,
     )
     # ensure ai proxy config
     await ensure_route_ai_proxy_config(
@@ -790,6 +832,25 @@ async def sync_gateway(
     )
 
 
+def sync_model_ingress(**kwargs):
+    """
+    Sync the model ingress, taking the arguments of ensure_model_ingress.
+    """
+    deleted = kwargs["event_type"] == EventType.DELETED
+    desired = {
+        **kwargs,
+        "event_type": deleted,
+        "destinations": [] if deleted else kwargs["destinations"],
+        "networking_api": None,
+    }
+    gateway_sync.sync(
+        key=("Ingress", kwargs["namespace"], kwargs["ingress_name"]),
+        desired=desired,
+        apply=partial(mcp_handler.ensure_model_ingress, **kwargs),
+        deleted=deleted,
+    )
+
+
 def flatten_destinations(
     weight_to_count: List[Tuple[int, int, mcp_handler.DestinationTupleList]],
     max_weight: Optional[int] = 0,
@@ -926,15 +987,14 @@ class WorkerController:
         Start the controller.
         """
 
-        async for event in Worker.subscribe(source="worker_controller"):
-            if event.type == EventType.HEARTBEAT:
-                continue
-            try:
-                await self._reconcile(event)
-                await self._provisioning._reconcile(event)
-                await self._notify_parents(event)
-            except Exception as e:
-                logger.error(f"Failed to reconcile worker: {e}")
+        await WorkQueue("worker", self._handle).run(
+            Worker.subscribe(source="worker_controller")
+        )
+
+    async def _handle(self, event: Event):
+        await self._reconcile(event)
+        await self._provisioning._reconcile(event)
+        await self._notify_parents(event)
 
     async def _reconcile(self, event: Event):
         """
@@ -1353,14 +1413,16 @@ class ModelFileController:
         Start the controller.
         """
 
-        async for event in ModelFile.subscribe(source="model_file_controller"):
-            if event.type == EventType.CREATED or event.type == EventType.UPDATED:
-                await self._reconcile(event)
+        await WorkQueue("model_file", self._reconcile).run(
+            ModelFile.subscribe(source="model_file_controller")
+        )
 
     async def _reconcile(self, event: Event):
         """
         Reconcile the model file.
         """
+        if event.type != EventType.CREATED and event.type != EventType.UPDATED:
+            return
 
         file: ModelFile = event.data
         try:
@@ -1656,13 +1718,9 @@ class WorkerPoolController:
     """Worker pool controller creates new workers based on the worker pool configuration."""
 
     async def start(self):
-        async for event in WorkerPool.subscribe(source="worker_pool_controller"):
-            if event.type == EventType.HEARTBEAT:
-                continue
-            try:
-                await self._reconcile(event)
-            except Exception as e:
-                logger.error(f"Failed to reconcile worker pool: {e}")
+        await WorkQueue("worker_pool", self._reconcile).run(
+            WorkerPool.subscribe(source="worker_pool_controller")
+        )
 
     async def _reconcile(self, event: Event):
         """
@@ -1997,13 +2055,9 @@ class ClusterController:
             base_client = k8s_client.ApiClient(configuration=self._k8s_config)
             self._higress_network_api = NetworkingHigressIoV1Api(base_client)
 
-        async for event in Cluster.subscribe(source="cluster_controller"):
-            if event.type == EventType.HEARTBEAT:
-                continue
-            try:
-                await self._reconcile(event)
-            except Exception as e:
-                logger.error(f"Failed to reconcile cluster: {e}")
+        await WorkQueue("cluster", self._reconcile).run(
+            Cluster.subscribe(source="cluster_controller")
+        )
 
     async def _reconcile(self, event: Event):
         """
@@ -2048,14 +2102,16 @@ class ClusterController:
         mcp_resource_name = mcp_handler.default_mcp_bridge_name
         desired_registries = []
         to_delete_prefix = mcp_handler.cluster_worker_prefix(cluster.id)
+        namespace = self._cfg.gateway_namespace
         try:
-            await mcp_handler.ensure_mcp_bridge(
-                client=self._higress_network_api,
-                namespace=self._cfg.gateway_namespace,
-                mcp_bridge_name=mcp_resource_name,
-                desired_registries=desired_registries,
-                to_delete_prefix=to_delete_prefix,
-            )
+            async with gateway_sync.lock(("McpBridge", namespace, mcp_resource_name)):
+                await mcp_handler.ensure_mcp_bridge(
+                    client=self._higress_network_api,
+                    namespace=namespace,
+                    mcp_bridge_name=mcp_resource_name,
+                    desired_registries=desired_registries,
+                    to_delete_prefix=to_delete_prefix,
+                )
         except Exception as e:
             logger.error(f"Failed to ensure MCPBridge for cluster {cluster.name}: {e}")
             raise
@@ -2143,11 +2199,9 @@ class ModelProviderController:
             self._higress_network_api = NetworkingHigressIoV1Api(base_client)
             self._higress_extension_api = ExtensionsHigressIoV1Api(base_client)
 
-        async for event in ModelProvider.subscribe(source="model_provider_controller"):
-            try:
-                await self._reconcile(event)
-            except Exception as e:
-                logger.exception(f"Failed to reconcile model provider: {e}")
+        await WorkQueue("model_provider", self._reconcile).run(
+            ModelProvider.subscribe(source="model_provider_controller")
+        )
 
     async def _ensure_provider_registry(
         self,
@@ -2172,16 +2226,20 @@ class ModelProviderController:
         )
         desired_proxies = [] if proxy_to_remove else [provider_proxy]
 
+        namespace = self._config.gateway_namespace
+        mcp_bridge_name = mcp_handler.default_mcp_bridge_name
         try:
-            await mcp_handler.ensure_mcp_bridge(
-                client=self._higress_network_api,
-                namespace=self._config.gateway_namespace,
-                mcp_bridge_name=mcp_handler.default_mcp_bridge_name,
-                desired_registries=desired_registries,
-                desired_proxies=desired_proxies,
-                to_delete_prefix=to_delete_prefix,
-                to_delete_proxies_prefix=to_delete_proxy_prefix,
-            )
+            # Shared with the model controller, which syncs the same object.
+            async with gateway_sync.lock(("McpBridge", namespace, mcp_bridge_name)):
+                await mcp_handler.ensure_mcp_bridge(
+                    client=self._higress_network_api,
+                    namespace=namespace,
+                    mcp_bridge_name=mcp_bridge_name,
+                    desired_registries=desired_registries,
+                    desired_proxies=desired_proxies,
+                    to_delete_prefix=to_delete_prefix,
+                    to_delete_proxies_prefix=to_delete_proxy_prefix,
+                )
         except Exception as e:
             logger.error(
                 f"Failed to ensure MCPRegistry for model provider {model_provider.name}: {e}"
@@ -2189,8 +2247,16 @@ class ModelProviderController:
             raise
 
     async def _ensure_provider_ai_proxy_config(self):
+        namespace = self._config.gateway_namespace
+        name = mcp_handler.gpustack_ai_proxy_name
         try:
-            async with async_session() as session:
+            # Shared with the model route controller, which syncs the same
+            # object. Providers are listed under the lock, so that an older
+            # list is never written after a newer one.
+            async with (
+                gateway_sync.lock(("WasmPlugin", namespace, name)),
+                async_session() as session,
+            ):
                 providers = await ModelProvider.all_by_field(
                     session,
                     "deleted_at",
@@ -2201,8 +2267,8 @@ class ModelProviderController:
                 )
                 await mcp_handler.ensure_wasm_plugin(
                     api=self._higress_extension_api,
-                    name=mcp_handler.gpustack_ai_proxy_name,
-                    namespace=self._config.gateway_namespace,
+                    name=name,
+                    namespace=namespace,
                     spec_diff=partial(
                         mcp_handler.ai_proxy_diff_spec,
                         expected_providers=provider_config_list,
@@ -2296,13 +2362,9 @@ class ModelRouteTargetController:
         self._config = config
 
     async def start(self):
-        async for event in ModelRouteTarget.subscribe(
-            source="model_route_target_controller"
-        ):
-            try:
-                await self._reconcile(event)
-            except Exception as e:
-                logger.exception(f"Failed to reconcile model route target: {e}")
+        await WorkQueue("model_route_target", self._reconcile).run(
+            ModelRouteTarget.subscribe(source="model_route_target_controller")
+        )
 
     async def _notify_parents(
         self, session: AsyncSession, target: ModelRouteTarget, event: Event
@@ -2427,11 +2489,9 @@ class ModelRouteController:
             self._higress_extension_api = ExtensionsHigressIoV1Api(base_client)
             self._networking_istio_api = NetworkingIstioIoV1Alpha3Api(base_client)
 
-        async for event in ModelRoute.subscribe(source="model_route_controller"):
-            try:
-                await self._reconcile(event)
-            except Exception as e:
-                logger.exception(f"Failed to reconcile model route: {e}")
+        await WorkQueue("model_route", self._reconcile).run(
+            ModelRoute.subscribe(source="model_route_controller")
+        )
 
     async def _sync_targets(self, session: AsyncSession, event: Event) -> bool:
         if event.type == EventType.DELETED:
@@ -3,6 +3,7 @@ import logging
 import threading
 import time
 import re
+from typing import Tuple
 from urllib.parse import urlparse, parse_qs, urlunparse
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -67,24 +68,33 @@ async def init_db(db_url: str):
     await create_db_and_tables(db.engine)
 
 
+def parse_postgres_url(db_url: str) -> Tuple[str, dict]:
+    """
+    Rewrite a postgresql:// URL for asyncpg.
+
+    Returns the asyncpg URL and the connect args carrying its parameters.
+    """
+    connect_args = {}
+    db_url = re.sub(r'^postgresql://', 'postgresql+asyncpg://', db_url)
+    parsed = urlparse(db_url)
+    # rewrite the parameters to use asyncpg with custom database schema
+    query_params = parse_qs(parsed.query)
+    qoptions = query_params.pop('options', None)
+    schema_name = None
+    if qoptions is not None and len(qoptions) > 0:
+        option = qoptions[0]
+        if option.startswith('-csearch_path='):
+            schema_name = option[len('-csearch_path=') :]
+    if schema_name:
+        connect_args['server_settings'] = {'search_path': schema_name}
+    new_parsed = parsed._replace(query={})
+    return urlunparse(new_parsed), connect_args
+
+
 async def init_db_engine(db_url: str):
     connect_args = {}
     if db_url.startswith("postgresql://"):
-        db_url = re.sub(r'^postgresql://', 'postgresql+asyncpg://', db_url)
-        parsed = urlparse(db_url)
-        # rewrite the parameters to use asyncpg with custom database schema
-        query_params = parse_qs(parsed.query)
-        qoptions = query_params.pop('options', None)
-        schema_name = None
-        if qoptions is not None and len(qoptions) > 0:
-            option = qoptions[0]
-            if option.startswith('-csearch_path='):
-                schema_name = option[len('-csearch_path=') :]
-        if schema_name:
-            connect_args['server_settings'] = {'search_path': schema_name}
-        new_parsed = parsed._replace(query={})
-        db_url = urlunparse(new_parsed)
-
+        db_url, connect_args = parse_postgres_url(db_url)
     elif db_url.startswith("mysql://"):
         db_url = re.sub(r'^mysql://', 'mysql+asyncmy://', db_url)
     else:
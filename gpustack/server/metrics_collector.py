@@ -1,16 +1,16 @@
 import logging
 import asyncio
 import copy
+import re
 from datetime import date
 from aiohttp import ClientSession as aiohttp_client, ClientTimeout
 from gpustack.config.config import Config
 from gpustack.schemas.config import GatewayModeEnum
-from typing import Optional, Dict, List, Set
+from typing import Optional, Dict, List, Set, Union
 from dataclasses import dataclass
-from prometheus_client.parser import text_string_to_metric_families
 from prometheus_client.samples import Sample
 from gpustack.server.db import async_session
-from sqlmodel.ext.asyncio.session import AsyncSession
+from gpustack.server.usage_buffer import record_usage
 from gpustack.schemas.model_usage import ModelUsage
 from gpustack.schemas.models import Model
 from gpustack.schemas.users import User
@@ -20,10 +20,12 @@ from gpustack import envs
 
 
 gateway_metrics_port = 15020
+metrics_chunk_size = 64 * 1024
 
 logger = logging.getLogger(__name__)
 
 common_prefix = "route_upstream_model_consumer_metric_"
+_common_prefix_bytes = common_prefix.encode()
 count_sample_suffix = "_total"
 
 metrics_names = {
@@ -55,40 +57,110 @@ class ModelUsageMetrics:
 # route_upstream_model_consumer_metric_total_token{ai_route="ai-route-model-1",ai_cluster="outbound|80||model-1-1.static",ai_model="qwen3-0.6b",ai_consumer="d720eeb5b57fbe94.gpustack-2"} 1911
 
 
-def parse_token_metrics(metrics_text) -> Dict[str, ModelUsageMetrics]:
-    metrics_by_model_user_access_key: Dict[str, ModelUsageMetrics] = {}
-    for family in text_string_to_metric_families(metrics_text):
-        if family.name not in metrics_names:
-            continue
-        for sample in family.samples:
-            metrics = parse_sample_label_to_usage(sample)
-            if metrics is None:
-                continue
-            key = ".".join(
-                [
-                    str(part or "")
-                    for part in [
-                        metrics.model_id,
-                        metrics.provider_id,
-                        metrics.model,
-                        metrics.user_id,
-                        metrics.access_key,
-                    ]
-                ]
+# Sample line of the text exposition format: name, optional labels, value.
+_sample_line_pattern = re.compile(
+    r'([a-zA-Z_:][a-zA-Z0-9_:]*)\s*(?:\{((?:[^"}]|"(?:[^"\\]|\\.)*")*)\})?\s+(\S+)'
+)
+_label_pattern = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"')
+_label_escape_pattern = re.compile(r"\\(.)")
+_label_escapes = {"n": "\n"}
+
+
+class TokenMetricsParser:
+    """
+    Parse gateway token metrics incrementally from chunks of the text
+    exposition format.
+
+    Only lines starting with the common prefix are decoded, and labels are
+    parsed for those samples only, so the cost scales with the relevant
+    samples rather than the whole text. At most one partial line is kept
+    between chunks.
+    """
+
+    def __init__(self):
+        self._pending = b""
+        self._metrics: Dict[str, ModelUsageMetrics] = {}
+
+    def feed(self, chunk: bytes):
+        lines = chunk.split(b"\n")
+        lines[0] = self._pending + lines[0]
+        self._pending = lines.pop()
+        for line in lines:
+            if line.startswith(_common_prefix_bytes):
+                self._parse_line(line)
+
+    def close(self) -> Dict[str, ModelUsageMetrics]:
+        if self._pending.startswith(_common_prefix_bytes):
+            self._parse_line(self._pending)
+        self._pending = b""
+        return self._metrics
+
+    def _parse_line(self, line: bytes):
+        match = _sample_line_pattern.match(line.decode("utf-8", errors="replace"))
+        if match is None:
+            logger.debug(f"Unexpected metrics line: {line!r}, skipping.")
+            return
+
+        name, labels_text, value = match.groups()
+        if metrics_names.get(name.removesuffix(count_sample_suffix)) is None:
+            return
+
+        try:
+            value = float(value)
+        except ValueError:
+            logger.debug(f"Invalid value in metrics line: {line!r}, skipping.")
+            return
+        labels = {
+            label: (
+                _label_escape_pattern.sub(_unescape_label_value, label_value)
+                if "\\" in label_value
+                else label_value
             )
-            existing_metrics = metrics_by_model_user_access_key.get(key, None)
-            if existing_metrics is None:
-                metrics_by_model_user_access_key[key] = metrics
-            else:
-                if metrics.input_token:
-                    existing_metrics.input_token = metrics.input_token
-                if metrics.output_token:
-                    existing_metrics.output_token = metrics.output_token
-                if metrics.total_token:
-                    existing_metrics.total_token = metrics.total_token
-                if metrics.request_count:
-                    existing_metrics.request_count = metrics.request_count
-    return metrics_by_model_user_access_key
+            for label, label_value in _label_pattern.findall(labels_text or "")
+        }
+        metrics = parse_sample_label_to_usage(Sample(name, labels, value))
+        if metrics is not None:
+            self._add(metrics)
+
+    def _add(self, metrics: ModelUsageMetrics):
+        key = ".".join(
+            [
+                str(part or "")
+                for part in [
+                    metrics.model_id,
+                    metrics.provider_id,
+                    metrics.model,
+                    metrics.user_id,
+                    metrics.access_key,
+                ]
+            ]
+        )
+        existing_metrics = self._metrics.get(key, None)
+        if existing_metrics is None:
+            self._metrics[key] = metrics
+        else:
+            if metrics.input_token:
+                existing_metrics.input_token = metrics.input_token
+            if metrics.output_token:
+                existing_metrics.output_token = metrics.output_token
+            if metrics.total_token:
+                existing_metrics.total_token = metrics.total_token
+            if metrics.request_count:
+                existing_metrics.request_count = metrics.request_count
+
+
+def _unescape_label_value(match: re.Match) -> str:
+    return _label_escapes.get(match.group(1), match.group(1))
+
+
+def parse_token_metrics(
+    metrics_text: Union[str, bytes]
+) -> Dict[str, ModelUsageMetrics]:
+    if isinstance(metrics_text, str):
+        metrics_text = metrics_text.encode("utf-8")
+    parser = TokenMetricsParser()
+    parser.feed(metrics_text)
+    return parser.close()
 
 
 def parse_sample_label_to_usage(sample: Sample) -> Optional[ModelUsageMetrics]:
@@ -150,29 +222,6 @@ def parse_sample_label_to_usage(sample: Sample) -> Optional[ModelUsageMetrics]:
     return rtn
 
 
-async def create_or_update_model_usage(
-    session: AsyncSession, metric: ModelUsage, auto_commit: bool = True
-):
-    current_usage = await ModelUsage.one_by_fields(
-        session=session,
-        fields={
-            "model_id": metric.model_id,
-            "user_id": metric.user_id,
-            "provider_id": metric.provider_id,
-            "model_name": metric.model_name,
-            "access_key": metric.access_key,
-            "date": metric.date,
-        },
-    )
-    if current_usage is None:
-        await metric.save(session=session, auto_commit=auto_commit)
-    else:
-        current_usage.prompt_token_count += metric.prompt_token_count
-        current_usage.completion_token_count += metric.completion_token_count
-        current_usage.request_count += metric.request_count
-        await current_usage.save(session=session, auto_commit=auto_commit)
-
-
 class GatewayMetricsCollector:
     _interval: int
     _config: Config
@@ -334,26 +383,26 @@ class GatewayMetricsCollector:
                         completion_token_count=metric.output_token,
                         request_count=metric.request_count,
                     )
-                    await create_or_update_model_usage(
-                        session, model_usage, auto_commit=False
-                    )
-                await session.commit()
+                    record_usage(model_usage)
             except Exception as e:
                 logger.exception(f"Error storing gateway metrics: {e}")
-                await session.rollback()
 
     async def start(self):
         if self._disabled_collection:
             return
 
         @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
-        async def retry_connect() -> str:
+        async def retry_connect() -> Dict[str, ModelUsageMetrics]:
             async with self._client.get(self.gateway_metrics_url) as resp:
                 if resp.status != 200:
                     raise ConnectionError(
                         f"Failed to connect to gateway metrics endpoint, status: {resp.status}"
                     )
-                return await resp.text()
+                # Parse while reading, the text can be tens of MB.
+                parser = TokenMetricsParser()
+                async for chunk in resp.content.iter_chunked(metrics_chunk_size):
+                    parser.feed(chunk)
+                return parser.close()
 
         while True:
             try:
@@ -361,8 +410,7 @@ class GatewayMetricsCollector:
                     "Collecting gateway metrics from %s",
                     self.gateway_metrics_url,
                 )
-                text = await retry_connect()
-                metrics = parse_token_metrics(text)
+                metrics = await retry_connect()
                 delta_metrics = self._metrics_delta(metrics)
                 for m in delta_metrics:
                     logger.debug("Delta metric: %s", m)
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from gpustack.schemas.model_routes import ModelRouteTarget, TargetStateEnum
+from gpustack.schemas.models import Model, ModelInstance, ModelInstanceStateEnum
+from gpustack.schemas.workers import Worker
+from gpustack.server.bus import Event, EventType
+from gpustack.utils.name import metric_name
+
+logger = logging.getLogger(__name__)
+
+routing_table_lookups = Counter(
+    metric_name("routing_table_lookups"),
+    "Lookups served by the in-memory routing table",
+    labelnames=["result"],
+)
+routing_table_last_event_timestamp = Gauge(
+    metric_name("routing_table_last_event_timestamp_seconds"),
+    "Unix timestamp of the last event applied to the routing table",
+    labelnames=["topic"],
+)
+
+
+class RoutingTable:
+    """
+    In-memory routing table for the OpenAI proxy path.
+
+    It maps route names to models with running instances and keeps the
+    workers serving them, so that picking an upstream does not need a
+    database round trip. The table is kept current by ModelRouteTarget,
+    Model, ModelInstance and Worker events from the event bus. Lookups
+    that cannot be answered from memory return None, and callers fall
+    back to the database.
+    """
+
+    def __init__(self):
+        self._targets: Dict[int, ModelRouteTarget] = {}
+        self._route_model_ids: Dict[str, Set[int]] = {}
+        self._models: Dict[int, Model] = {}
+        self._running_instances: Dict[int, Dict[int, ModelInstance]] = {}
+        self._instance_model_ids: Dict[int, int] = {}
+        self._instance_lists: Dict[int, List[ModelInstance]] = {}
+        self._workers: Dict[int, Worker] = {}
+        self._last_event_at: Dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    async def start(self):
+        await asyncio.gather(
+            self._watch(ModelRouteTarget, self._apply_target_event),
+            self._watch(Model, self._apply_model_event),
+            self._watch(ModelInstance, self._apply_instance_event),
+            self._watch(Worker, self._apply_worker_event),
+        )
+
+    async def _watch(self, cls, apply):
+        topic = cls.__name__.lower()
+        while True:
+            try:
+                async for event in cls.subscribe(source="routing_table"):
+                    if event.type == EventType.HEARTBEAT:
+                        continue
+                    apply(event)
+                    self._touch(topic)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Routing table failed to watch {topic}: {e}")
+                await asyncio.sleep(1)
+
+    def _touch(self, topic: str):
+        now = time.time()
+        self._last_event_at[topic] = now
+        routing_table_last_event_timestamp.labels(topic=topic).set(now)
+
+    def _apply_target_event(self, event: Event):
+        target: ModelRouteTarget = event.data
+        if target is None or target.id is None:
+            return
+
+        previous = self._targets.pop(target.id, None)
+        if previous is not None and previous.model_id is not None:
+            model_ids = self._route_model_ids.get(previous.route_name)
+            if model_ids is not None:
+                model_ids.discard(previous.model_id)
+                if not model_ids:
+                    del self._route_model_ids[previous.route_name]
+
+        if (
+            event.type == EventType.DELETED
+            or target.deleted_at is not None
+            or target.state != TargetStateEnum.ACTIVE
+            or target.model_id is None
+        ):
+            return
+
+        self._targets[target.id] = target
+        self._route_model_ids.setdefault(target.route_name, set()).add(target.model_id)
+
+    def _apply_model_event(self, event: Event):
+        model: Model = event.data
+        if model is None or model.id is None:
+            return
+
+        if event.type == EventType.DELETED or model.deleted_at is not None:
+            self._models.pop(model.id, None)
+            return
+
+        self._models[model.id] = model
+
+    def _apply_instance_event(self, event: Event):
+        instance: ModelInstance = event.data
+        if instance is None or instance.id is None:
+            return
+
+        previous_model_id = self._instance_model_ids.pop(instance.id, None)
+        if previous_model_id is not None:
+            instances = self._running_instances.get(previous_model_id, {})
+            instances.pop(instance.id, None)
+            self._instance_lists.pop(previous_model_id, None)
+            if not instances:
+                self._running_instances.pop(previous_model_id, None)
+
+        if (
+            event.type == EventType.DELETED
+            or instance.deleted_at is not None
+            or instance.state != ModelInstanceStateEnum.RUNNING
+        ):
+            return
+
+        self._running_instances.setdefault(instance.model_id, {})[
+            instance.id
+        ] = instance
+        self._instance_model_ids[instance.id] = instance.model_id
+        self._instance_lists.pop(instance.model_id, None)
+
+    def _apply_worker_event(self, event: Event):
+        worker: Worker = event.data
+        if worker is None or worker.id is None:
+            return
+
+        if event.type == EventType.DELETED or worker.deleted_at is not None:
+            self._workers.pop(worker.id, None)
+            return
+
+        self._workers[worker.id] = worker
+
+    def get_running_instances(self, model_id: int) -> List[ModelInstance]:
+        """
+        Return running instances of the model. The returned list is reused
+        until the instance set changes, so it can be handed to load
+        balancing strategies that key on list identity or equality.
+        """
+        instances = self._instance_lists.get(model_id)
+        if instances is None:
+            instances = sorted(
+                self._running_instances.get(model_id, {}).values(),
+                key=lambda i: i.id,
+            )
+            self._instance_lists[model_id] = instances
+        return instances
+
+    def get_worker(self, worker_id: int) -> Optional[Worker]:
+        return self._workers.get(worker_id)
+
+    def lookup(self, route_name: str) -> Optional[Tuple[Model, List[ModelInstance]]]:
+        """
+        Pick a model of the route that has running instances.
+
+        Returns None on a miss, which means the caller should consult the
+        database.
+        """
+        candidates = []
+        for model_id in self._route_model_ids.get(route_name, ()):
+            model = self._models.get(model_id)
+            if model is None:
+                continue
+            instances = self.get_running_instances(model_id)
+            if instances:
+                candidates.append((model, instances))
+
+        if not candidates:
+            self._record("miss")
+            return None
+
+        return random.choice(candidates)
+
+    def resolve_worker(self, instance: ModelInstance) -> Optional[Worker]:
+        """
+        Return the worker serving the instance. A missing worker means the
+        table lags behind the instance events and is counted as stale.
+        """
+        worker = self._workers.get(instance.worker_id)
+        if worker is None:
+            self._record("stale")
+            return None
+
+        self._record("hit")
+        return worker
+
+    def _record(self, result: str):
+        if result == "hit":
+            self.hits += 1
+        elif result == "miss":
+            self.misses += 1
+        else:
+            self.stale += 1
+        routing_table_lookups.labels(result=result).inc()
+
+    def staleness(self) -> Dict[str, float]:
+        """Return seconds since the last applied event per topic."""
+        now = time.time()
+        return {topic: now - ts for topic, ts in self._last_event_at.items()}
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "routes": len(self._route_model_ids),
+            "workers": len(self._workers),
+            "staleness_seconds": self.staleness(),
+        }
+
+
+routing_table = RoutingTable()
@@ -51,7 +51,10 @@ from gpustack.server.init_db import init_db, get_query_count
 from gpustack.scheduler.scheduler import Scheduler
 from gpustack.server.system_load import SystemLoadCollector
 from gpustack.server.update_check import UpdateChecker
-from gpustack.server.usage_buffer import flush_usage_to_db
+from gpustack.server.routing_table import routing_table
+from gpustack.server.bus import event_bus, set_event_bus_backend
+from gpustack.server.bus_backends import create_event_bus_backend
+from gpustack.server.usage_buffer import flush_usage_to_db, init_usage_wal
 from gpustack.server.worker_status_buffer import flush_worker_status_to_db
 from gpustack.server.worker_instance_cleaner import WorkerInstanceCleaner
 from gpustack.server.worker_syncer import WorkerSyncer
@@ -105,6 +108,7 @@ class Server:
 
         self._run_migrations()
         await self._prepare_data()
+        self._start_event_bus_backend()
 
         init_model_catalog(self._config.model_catalog_file)
         # it's safe to determine server_role after migration
@@ -116,6 +120,7 @@ class Server:
         self._start_controllers()
         self._start_system_load_collector()
         self._start_worker_syncer()
+        self._start_routing_table()
         self._start_update_checker()
         self._start_model_usage_flusher()
         self._start_worker_status_flusher()
@@ -268,7 +273,20 @@ class Server:
 
         logger.debug("Worker syncer started.")
 
+    def _start_event_bus_backend(self):
+        backend = create_event_bus_backend(event_bus, self._config.get_database_url())
+        set_event_bus_backend(backend)
+        self._create_async_task(backend.start())
+
+        logger.debug("Event bus backend started.")
+
+    def _start_routing_table(self):
+        self._create_async_task(routing_table.start())
+
+        logger.debug("Routing table started.")
+
     def _start_model_usage_flusher(self):
+        init_usage_wal(os.path.join(self._config.data_dir, "usage_wal"))
         self._create_async_task(flush_usage_to_db())
 
         logger.debug("Model usage flusher started.")
@@ -1,3 +1,4 @@
+from itertools import product
 from typing import List, Optional, Union, Set, Tuple
 from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -6,7 +7,6 @@ from sqlalchemy.orm import selectinload
 from gpustack.api.exceptions import InternalServerErrorException
 from gpustack.schemas.api_keys import ApiKey
 from gpustack.schemas.model_files import ModelFile
-from gpustack.schemas.model_usage import ModelUsage
 from gpustack.schemas.models import (
     Model,
     ModelInstance,
@@ -22,11 +22,9 @@ from gpustack.schemas.model_routes import (
 from gpustack.schemas.users import User
 from gpustack.schemas.clusters import Cluster
 from gpustack.schemas.workers import Worker
-from gpustack.server.usage_buffer import usage_flush_buffer
+from gpustack.server.bus import Event
 from gpustack.server.cache import (
-    build_cache_key,
     delete_cache_by_key,
-    set_cache_by_key,
     locked_cached,
 )
 
@@ -402,46 +400,6 @@ class ModelInstanceService:
             )
 
 
-class ModelUsageService:
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
-    @locked_cached()
-    async def get_by_fields(self, fields: dict) -> ModelUsage:
-        result = await ModelUsage.one_by_fields(
-            self.session,
-            fields=fields,
-        )
-        if result is None:
-            return None
-        self.session.expunge(result)
-        return result
-
-    async def create(self, model_usage: ModelUsage):
-        return await ModelUsage.create(self.session, model_usage)
-
-    async def update(
-        self,
-        model_usage: ModelUsage,
-        completion_token_count: int,
-        prompt_token_count: int,
-    ):
-        model_usage.completion_token_count += completion_token_count
-        model_usage.prompt_token_count += prompt_token_count
-        model_usage.request_count += 1
-
-        key = build_cache_key(
-            self.get_by_fields,
-            model_usage.user_id,
-            model_usage.model_id,
-            model_usage.operation,
-            model_usage.date,
-        )
-        await set_cache_by_key(key, model_usage)
-        usage_flush_buffer[key] = model_usage
-        return model_usage
-
-
 class ModelFileService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -500,3 +458,52 @@ async def revoke_model_access_cache(
     if extra_user_ids:
         user_ids.update(extra_user_ids)
     await delete_accessible_model_cache(*user_ids)
+
+
+# The cached service lookups of each topic, with the fields of the changed
+# object making up their arguments.
+_SERVICE_CACHES = {
+    "user": [
+        (UserService.get_by_id, "id"),
+        (UserService.get_user_accessible_model_names, "id"),
+        (UserService.get_by_username, "username"),
+    ],
+    "apikey": [(APIKeyService.get_by_access_key, "access_key")],
+    "worker": [
+        (WorkerService.get_by_id, "id"),
+        (WorkerService.get_by_name, "name"),
+        (WorkerService.get_by_cluster_id_name, "cluster_id", "name"),
+    ],
+    "modelroute": [
+        (ModelRouteService.get_by_name, "name"),
+        (ModelRouteService.get_model_auth_info_by_name, "name"),
+        (ModelRouteService.get_model_ids_by_model_route_name, "name"),
+    ],
+    "modelroutetarget": [
+        (ModelRouteService.get_model_ids_by_model_route_name, "route_name"),
+    ],
+    "model": [
+        (ModelService.get_by_id, "id"),
+        (ModelService.get_by_name, "name"),
+    ],
+    "modelinstance": [(ModelInstanceService.get_running_instances, "model_id")],
+}
+
+
+def _field_values(event: Event, field: str) -> Set:
+    """Return the current and, if changed, the previous value of a field."""
+    values = {getattr(event.data, field, None)}
+    if field in event.changed_fields:
+        values.add(event.changed_fields[field][0])
+    values.discard(None)
+    return values
+
+
+async def invalidate_service_caches(topic: str, event: Event):
+    """
+    Clear the service caches affected by a change committed by another
+    server, which only invalidated the caches of its own process.
+    """
+    for func, *fields in _SERVICE_CACHES.get(topic, []):
+        for args in product(*(_field_values(event, field) for field in fields)):
+            await delete_cache_by_key(func, *args)
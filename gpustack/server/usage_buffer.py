@@ -1,38 +1,295 @@
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict
+import os
+import time
+from datetime import date
+from typing import Dict, List, Optional, TextIO
 
-from gpustack.schemas.model_usage import ModelUsage
+from prometheus_client import Counter, Histogram
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
+
+from gpustack.schemas.model_usage import ModelUsage, OperationEnum
 from gpustack.server.db import async_session
+from gpustack.utils.name import metric_name
 
 logger = logging.getLogger(__name__)
 
+# Usage deltas accumulated since the last flush, keyed by usage key.
 usage_flush_buffer: Dict[str, ModelUsage] = {}
 
+usage_flush_duration = Histogram(
+    metric_name("model_usage_flush_duration_seconds"),
+    "Time spent flushing buffered model usage to the database",
+)
+usage_flush_rows = Counter(
+    metric_name("model_usage_flush_rows"),
+    "Model usage rows written by the usage flusher",
+)
 
-async def flush_usage_to_db():
+USAGE_COUNTER_COLUMNS = [
+    "prompt_token_count",
+    "completion_token_count",
+    "request_count",
+]
+
+# Bind parameters allowed in one statement, the lowest limit of the supported
+# drivers (asyncpg).
+MAX_BIND_PARAMETERS = 32767
+
+USAGE_WAL_SUFFIX = ".wal"
+
+
+def build_usage_key(usage: ModelUsage) -> str:
     """
-    Flush model usage records to the database periodically.
+    Build the key identifying the usage row a delta is added to.
+
+    Keep in sync with the backfill in the v2.2.0 model usage key migration.
+    """
+    identity = [
+        usage.user_id,
+        usage.model_id,
+        usage.provider_id,
+        usage.model_name,
+        usage.access_key,
+        usage.operation.name if usage.operation is not None else None,
+        str(usage.date),
+    ]
+    return hashlib.sha256(
+        json.dumps(identity, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+class UsageWriteAheadLog:
+    """
+    Append-only journal of the usage deltas held in the buffer.
+
+    Each delta is appended to the active segment file as a JSON line before
+    it is acknowledged. A flush rotates the active segment, and segments are
+    removed once the deltas they hold are committed to the database. Segments
+    left behind by a crash are replayed on startup.
     """
-    while True:
-        await asyncio.sleep(5)
 
-        if not usage_flush_buffer:
-            continue
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._file: Optional[TextIO] = None
+        self._path: Optional[str] = None
+        os.makedirs(directory, exist_ok=True)
 
-        local_buffer = dict(usage_flush_buffer)
-        usage_flush_buffer.clear()
+    def segments(self) -> List[str]:
+        return sorted(
+            os.path.join(self._directory, name)
+            for name in os.listdir(self._directory)
+            if name.endswith(USAGE_WAL_SUFFIX)
+        )
 
+    def replay(self, path: str) -> List[ModelUsage]:
+        usages = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    usages.append(self._decode(line))
+                except Exception as e:
+                    # A crash may leave the last line partially written.
+                    logger.warning(f"Skipped malformed usage record in {path}: {e}")
+        return usages
+
+    def append(self, usage: ModelUsage):
+        if self._file is None:
+            self._path = os.path.join(
+                self._directory, f"usage-{time.time_ns()}{USAGE_WAL_SUFFIX}"
+            )
+            self._file = open(self._path, "a", encoding="utf-8")
+        self._file.write(self._encode(usage))
+        self._file.flush()
+
+    def rotate(self) -> Optional[str]:
+        """Close the active segment and return its path, if any."""
+        if self._file is None:
+            return None
+        self._file.close()
+        path = self._path
+        self._file, self._path = None, None
+        return path
+
+    @staticmethod
+    def remove(paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _encode(usage: ModelUsage) -> str:
+        record = {
+            "user_id": usage.user_id,
+            "model_id": usage.model_id,
+            "provider_id": usage.provider_id,
+            "model_name": usage.model_name,
+            "access_key": usage.access_key,
+            "operation": usage.operation.value if usage.operation else None,
+            "date": str(usage.date),
+        }
+        for column in USAGE_COUNTER_COLUMNS:
+            record[column] = getattr(usage, column)
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    @staticmethod
+    def _decode(line: str) -> ModelUsage:
+        record = json.loads(line)
+        record["date"] = date.fromisoformat(record["date"])
+        if record["operation"] is not None:
+            record["operation"] = OperationEnum(record["operation"])
+        return ModelUsage(**record)
+
+
+_usage_wal: Optional[UsageWriteAheadLog] = None
+# Segments holding deltas that are buffered but not yet committed.
+_pending_segments: List[str] = []
+
+
+def _accumulate(usage: ModelUsage) -> ModelUsage:
+    key = build_usage_key(usage)
+    buffered = usage_flush_buffer.get(key)
+    if buffered is None:
+        buffered = ModelUsage(
+            **usage.model_dump(exclude={"id", "usage_key", *USAGE_COUNTER_COLUMNS}),
+            **{column: 0 for column in USAGE_COUNTER_COLUMNS},
+        )
+        buffered.usage_key = key
+        usage_flush_buffer[key] = buffered
+
+    for column in USAGE_COUNTER_COLUMNS:
+        setattr(buffered, column, getattr(buffered, column) + getattr(usage, column))
+    return buffered
+
+
+def record_usage(usage: ModelUsage):
+    """
+    Add a usage delta to the buffer. The counters of the given usage are
+    added to the stored row on the next flush.
+    """
+    _accumulate(usage)
+    if _usage_wal is not None:
         try:
-            async with async_session() as session:
-                for key, usage in local_buffer.items():
-                    to_update = await ModelUsage.one_by_id(session, usage.id)
-                    to_update.prompt_token_count = usage.prompt_token_count
-                    to_update.completion_token_count = usage.completion_token_count
-                    to_update.request_count = usage.request_count
-                    session.add(to_update)
-
-                await session.commit()
-                logger.debug(f"Flushed {len(local_buffer)} usage records to DB")
+            _usage_wal.append(usage)
         except Exception as e:
-            logger.error(f"Error flushing usage to DB: {e}")
+            logger.error(f"Error writing usage to the write-ahead log: {e}")
+
+
+def init_usage_wal(directory: str):
+    """
+    Persist buffered usage deltas under the given directory, and load the
+    deltas left by a previous run that were not flushed.
+    """
+    global _usage_wal
+
+    _usage_wal = UsageWriteAheadLog(directory)
+    for path in _usage_wal.segments():
+        usages = _usage_wal.replay(path)
+        for usage in usages:
+            _accumulate(usage)
+        _pending_segments.append(path)
+        logger.info(f"Replayed {len(usages)} usage records from {path}")
+
+
+def build_usage_upsert(dialect: str, usages: List[ModelUsage]) -> Insert:
+    """
+    Build a single statement that adds all buffered usage deltas,
+    inserting missing rows and incrementing the counters of existing ones.
+    """
+    table = ModelUsage.__table__
+    rows = [
+        {
+            column.name: getattr(usage, column.name)
+            for column in table.columns
+            if column.name != "id"
+        }
+        for usage in usages
+    ]
+
+    if dialect == "mysql":
+        stmt = mysql.insert(table).values(rows)
+        return stmt.on_duplicate_key_update(
+            {
+                column: table.c[column] + stmt.inserted[column]
+                for column in USAGE_COUNTER_COLUMNS
+            }
+        )
+
+    if dialect == "postgresql":
+        stmt = postgresql.insert(table).values(rows)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(table).values(rows)
+    else:
+        raise RuntimeError(f"Unsupported database dialect: {dialect}")
+
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.usage_key],
+        set_={
+            column: table.c[column] + stmt.excluded[column]
+            for column in USAGE_COUNTER_COLUMNS
+        },
+    )
+
+
+def build_usage_upserts(dialect: str, usages: List[ModelUsage]) -> List[Insert]:
+    """
+    Build the upsert statements adding all buffered usage deltas, in batches
+    that stay within the bind parameter limit.
+    """
+    columns = len(ModelUsage.__table__.columns) - 1
+    batch_size = max(MAX_BIND_PARAMETERS // columns, 1)
+    return [
+        build_usage_upsert(dialect, usages[i : i + batch_size])
+        for i in range(0, len(usages), batch_size)
+    ]
+
+
+async def flush_usage_buffer():
+    if not usage_flush_buffer:
+        return
+
+    local_buffer = dict(usage_flush_buffer)
+    usage_flush_buffer.clear()
+
+    segments = list(_pending_segments)
+    _pending_segments.clear()
+    if _usage_wal is not None:
+        segment = _usage_wal.rotate()
+        if segment is not None:
+            segments.append(segment)
+
+    start_time = time.perf_counter()
+    try:
+        async with async_session() as session:
+            for stmt in build_usage_upserts(
+                session.bind.dialect.name, list(local_buffer.values())
+            ):
+                await session.execute(stmt)
+            await session.commit()
+        usage_flush_rows.inc(len(local_buffer))
+        logger.debug(f"Flushed {len(local_buffer)} usage records to DB")
+    except Exception as e:
+        logger.error(f"Error flushing usage to DB: {e}")
+        # Keep the deltas and their segments for the next flush.
+        for usage in local_buffer.values():
+            _accumulate(usage)
+        _pending_segments.extend(segments)
+        return
+    finally:
+        usage_flush_duration.observe(time.perf_counter() - start_time)
+
+    UsageWriteAheadLog.remove(segments)
+
+
+async def flush_usage_to_db():
+    """
+    Flush model usage records to the database periodically.
+    """
+    while True:
+        await asyncio.sleep(5)
+        await flush_usage_buffer()
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    Set,
+)
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from gpustack import envs
+from gpustack.server.bus import Event, EventType, _merge_events, _object_key
+from gpustack.utils.name import metric_name
+
+logger = logging.getLogger(__name__)
+
+controller_work_queue_depth = Gauge(
+    metric_name("controller_work_queue_depth"),
+    "Number of events waiting to be reconciled by a controller",
+    ["controller"],
+)
+controller_reconcile_duration = Histogram(
+    metric_name("controller_reconcile_duration_seconds"),
+    "Time spent reconciling an event by a controller",
+    ["controller"],
+)
+controller_reconcile_errors = Counter(
+    metric_name("controller_reconcile_errors"),
+    "Failed reconciles of a controller, by whether they are retried",
+    ["controller", "result"],
+)
+
+
+class WorkQueue:
+    """
+    A keyed work queue reconciling the events of a controller.
+
+    Events of the same key are reconciled one at a time and in order, events
+    of different keys concurrently up to the concurrency limit. The key is
+    the object of the event unless a key function is given, e.g. to
+    serialize the events of the instances of a model.
+
+    Events waiting for the same object are merged into one, so an object
+    updated many times while a slow reconcile runs is reconciled once more.
+    A failed reconcile is retried with exponential backoff up to max retries,
+    holding back the later events of its key meanwhile.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        reconcile: Callable[[Event], Awaitable[None]],
+        key: Optional[Callable[[Event], Any]] = None,
+        concurrency: int = envs.CONTROLLER_CONCURRENCY,
+        max_retries: int = envs.CONTROLLER_MAX_RETRIES,
+        retry_base_delay: float = envs.CONTROLLER_RETRY_BASE_DELAY,
+        retry_max_delay: float = envs.CONTROLLER_RETRY_MAX_DELAY,
+    ):
+        self._name = name
+        self._reconcile = reconcile
+        self._key = key or _object_key
+        self._concurrency = max(concurrency, 1)
+        self._max_retries = max_retries
+        self._retry_base_delay = retry_base_delay
+        self._retry_max_delay = retry_max_delay
+
+        self._pending: Dict[Any, Deque[Event]] = {}
+        self._ready: asyncio.Queue = asyncio.Queue()
+        # Keys being reconciled or waiting to be retried.
+        self._busy: Set[Any] = set()
+        self._retries: Dict[Any, int] = {}
+        self._depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    async def run(self, events: AsyncIterator[Event]):
+        """
+        Reconcile the events until the iterator ends.
+        """
+        workers = [asyncio.create_task(self._work()) for _ in range(self._concurrency)]
+        try:
+            async for event in events:
+                if event.type == EventType.HEARTBEAT:
+                    continue
+                self.add(event)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    def add(self, event: Event):
+        key = self._key(event)
+        if key is None:
+            # Events without a key are never merged.
+            key = object()
+
+        queued = key in self._pending
+        self._push(key, event)
+        if not queued and key not in self._busy:
+            self._ready.put_nowait(key)
+
+    def _push(self, key: Any, event: Event, front: bool = False):
+        """
+        Queue the event of the key, at the front for a retried event, merging
+        it with the adjacent event of the same object.
+        """
+        events = self._pending.setdefault(key, deque())
+        if events:
+            previous, later = (event, events[0]) if front else (events[-1], event)
+            object_key = _object_key(later)
+            if (
+                previous.type != EventType.DELETED
+                and object_key is not None
+                and _object_key(previous) == object_key
+            ):
+                if front:
+                    events.popleft()
+                else:
+                    events.pop()
+                self._set_depth(self._depth - 1)
+                event = _merge_events(previous, later)
+
+        if event is None:
+            # Created and deleted before being reconciled.
+            if not events:
+                del self._pending[key]
+            return
+
+        if front:
+            events.appendleft(event)
+        else:
+            events.append(event)
+        self._set_depth(self._depth + 1)
+
+    def _pop(self, key: Any) -> Optional[Event]:
+        events = self._pending.get(key)
+        if not events:
+            self._pending.pop(key, None)
+            return None
+
+        event = events.popleft()
+        if not events:
+            del self._pending[key]
+        self._set_depth(self._depth - 1)
+        return event
+
+    def _set_depth(self, depth: int):
+        self._depth = depth
+        controller_work_queue_depth.labels(self._name).set(depth)
+
+    def _release(self, key: Any):
+        self._busy.discard(key)
+        if key in self._pending:
+            self._ready.put_nowait(key)
+
+    def _retry(self, key: Any, event: Event):
+        self._push(key, event, front=True)
+        self._release(key)
+
+    async def _work(self):
+        while True:
+            key = await self._ready.get()
+            if key in self._busy:
+                continue
+            event = self._pop(key)
+            if event is None:
+                continue
+
+            self._busy.add(key)
+            delay = None
+            try:
+                delay = await self._process(key, event)
+            finally:
+                if delay is None:
+                    self._release(key)
+                else:
+                    asyncio.get_running_loop().call_later(
+                        delay, self._retry, key, event
+                    )
+
+    async def _process(self, key: Any, event: Event) -> Optional[float]:
+        """
+        Reconcile the event, returning the delay to retry it after if it failed.
+        """
+        start_time = time.perf_counter()
+        try:
+            await self._reconcile(event)
+            self._retries.pop(key, None)
+            return None
+        except Exception as e:
+            retries = self._retries.get(key, 0)
+            if retries >= self._max_retries:
+                self._retries.pop(key, None)
+                controller_reconcile_errors.labels(self._name, "dropped").inc()
+                logger.exception(
+                    f"Failed to reconcile {self._name} {key} after "
+                    f"{retries} retries: {e}"
+                )
+                return None
+
+            self._retries[key] = retries + 1
+            delay = min(self._retry_base_delay * 2**retries, self._retry_max_delay)
+            controller_reconcile_errors.labels(self._name, "retried").inc()
+            logger.warning(
+                f"Failed to reconcile {self._name} {key}, retrying in {delay}s: {e}"
+            )
+            return delay
+        finally:
+            controller_reconcile_duration.labels(self._name).observe(
+                time.perf_counter() - start_time
+            )
@@ -1,7 +1,7 @@
 import asyncio
 import datetime
 import logging
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 
 from sqlalchemy import update
 
@@ -21,6 +21,19 @@ heartbeat_flush_buffer_lock = asyncio.Lock()
 worker_status_flush_buffer: Dict[int, dict] = {}
 worker_status_flush_buffer_lock = asyncio.Lock()
 
+# Last status reported by each worker, which status deltas are merged into:
+# {worker_id: report}
+worker_status_reports: Dict[int, dict] = {}
+# Digest the worker computed for its copy of the last report, which status
+# deltas must be based on: {worker_id: digest}
+worker_status_digests: Dict[int, Optional[str]] = {}
+
+
+def forget_worker_status(worker_id: int):
+    """Drop the last report of the worker, so its next delta is refused."""
+    worker_status_reports.pop(worker_id, None)
+    worker_status_digests.pop(worker_id, None)
+
 
 async def flush_heartbeats():
     """
@@ -81,8 +94,14 @@ async def flush_worker_status():
                 worker.compute_state()
 
             await WorkerService(session).batch_update(workers)
+
+        for worker_id in set(to_update_worker_ids) - {w.id for w in workers}:
+            forget_worker_status(worker_id)
     except Exception as e:
         logger.error(f"Error flushing worker status to DB: {e}")
+        # Make the next reports of these workers write through.
+        for worker_id in to_update_worker_ids:
+            forget_worker_status(worker_id)
 
 
 async def flush_worker_status_to_db():
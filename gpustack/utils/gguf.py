@@ -0,0 +1,273 @@
+import hashlib
+import mmap
+import re
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+# Block size and bytes per block of each GGML tensor type, by type ID.
+GGML_TYPE_SIZES: Dict[int, Tuple[int, int]] = {
+    0: (1, 4),  # F32
+    1: (1, 2),  # F16
+    2: (32, 18),  # Q4_0
+    3: (32, 20),  # Q4_1
+    6: (32, 22),  # Q5_0
+    7: (32, 24),  # Q5_1
+    8: (32, 34),  # Q8_0
+    9: (32, 36),  # Q8_1
+    10: (256, 84),  # Q2_K
+    11: (256, 110),  # Q3_K
+    12: (256, 144),  # Q4_K
+    13: (256, 176),  # Q5_K
+    14: (256, 210),  # Q6_K
+    15: (256, 292),  # Q8_K
+    16: (256, 66),  # IQ2_XXS
+    17: (256, 74),  # IQ2_XS
+    18: (256, 98),  # IQ3_XXS
+    19: (256, 50),  # IQ1_S
+    20: (32, 18),  # IQ4_NL
+    21: (256, 110),  # IQ3_S
+    22: (256, 82),  # IQ2_S
+    23: (256, 136),  # IQ4_XS
+    24: (1, 1),  # I8
+    25: (1, 2),  # I16
+    26: (1, 4),  # I32
+    27: (1, 8),  # I64
+    28: (1, 8),  # F64
+    29: (256, 56),  # IQ1_M
+    30: (1, 2),  # BF16
+    31: (32, 18),  # Q4_0_4_4
+    32: (32, 18),  # Q4_0_4_8
+    33: (32, 18),  # Q4_0_8_8
+    34: (256, 54),  # TQ1_0
+    35: (256, 66),  # TQ2_0
+    36: (32, 18),  # IQ4_NL_4_4
+    37: (32, 18),  # IQ4_NL_4_8
+    38: (32, 18),  # IQ4_NL_8_8
+    39: (32, 17),  # MXFP4
+}
+
+# GGML type IDs by the names used for KV cache types.
+GGML_TYPE_IDS: Dict[str, int] = {
+    "f32": 0,
+    "f16": 1,
+    "q4_0": 2,
+    "q4_1": 3,
+    "q5_0": 6,
+    "q5_1": 7,
+    "q8_0": 8,
+    "iq4_nl": 20,
+    "bf16": 30,
+}
+
+_GGUF_MAGIC = b"GGUF"
+
+# Formats of the fixed size metadata value types, by type ID.
+_VALUE_FORMATS = {
+    0: "B",
+    1: "b",
+    2: "H",
+    3: "h",
+    4: "I",
+    5: "i",
+    6: "f",
+    7: "?",
+    10: "Q",
+    11: "q",
+    12: "d",
+}
+_VALUE_TYPE_STRING = 8
+_VALUE_TYPE_ARRAY = 9
+
+# String arrays longer than this, like tokenizer vocabularies, are skipped.
+_MAX_STRING_ARRAY_LENGTH = 1024
+
+_SPLIT_PATTERN = re.compile(r"^(.*)-(\d{5})-of-(\d{5})\.gguf$")
+
+
+def ggml_row_size(type: int, dims: Tuple[int, ...]) -> int:
+    """Return the size in bytes of a tensor of the type and dimensions."""
+    if type not in GGML_TYPE_SIZES:
+        raise ValueError(f"Unknown GGML type {type}")
+
+    block_size, type_size = GGML_TYPE_SIZES[type]
+    elements = 1
+    for dim in dims:
+        elements *= dim
+    return elements // block_size * type_size
+
+
+class GGUFHeaderTruncated(Exception):
+    """The buffer ends before the GGUF header does."""
+
+
+@dataclass
+class GGUFSkippedArray:
+    """A long string array, like a tokenizer vocabulary, read for its length."""
+
+    length: int
+
+
+@dataclass
+class GGUFTensorInfo:
+    name: str
+    dims: Tuple[int, ...]
+    type: int
+    offset: int
+
+    @property
+    def nbytes(self) -> int:
+        return ggml_row_size(self.type, self.dims)
+
+
+@dataclass
+class GGUFHeader:
+    version: int
+    metadata: Dict[str, Any]
+    tensors: List[GGUFTensorInfo]
+    # Length of the header in bytes, up to the end of the tensor infos.
+    size: int
+    # Digest of the header bytes.
+    digest: str
+
+
+class _HeaderReader:
+    def __init__(self, buf):
+        self._buf = buf
+        self._pos = 0
+        self._order = "<"
+
+    def read_header(self) -> GGUFHeader:
+        if self._read(4) != _GGUF_MAGIC:
+            raise ValueError("Not a GGUF file")
+
+        (version,) = self._unpack("I")
+        if version & 0xFFFF == 0:
+            # Version 3 written big endian.
+            self._order = ">"
+            version = struct.unpack(">I", struct.pack("<I", version))[0]
+        if version not in (1, 2, 3):
+            raise ValueError(f"Unsupported GGUF version {version}")
+
+        count_format = "I" if version == 1 else "Q"
+        tensor_count, kv_count = self._unpack(count_format * 2)
+        self._count_format = count_format
+
+        metadata = {}
+        for _ in range(kv_count):
+            key = self._read_string()
+            (value_type,) = self._unpack("I")
+            metadata[key] = self._read_value(value_type)
+
+        tensors = []
+        for _ in range(tensor_count):
+            name = self._read_string()
+            (n_dims,) = self._unpack("I")
+            dims = self._unpack(count_format * n_dims)
+            type, offset = self._unpack("IQ")
+            tensors.append(GGUFTensorInfo(name, dims, type, offset))
+
+        digest = hashlib.blake2b(self._buf[: self._pos], digest_size=16).hexdigest()
+        return GGUFHeader(version, metadata, tensors, self._pos, digest)
+
+    def _read(self, n: int):
+        end = self._pos + n
+        if end > len(self._buf):
+            raise GGUFHeaderTruncated()
+        data = self._buf[self._pos : end]
+        self._pos = end
+        return data
+
+    def _unpack(self, format: str) -> tuple:
+        format = self._order + format
+        size = struct.calcsize(format)
+        if self._pos + size > len(self._buf):
+            raise GGUFHeaderTruncated()
+        values = struct.unpack_from(format, self._buf, self._pos)
+        self._pos += size
+        return values
+
+    def _read_string(self) -> str:
+        (length,) = self._unpack(self._count_format)
+        return self._read(length).decode("utf-8", errors="replace")
+
+    def _skip_string(self):
+        (length,) = self._unpack(self._count_format)
+        self._read(length)
+
+    def _read_value(self, value_type: int) -> Any:
+        if value_type in _VALUE_FORMATS:
+            return self._unpack(_VALUE_FORMATS[value_type])[0]
+        if value_type == _VALUE_TYPE_STRING:
+            return self._read_string()
+        if value_type != _VALUE_TYPE_ARRAY:
+            raise ValueError(f"Unknown GGUF value type {value_type}")
+
+        item_type, length = self._unpack("I" + self._count_format)
+        if item_type in _VALUE_FORMATS:
+            return list(self._unpack(f"{length}{_VALUE_FORMATS[item_type]}"))
+        if item_type == _VALUE_TYPE_STRING and length > _MAX_STRING_ARRAY_LENGTH:
+            for _ in range(length):
+                self._skip_string()
+            return GGUFSkippedArray(length)
+        return [self._read_value(item_type) for _ in range(length)]
+
+
+def parse_gguf_header(buf) -> GGUFHeader:
+    """
+    Parse the GGUF header at the start of the buffer, which may hold only
+    part of the file. Raise GGUFHeaderTruncated if it ends within the header.
+    """
+    return _HeaderReader(buf).read_header()
+
+
+def read_gguf_header(path: str) -> GGUFHeader:
+    """Read the GGUF header of a local file, paging in only the header."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return parse_gguf_header(buf)
+
+
+def fetch_gguf_header(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 15,
+    initial_size: int = 2 * 1024**2,
+    max_size: int = 256 * 1024**2,
+) -> GGUFHeader:
+    """
+    Fetch the GGUF header of a remote file with range requests, growing the
+    fetched range until it holds the whole header.
+    """
+    size = initial_size
+    with requests.Session() as session:
+        while True:
+            response = session.get(
+                url,
+                headers={**(headers or {}), "Range": f"bytes=0-{size - 1}"},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            try:
+                return parse_gguf_header(response.content)
+            except GGUFHeaderTruncated:
+                if response.status_code != 206 or len(response.content) < size:
+                    raise ValueError(f"Incomplete GGUF file at {url}")
+                if size >= max_size:
+                    raise ValueError(f"GGUF header at {url} exceeds {max_size} bytes")
+                size *= 4
+
+
+def gguf_split_paths(path: str) -> List[str]:
+    """
+    Return the paths of all shards of a split GGUF file given the path of
+    any of them, or just the path if the file is not split.
+    """
+    match = _SPLIT_PATTERN.match(path)
+    if not match:
+        return [path]
+
+    prefix, _, count = match.groups()
+    return [f"{prefix}-{i:05d}-of-{count}.gguf" for i in range(1, int(count) + 1)]
@@ -3,12 +3,14 @@ from functools import partial
 import logging
 import threading
 import time
-from typing import Callable, Optional
+from typing import Any, Callable, Coroutine, Optional, TypeVar
 from gpustack.utils.process import threading_stop_event
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def run_periodically(
     func: Callable[[], None],
@@ -85,3 +87,29 @@ async def run_in_thread(sync_func, timeout: Optional[float] = None, *args, **kwa
         return await task
 
     return await asyncio.wait_for(task, timeout=timeout)
+
+
+class EventLoopThread:
+    """
+    An event loop running in a daemon thread, for sync code to run
+    coroutines on. The loop starts on first use.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run the coroutine on the loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name=self._name, daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
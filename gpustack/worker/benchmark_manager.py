@@ -120,7 +120,8 @@ class BenchmarkManager:
         while True:
             try:
                 await self._clientset.benchmarks.awatch(
-                    callback=self._handle_benchmark_event
+                    callback=self._handle_benchmark_event,
+                    params={"resource_version": 0},
                 )
             except asyncio.CancelledError:
                 break
@@ -0,0 +1,272 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Called with the downloaded and the total size in bytes, including what was
+# downloaded before resuming.
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class _DownloadState:
+    size: int
+    chunk_size: int
+    etag: Optional[str] = None
+    # Bytes written to each chunk.
+    written: List[int] = field(default_factory=list)
+
+
+class ChunkedDownloader:
+    """
+    Download a file over HTTP in byte range chunks fetched concurrently.
+
+    Chunks are written in place into a file preallocated at the final size,
+    and how much of each chunk has been written is saved next to it, so an
+    interrupted download resumes from where each chunk stopped. Files are
+    downloaded in a single stream from servers not supporting ranges.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 64 * 1024**2,
+        max_workers: int = 8,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+        max_retries: int = 3,
+    ):
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._headers = headers or {}
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def download(
+        self,
+        url: str,
+        path: str,
+        incomplete_path: Optional[str] = None,
+        etag: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> str:
+        """
+        Download the URL to the path, resuming a previous download to the
+        incomplete path, if any, with the same etag.
+        """
+        incomplete_path = incomplete_path or f"{path}.incomplete"
+        state_path = f"{incomplete_path}.json"
+        progress_callback = progress_callback or (lambda downloaded, total: None)
+
+        size, accept_ranges, etag = self._probe(url, etag)
+        if size is None or not accept_ranges:
+            logger.debug(f"Ranges are not supported by {url}, downloading in a stream")
+            self._download_stream(url, incomplete_path, size, progress_callback)
+        else:
+            state = self._load_state(state_path, incomplete_path, size, etag)
+            self._download_chunks(
+                url, incomplete_path, state_path, state, progress_callback
+            )
+
+        os.replace(incomplete_path, path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        return path
+
+    def _probe(self, url: str, etag: Optional[str]):
+        response = self._session.get(
+            url,
+            headers={**self._headers, "Range": "bytes=0-0"},
+            timeout=self._timeout,
+            stream=True,
+        )
+        with response:
+            if response.status_code == 416:
+                # Empty files have no range to satisfy.
+                return None, False, etag
+            response.raise_for_status()
+            etag = etag or response.headers.get("ETag")
+            content_range = response.headers.get("Content-Range", "")
+            if response.status_code == 206 and "/" in content_range:
+                total = content_range.rsplit("/", 1)[1]
+                if total.isdigit():
+                    return int(total), True, etag
+
+            content_length = response.headers.get("Content-Length")
+            size = int(content_length) if content_length else None
+            return size, False, etag
+
+    def _load_state(
+        self, state_path: str, incomplete_path: str, size: int, etag: Optional[str]
+    ) -> _DownloadState:
+        try:
+            with open(state_path) as f:
+                state = _DownloadState(**json.load(f))
+            if (
+                state.size == size
+                and state.etag == etag
+                and state.chunk_size == self._chunk_size
+                and os.path.getsize(incomplete_path) == size
+            ):
+                logger.debug(
+                    f"Resuming download to {incomplete_path} from "
+                    f"{sum(state.written)}/{size} bytes"
+                )
+                return state
+        except (OSError, ValueError, TypeError):
+            pass
+
+        chunks = max(1, -(-size // self._chunk_size))
+        state = _DownloadState(
+            size=size, chunk_size=self._chunk_size, etag=etag, written=[0] * chunks
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(incomplete_path)), exist_ok=True)
+        with open(incomplete_path, "wb") as f:
+            f.truncate(size)
+        return state
+
+    def _download_chunks(
+        self,
+        url: str,
+        incomplete_path: str,
+        state_path: str,
+        state: _DownloadState,
+        progress_callback: ProgressCallback,
+    ):
+        lock = threading.Lock()
+        stop = threading.Event()
+        downloaded = sum(state.written)
+        saved_at = time.monotonic()
+        progress_callback(downloaded, state.size)
+
+        def on_written(index: int, n: int):
+            nonlocal downloaded, saved_at
+            with lock:
+                state.written[index] += n
+                downloaded += n
+                progress_callback(downloaded, state.size)
+                if time.monotonic() - saved_at >= 1:
+                    self._save_state(state_path, state)
+                    saved_at = time.monotonic()
+
+        def download_chunk(index: int):
+            try:
+                self._download_chunk(
+                    url, incomplete_path, state, index, stop, on_written
+                )
+            except BaseException:
+                stop.set()
+                raise
+
+        pending = [
+            i
+            for i in range(len(state.written))
+            if state.written[i] < self._chunk_length(state, i)
+        ]
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+                futures = [pool.submit(download_chunk, i) for i in pending]
+            for future in futures:
+                future.result()
+        finally:
+            with lock:
+                self._save_state(state_path, state)
+
+        if downloaded != state.size:
+            raise IOError(
+                f"Downloaded {downloaded} bytes from {url}, expected {state.size}"
+            )
+
+    def _download_chunk(
+        self,
+        url: str,
+        incomplete_path: str,
+        state: _DownloadState,
+        index: int,
+        stop: threading.Event,
+        on_written: Callable[[int, int], None],
+    ):
+        chunk_start = index * state.chunk_size
+        chunk_end = chunk_start + self._chunk_length(state, index)
+        for attempt in range(self._max_retries + 1):
+            start = chunk_start + state.written[index]
+            if start >= chunk_end or stop.is_set():
+                return
+            try:
+                response = self._session.get(
+                    url,
+                    headers={
+                        **self._headers,
+                        "Range": f"bytes={start}-{chunk_end - 1}",
+                    },
+                    timeout=self._timeout,
+                    stream=True,
+                )
+                with response, open(incomplete_path, "r+b") as f:
+                    if response.status_code != 206:
+                        response.raise_for_status()
+                        raise IOError(
+                            f"Expected a partial response from {url}, "
+                            f"got status {response.status_code}"
+                        )
+                    f.seek(start)
+                    for data in response.iter_content(chunk_size=1024**2):
+                        if stop.is_set():
+                            return
+                        data = data[: chunk_end - start]
+                        f.write(data)
+                        start += len(data)
+                        on_written(index, len(data))
+                        if start >= chunk_end:
+                            return
+            except (requests.RequestException, IOError) as e:
+                if attempt == self._max_retries:
+                    raise
+                logger.debug(f"Retrying chunk {index} of {url} from byte {start}: {e}")
+                time.sleep(min(2**attempt, 10))
+
+        raise IOError(f"Incomplete chunk {index} of {url}")
+
+    def _download_stream(
+        self,
+        url: str,
+        incomplete_path: str,
+        size: Optional[int],
+        progress_callback: ProgressCallback,
+    ):
+        downloaded = 0
+        os.makedirs(os.path.dirname(os.path.abspath(incomplete_path)), exist_ok=True)
+        with (
+            self._session.get(
+                url, headers=self._headers, timeout=self._timeout, stream=True
+            ) as response,
+            open(incomplete_path, "wb") as f,
+        ):
+            response.raise_for_status()
+            for data in response.iter_content(chunk_size=1024**2):
+                f.write(data)
+                downloaded += len(data)
+                progress_callback(downloaded, size or downloaded)
+
+    @staticmethod
+    def _chunk_length(state: _DownloadState, index: int) -> int:
+        return min(state.chunk_size, state.size - index * state.chunk_size)
+
+    @staticmethod
+    def _save_state(state_path: str, state: _DownloadState):
+        tmp_path = f"{state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(state), f)
+        os.replace(tmp_path, state_path)
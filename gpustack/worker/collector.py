@@ -168,7 +168,9 @@ class WorkerStatusCollector:
         try:
             # TODO avoid listing model_instances with clientset.
             # The calculation might not be needed here.
-            model_instances = clientset.model_instances.list()
+            model_instances = clientset.model_instances.list(
+                params={"assigned_worker_id": str(worker_id)}
+            )
             for model_instance in model_instances.items:
                 if (
                     model_instance.distributed_servers
@@ -2,15 +2,30 @@ import logging
 import os
 from typing import List, Optional, Union
 from pathlib import Path
+from tqdm import tqdm
 from tqdm.contrib.concurrent import thread_map
 
-from huggingface_hub import HfApi, hf_hub_download, snapshot_download
+from huggingface_hub import (
+    HfApi,
+    get_hf_file_metadata,
+    hf_hub_download,
+    hf_hub_url,
+    snapshot_download,
+)
+from huggingface_hub._local_folder import (
+    get_local_download_paths,
+    read_download_metadata,
+    write_download_metadata,
+)
+from huggingface_hub.file_download import is_xet_available
+from huggingface_hub.utils import build_hf_headers
 from modelscope.hub.api import HubApi
 from modelscope.hub.snapshot_download import (
     snapshot_download as modelscope_snapshot_download,
 )
 from modelscope.hub.utils.utils import model_id_to_group_owner_name
 
+from gpustack import envs
 from gpustack.schemas.models import Model, ModelSource, SourceEnum, get_mmproj_filename
 from gpustack.utils import file
 from gpustack.utils.hub import (
@@ -19,6 +34,7 @@ from gpustack.utils.hub import (
     FileEntry,
 )
 from gpustack.utils.locks import HeartbeatSoftFileLock
+from gpustack.worker.chunked_downloader import ChunkedDownloader
 
 logger = logging.getLogger(__name__)
 
@@ -184,13 +200,21 @@ class HfDownloader:
         downloaded_files = []
 
         def _inner_hf_hub_download(repo_file: str):
-            downloaded_file = hf_hub_download(
+            downloaded_file = cls._chunked_download(
                 repo_id=repo_id,
                 filename=repo_file,
-                token=token,
                 subfolder=subfolder,
+                token=token,
                 local_dir=local_dir,
             )
+            if downloaded_file is None:
+                downloaded_file = hf_hub_download(
+                    repo_id=repo_id,
+                    filename=repo_file,
+                    token=token,
+                    subfolder=subfolder,
+                    local_dir=local_dir,
+                )
             downloaded_files.append(downloaded_file)
 
         thread_map(
@@ -203,6 +227,68 @@ class HfDownloader:
         logger.info(f"Downloaded model {repo_id}/{filename}")
         return sorted(downloaded_files)
 
+    @classmethod
+    def _chunked_download(
+        cls,
+        repo_id: str,
+        filename: str,
+        subfolder: Optional[str],
+        token: Optional[str],
+        local_dir: Optional[Union[str, os.PathLike[str]]],
+    ) -> Optional[str]:
+        """
+        Download a large file in byte range chunks fetched concurrently, into
+        the local dir layout of hf_hub_download. Return None to leave the file
+        to hf_hub_download.
+        """
+        if not envs.DOWNLOAD_CHUNKED_MIN_SIZE or local_dir is None:
+            return None
+
+        url = hf_hub_url(repo_id, filename, subfolder=subfolder)
+        metadata = get_hf_file_metadata(url, token=token)
+        if (
+            metadata.size is None
+            or metadata.size < envs.DOWNLOAD_CHUNKED_MIN_SIZE
+            or (metadata.xet_file_data is not None and is_xet_available())
+        ):
+            return None
+
+        repo_file = f"{subfolder}/{filename}" if subfolder else filename
+        paths = get_local_download_paths(Path(local_dir), repo_file)
+        local_metadata = read_download_metadata(Path(local_dir), repo_file)
+        if local_metadata is not None and local_metadata.etag == metadata.etag:
+            return str(paths.file_path)
+
+        progress_bar = tqdm(
+            desc=filename, total=metadata.size, unit="B", unit_scale=True
+        )
+
+        def update_progress(downloaded: int, total: int):
+            progress_bar.update(downloaded - progress_bar.n)
+
+        try:
+            ChunkedDownloader(
+                chunk_size=envs.DOWNLOAD_CHUNK_SIZE,
+                max_workers=envs.DOWNLOAD_CHUNK_CONCURRENCY,
+                headers=build_hf_headers(token=token),
+            ).download(
+                url,
+                str(paths.file_path),
+                # Not to be mistaken for a sequential download to resume.
+                incomplete_path=str(
+                    paths.incomplete_path(metadata.etag).with_suffix(".chunked")
+                ),
+                etag=metadata.etag,
+                progress_callback=update_progress,
+            )
+        finally:
+            progress_bar.close()
+
+        write_download_metadata(
+            Path(local_dir), repo_file, metadata.commit_hash, metadata.etag
+        )
+        return str(paths.file_path)
+
     def __call__(self):
         return self.download()
 
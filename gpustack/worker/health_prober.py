@@ -0,0 +1,101 @@
+import asyncio
+from dataclasses import dataclass
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+from prometheus_client import Histogram
+
+from gpustack.utils.name import metric_name
+from gpustack.utils.network import use_proxy_env_for_url
+from gpustack.utils.task import EventLoopThread
+from gpustack.worker.exporter import unified_registry
+
+logger = logging.getLogger(__name__)
+
+model_instance_health_check_duration = Histogram(
+    metric_name("model_instance_health_check_duration_seconds"),
+    "Time taken by a model instance health check, including failed ones",
+    ["model_instance_id", "model_instance_name"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    registry=unified_registry,
+)
+
+
+@dataclass
+class HealthCheckTarget:
+    id: int
+    name: str
+    url: str
+
+
+class HealthProber:
+    """
+    Probe the health endpoints of model instances concurrently.
+
+    Probes run on an event loop of their own in a background thread, with
+    keep-alive connections reused between rounds, so a round takes as long
+    as its slowest probe and callers on other threads just wait for it.
+    """
+
+    def __init__(self, timeout: float = 1):
+        self._timeout = timeout
+        self._loop = EventLoopThread("health-prober")
+        self._http_client: Optional[aiohttp.ClientSession] = None
+        self._http_client_no_proxy: Optional[aiohttp.ClientSession] = None
+        # Histogram labels by model instance ID.
+        self._labels: Dict[int, Tuple[str, str]] = {}
+
+    def probe(self, targets: List[HealthCheckTarget]) -> Dict[int, bool]:
+        """Probe the targets, return whether each one is healthy by ID."""
+        if not targets:
+            return {}
+
+        return self._loop.run(self._probe_all(targets))
+
+    def retain(self, ids: Iterable[int]):
+        """Drop the latency series of model instances not in the IDs."""
+        ids = set(ids)
+        for id in list(self._labels):
+            if id not in ids:
+                labels = self._labels.pop(id)
+                try:
+                    model_instance_health_check_duration.remove(*labels)
+                except KeyError:
+                    pass
+
+    async def _probe_all(self, targets: List[HealthCheckTarget]) -> Dict[int, bool]:
+        if self._http_client is None:
+            connector = aiohttp.TCPConnector(limit=0)
+            timeout = aiohttp.ClientTimeout(total=self._timeout)
+            self._http_client = aiohttp.ClientSession(
+                connector=connector, timeout=timeout, trust_env=True
+            )
+            self._http_client_no_proxy = aiohttp.ClientSession(
+                connector=connector, connector_owner=False, timeout=timeout
+            )
+
+        results = await asyncio.gather(*(self._probe(target) for target in targets))
+        return {target.id: result for target, result in zip(targets, results)}
+
+    async def _probe(self, target: HealthCheckTarget) -> bool:
+        http_client = (
+            self._http_client
+            if use_proxy_env_for_url(target.url)
+            else self._http_client_no_proxy
+        )
+        start_time = time.perf_counter()
+        try:
+            async with http_client.get(target.url) as response:
+                await response.read()
+                return response.status == 200
+        except Exception as e:
+            logger.debug(f"Error checking model instance {target.name} health: {e}")
+            return False
+        finally:
+            labels = (str(target.id), target.name)
+            self._labels[target.id] = labels
+            model_instance_health_check_duration.labels(*labels).observe(
+                time.perf_counter() - start_time
+            )
@@ -85,7 +85,7 @@ class InferenceBackendManager:
             try:
                 logger.info("Starting to watch InferenceBackend changes")
                 await self._clientset.inference_backends.awatch(
-                    callback=self._handle_event
+                    callback=self._handle_event, params={"resource_version": 0}
                 )
 
             except asyncio.CancelledError:
@@ -1,11 +1,26 @@
 import asyncio
+import codecs
+from collections import deque
+from contextlib import contextmanager, nullcontext
+import ctypes
+import ctypes.util
 from dataclasses import dataclass
+from itertools import islice
 import os
 import logging
-from typing import Annotated
+import sys
+from typing import (
+    Annotated,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+)
 
 import aiofiles
-from aiofiles.threadpool.text import AsyncTextIOWrapper
+from aiofiles.threadpool.binary import AsyncBufferedReader
 from fastapi import Depends, Query
 
 
@@ -37,53 +52,266 @@ def get_log_options(
 LogOptionsDep = Annotated[LogOptions, Depends(get_log_options)]
 
 
+BLOCK_SIZE = 2**16  # 64KB
+# Lines kept by a followed file for its followers to catch up with.
+FOLLOW_BUFFER_LINES = 10000
+# Interval to check a followed file for changes, without inotify. With
+# inotify, the check is a safety net for missed events, e.g. on network file
+# systems.
+FOLLOW_POLL_INTERVAL = 0.1
+FOLLOW_WATCHED_POLL_INTERVAL = 2
+
+
 async def log_generator(path: str, options: LogOptions):
     logger.debug(f"Reading logs from {path} with options {options}")
 
     try:
-        # By default, universal newline mode is used, which means that all of
-        # \n, \r, or \r\n are recognized as end-of-line characters.
-        # We use os.linesep to ensure that \r is reserved. It's useful for showing progress bars.
-        async with aiofiles.open(
-            path, "r", encoding="utf-8", errors="ignore", newline=os.linesep
-        ) as file:
-            if options.tail > 0:
-                # Move to the end of the file and read the last 'tail' lines
-                await file.seek(0, os.SEEK_END)
-                file_size = await file.tell()
-                buffer = []
-                BLOCK_SIZE = 2**16  # 64KB
-                while file_size > 0 and len(buffer) <= options.tail:
-                    await file.seek(max(0, file_size - BLOCK_SIZE), os.SEEK_SET)
-                    buffer = await file.readlines()
-                    file_size -= BLOCK_SIZE
-                for line in buffer[-options.tail :]:
-                    yield line
-            else:
-                async for line in read_all_lines(file):
-                    yield line
+        # Lines end with \n only, so that \r is reserved. It's useful for
+        # showing progress bars.
+        async with aiofiles.open(path, "rb") as file:
+            with _follow(path) if options.follow else nullcontext() as followed:
+                # Followers read the file up to where the followed file
+                # continues from.
+                end, cursor = followed.position() if followed else (None, 0)
+                start = 0
+                if options.tail > 0:
+                    size = end if end is not None else await file.seek(0, os.SEEK_END)
+                    start = await _tail_offset(file, size, options.tail)
 
-            if options.follow:
-                async for line in follow_file(file):
+                async for line in _read_lines(file, start, end):
                     yield line
+
+                if followed:
+                    async for line in followed.follow(cursor):
+                        yield line
     except Exception as e:
         logger.error(f"Failed to read logs from {path}. {e}")
 
 
-async def read_all_lines(file: AsyncTextIOWrapper):
-    """Read all lines from the file."""
-    while True:
-        line = await file.readline()
-        if not line:
+async def _tail_offset(file: AsyncBufferedReader, size: int, lines: int) -> int:
+    """
+    Return the offset of the last lines of the file, scanning backwards from
+    the size in blocks and counting newlines, so each byte is read once.
+    """
+    end = size
+    if end > 0:
+        # The newline ending the last line does not start another line.
+        await file.seek(end - 1)
+        if await file.read(1) == b"\n":
+            end -= 1
+
+    while end > 0:
+        start = max(0, end - BLOCK_SIZE)
+        await file.seek(start)
+        block = await file.read(end - start)
+        count = block.count(b"\n")
+        if count >= lines:
+            index = len(block)
+            for _ in range(lines):
+                index = block.rfind(b"\n", 0, index)
+            return start + index + 1
+        lines -= count
+        end = start
+    return 0
+
+
+async def _read_lines(
+    file: AsyncBufferedReader, start: int, end: Optional[int] = None
+) -> AsyncIterator[str]:
+    """Read lines from the start offset to the end offset, or to EOF."""
+    await file.seek(start)
+    decoder = _new_decoder()
+    pending = ""
+    while end is None or start < end:
+        size = BLOCK_SIZE if end is None else min(BLOCK_SIZE, end - start)
+        data = await file.read(size)
+        if not data:
             break
-        yield line
+        start += len(data)
+        lines = (pending + decoder.decode(data)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _new_decoder() -> codecs.IncrementalDecoder:
+    return codecs.getincrementaldecoder("utf-8")(errors="ignore")
+
+
+class _FollowedFile:
+    """
+    A log file followed by one or more followers.
+
+    A single task reads what is appended to the file, woken by inotify where
+    available or by polling otherwise, and keeps the latest lines for all
+    followers. Followers falling behind by more than the buffer skip the
+    lines they missed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.followers = 0
+        self._offset = os.path.getsize(path)
+        self._decoder = _new_decoder()
+        self._lines: Deque[str] = deque(maxlen=FOLLOW_BUFFER_LINES)
+        # Sequence number of the next line to read.
+        self._next_seq = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+        self._task = asyncio.create_task(self._run())
+
+    def position(self) -> Tuple[int, int]:
+        """Return the file offset and the line sequence number to follow from."""
+        return self._offset, self._next_seq
+
+    async def follow(self, cursor: int) -> AsyncIterator[str]:
+        """Yield the lines from the sequence number on, as they are read."""
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda cursor=cursor: self._next_seq > cursor or self._closed
+                )
+            if self._next_seq <= cursor:
+                return
+
+            first = self._next_seq - len(self._lines)
+            if cursor < first:
+                logger.warning(
+                    f"Skipped {first - cursor} lines falling behind {self.path}"
+                )
+                cursor = first
+            lines = list(islice(self._lines, cursor - first, None))
+            cursor += len(lines)
+            for line in lines:
+                yield line
+
+    def close(self):
+        self._task.cancel()
+
+    async def _run(self):
+        watch = _Inotify.create(self.path)
+        changed = asyncio.Event()
+        if watch:
+            asyncio.get_running_loop().add_reader(watch.fd, changed.set)
+        try:
+            async with aiofiles.open(self.path, "rb") as file:
+                while True:
+                    await self._read(file)
+                    if not watch:
+                        await asyncio.sleep(FOLLOW_POLL_INTERVAL)
+                        continue
+                    try:
+                        await asyncio.wait_for(
+                            changed.wait(), FOLLOW_WATCHED_POLL_INTERVAL
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    changed.clear()
+                    watch.drain()
+        except Exception as e:
+            logger.error(f"Failed to follow logs from {self.path}. {e}")
+        finally:
+            if watch:
+                asyncio.get_running_loop().remove_reader(watch.fd)
+                watch.close()
+            self._closed = True
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def _read(self, file: AsyncBufferedReader):
+        size = os.fstat(file.fileno()).st_size
+        if size < self._offset:
+            logger.debug(f"{self.path} was truncated, following from the start")
+            self._offset = 0
+            self._decoder = _new_decoder()
+        if size == self._offset:
+            return
+
+        await file.seek(self._offset)
+        while data := await file.read(BLOCK_SIZE):
+            # Emit incomplete lines as well, like progress bars.
+            lines = self._decoder.decode(data).split("\n")
+            self._lines.extend(line + "\n" for line in lines[:-1])
+            if lines[-1]:
+                self._lines.append(lines[-1])
+            self._next_seq += len(lines) - (0 if lines[-1] else 1)
+            self._offset += len(data)
+
+        async with self._changed:
+            self._changed.notify_all()
+
+
+# Followed files by path.
+_followed_files: Dict[str, _FollowedFile] = {}
+
+
+@contextmanager
+def _follow(path: str) -> Iterator[_FollowedFile]:
+    path = os.path.realpath(path)
+    followed = _followed_files.get(path)
+    if followed is None:
+        followed = _followed_files[path] = _FollowedFile(path)
+    followed.followers += 1
+    try:
+        yield followed
+    finally:
+        followed.followers -= 1
+        if followed.followers == 0:
+            del _followed_files[path]
+            followed.close()
+
+
+class _Inotify:
+    """
+    Minimal inotify binding through libc, to wake up followers of a file.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    @classmethod
+    def create(cls, path: str) -> Optional["_Inotify"]:
+        """Watch the file, return None if inotify is not available."""
+        if sys.platform != "linux":
+            return None
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            mask = (
+                cls.IN_MODIFY
+                | cls.IN_ATTRIB
+                | cls.IN_CLOSE_WRITE
+                | cls.IN_DELETE_SELF
+                | cls.IN_MOVE_SELF
+            )
+            if libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+                errno = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(errno, "inotify_add_watch failed")
+            return cls(fd)
+        except Exception as e:
+            logger.debug(f"Failed to watch {path} with inotify, polling it. {e}")
+            return None
 
+    def drain(self):
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
 
-async def follow_file(file: AsyncTextIOWrapper):
-    """Follow the file and yield new lines as they are written."""
-    while True:
-        line = await file.readline()
-        if not line:
-            await asyncio.sleep(0.1)  # wait before retrying
-            continue
-        yield line
+    def close(self):
+        os.close(self.fd)
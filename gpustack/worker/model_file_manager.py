@@ -74,7 +74,8 @@ class ModelFileManager:
             try:
                 logger.debug("Started watching model files.")
                 await self._clientset.model_files.awatch(
-                    callback=self._handle_model_file_event
+                    callback=self._handle_model_file_event,
+                    params={"resource_version": 0},
                 )
             except asyncio.CancelledError:
                 break
@@ -1,10 +1,15 @@
+import asyncio
+import hashlib
 import logging
-from typing import Optional
-import requests
+import random
+from typing import Dict, Iterable, Optional, Tuple
+
+import aiohttp
 from prometheus_client.parser import text_string_to_metric_families
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from gpustack.schemas.models import BackendEnum
+from gpustack.utils.network import use_proxy_env_for_url
+from gpustack.utils.task import EventLoopThread
 
 
 logger = logging.getLogger(__name__)
@@ -18,62 +23,56 @@ BackendVersionAPI = {
 
 class Config:
     def __init__(
-        self, timeout=3, max_retries=2, base_delay=1, max_delay=3, insecure_tls=True
+        self,
+        timeout=3,
+        max_retries=2,
+        base_delay=1,
+        max_delay=3,
+        insecure_tls=True,
+        jitter=0.5,
     ):
         self.timeout = timeout
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.insecure_tls = insecure_tls
+        # Upper bound in seconds of the random delay before each scrape, to
+        # spread the requests of a round instead of hitting every runtime at
+        # once.
+        self.jitter = jitter
 
 
 class Client:
+    """
+    Scrape runtime metrics endpoints.
+
+    Requests run concurrently on an event loop of their own in a background
+    thread, with keep-alive connections reused between rounds. Parsed metrics
+    are cached by endpoint along with the digest of their payload, so an
+    unchanged payload is not parsed again.
+    """
+
     def __init__(self, config=None):
         self.config = config or Config()
+        self._loop = EventLoopThread("runtime-metrics-client")
+        self._http_client: Optional[aiohttp.ClientSession] = None
+        self._http_client_no_proxy: Optional[aiohttp.ClientSession] = None
+        # Payload digest and parsed metrics by endpoint.
+        self._parsed: Dict[str, Tuple[bytes, dict]] = {}
 
     def fetch_metrics_from_endpoint(self, endpoint):
-        url = f"http://{endpoint}/metrics"
-
-        logger.trace(f"Fetching metrics from {url}")
-
-        for attempt in range(self.config.max_retries + 1):
-            try:
-                resp = requests.get(
-                    url,
-                    timeout=self.config.timeout,
-                    verify=not self.config.insecure_tls,
-                )
-                if resp.status_code == 200:
-                    metrics = {}
-                    for family in text_string_to_metric_families(resp.text):
-                        metrics[family.name] = family
-                    return metrics
-                else:
-                    logger.warning(
-                        f"[{endpoint}] Attempt {attempt + 1}: Bad status {resp.status_code}"
-                    )
-            except Exception as e:
-                logger.error(f"[{endpoint}] Attempt {attempt + 1}: Error {e}")
-            # Exponential backoff
-            if attempt < self.config.max_retries:
-                delay = min(
-                    self.config.base_delay * (2**attempt), self.config.max_delay
-                )
-                import time
-
-                time.sleep(delay)
-        return None
+        payloads = self._loop.run(self._fetch_payloads([endpoint], 1))
+        return self._parse_payloads(payloads)[endpoint]
 
     def fetch_metrics_from_endpoints(self, endpoints, max_workers=16):
-        results = {}
-        with ThreadPoolExecutor(max_workers=max_workers) as pool:
-            futures = {
-                pool.submit(self.fetch_metrics_from_endpoint, ep): ep
-                for ep in endpoints
-            }
-            for future in as_completed(futures):
-                ep = futures[future]
-                results[ep] = future.result()
+        endpoints = list(endpoints)
+        payloads = self._loop.run(self._fetch_payloads(endpoints, max_workers))
+        results = self._parse_payloads(payloads)
+
+        # Forget the endpoints that are no longer scraped.
+        for ep in list(self._parsed):
+            if ep not in payloads:
+                del self._parsed[ep]
         return results
 
     def fetch_runtime_version_from_endpoint(
@@ -88,24 +87,105 @@ class Client:
         if paths is None:
             return None
 
+        return self._loop.run(self._fetch_runtime_version(endpoint, runtime, paths))
+
+    def _parse_payloads(
+        self, payloads: Dict[str, Optional[bytes]]
+    ) -> Dict[str, Optional[dict]]:
+        # Parsing is CPU bound, keep it off the event loop.
+        return {
+            ep: self._parse(ep, payload) if payload is not None else None
+            for ep, payload in payloads.items()
+        }
+
+    def _parse(self, endpoint: str, payload: bytes) -> dict:
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        cached = self._parsed.get(endpoint)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+
+        metrics = {}
+        for family in text_string_to_metric_families(payload.decode("utf-8")):
+            metrics[family.name] = family
+        self._parsed[endpoint] = (digest, metrics)
+        return metrics
+
+    def _get_http_client(self, url: str) -> aiohttp.ClientSession:
+        if self._http_client is None:
+            connector = aiohttp.TCPConnector(
+                limit=0, ssl=False if self.config.insecure_tls else None
+            )
+            timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+            self._http_client = aiohttp.ClientSession(
+                connector=connector, timeout=timeout, trust_env=True
+            )
+            self._http_client_no_proxy = aiohttp.ClientSession(
+                connector=connector, connector_owner=False, timeout=timeout
+            )
+
+        if use_proxy_env_for_url(url):
+            return self._http_client
+        return self._http_client_no_proxy
+
+    async def _fetch_payloads(
+        self, endpoints: Iterable[str], max_workers: int
+    ) -> Dict[str, Optional[bytes]]:
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(endpoint: str) -> Optional[bytes]:
+            if self.config.jitter > 0:
+                await asyncio.sleep(random.uniform(0, self.config.jitter))
+            async with semaphore:
+                return await self._fetch_payload(endpoint)
+
+        payloads = await asyncio.gather(*(fetch(ep) for ep in endpoints))
+        return dict(zip(endpoints, payloads))
+
+    async def _fetch_payload(self, endpoint: str) -> Optional[bytes]:
+        url = f"http://{endpoint}/metrics"
+
+        logger.trace(f"Fetching metrics from {url}")
+
+        http_client = self._get_http_client(url)
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                async with http_client.get(url) as resp:
+                    if resp.status == 200:
+                        return await resp.read()
+                    logger.warning(
+                        f"[{endpoint}] Attempt {attempt + 1}: Bad status {resp.status}"
+                    )
+            except Exception as e:
+                logger.error(f"[{endpoint}] Attempt {attempt + 1}: Error {e!r}")
+            # Exponential backoff with full jitter
+            if attempt < self.config.max_retries:
+                delay = min(
+                    self.config.base_delay * (2**attempt), self.config.max_delay
+                )
+                await asyncio.sleep(random.uniform(0, delay))
+        return None
+
+    async def _fetch_runtime_version(
+        self, endpoint: str, runtime: str, paths: Iterable[str]
+    ) -> Optional[str]:
         error_msg = ""
         warning_msg = ""
         for path in paths:
             url = f"http://{endpoint}/{path}"
             try:
-                resp = requests.get(
-                    url,
-                    timeout=self.config.timeout,
-                    verify=not self.config.insecure_tls,
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    return data.get("version", None)
-                else:
-                    warning_msg = f"[{endpoint}] Bad status {resp.status_code} when fetching {runtime} version from {url}"
+                async with self._get_http_client(url).get(url) as resp:
+                    if resp.status == 200:
+                        data = await resp.json(content_type=None)
+                        return data.get("version", None)
+                    else:
+                        warning_msg = (
+                            f"[{endpoint}] Bad status {resp.status} "
+                            f"when fetching {runtime} version from {url}"
+                        )
             except Exception as e:
                 error_msg = (
-                    f"[{endpoint}] Error {e} when fetching {runtime} version from {url}"
+                    f"[{endpoint}] Error {e!r} "
+                    f"when fetching {runtime} version from {url}"
                 )
 
         if error_msg:
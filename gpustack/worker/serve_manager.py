@@ -4,10 +4,9 @@ from datetime import datetime, timezone
 import multiprocessing
 import threading
 
-import requests
 import setproctitle
 import os
-from typing import Dict, Optional, Set, List, Callable
+from typing import Dict, Optional, Set, List, Callable, Tuple, Union
 import logging
 
 from gpustack_runtime.deployer import (
@@ -17,7 +16,7 @@ from gpustack_runtime.deployer import (
 )
 from gpustack_runtime.deployer.__utils__ import compare_versions
 
-from gpustack.api.exceptions import NotFoundException
+from gpustack.api.exceptions import NotFoundException, raise_if_response_error
 from gpustack.config.config import Config
 from gpustack.config import registration
 from gpustack.logging import (
@@ -40,6 +39,7 @@ from gpustack.schemas.models import (
     Model,
     ModelUpdate,
     ModelInstance,
+    ModelInstanceBatchUpdate,
     ModelInstanceUpdate,
     ModelInstanceStateEnum,
     get_backend,
@@ -48,6 +48,7 @@ from gpustack.schemas.models import (
     CategoryEnum,
 )
 from gpustack.server.bus import Event, EventType
+from gpustack.worker.health_prober import HealthCheckTarget, HealthProber
 from gpustack.worker.inference_backend_manager import InferenceBackendManager
 
 logger = logging.getLogger(__name__)
@@ -126,6 +127,8 @@ class ServeManager:
         # Instance-level port tracking to avoid conflicts
         self._assigned_ports: Dict[int, Set[int]] = {}
 
+        self._health_prober = HealthProber()
+
         os.makedirs(self._serve_log_dir, exist_ok=True)
 
     async def watch_models(self):
@@ -139,7 +142,9 @@ class ServeManager:
         while True:
             try:
                 # Watch models without callback to keep the cache updated.
-                await self._clientset.models.awatch(callback=None)
+                await self._clientset.models.awatch(
+                    callback=None, params={"resource_version": 0}
+                )
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -156,8 +161,14 @@ class ServeManager:
 
         while True:
             try:
+                # Watch only the instances assigned to this worker, so the cache
+                # doesn't grow with the cluster.
                 await self._clientset.model_instances.awatch(
-                    callback=self._handle_model_instance_event
+                    callback=self._handle_model_instance_event,
+                    params={
+                        "assigned_worker_id": str(self._worker_id),
+                        "resource_version": 0,
+                    },
                 )
             except asyncio.CancelledError:
                 break
@@ -191,13 +202,16 @@ class ServeManager:
         - If the workload is still launching, skip.
         - If the workload is not existed, unhealthy, inactive or failed, update the model instance state to ERROR.
         - If everything is fine, update the model instance state to RUNNING.
+
+        Health checks of the round run concurrently, and the state changes
+        are sent to the server in one update.
         """
 
         # Get all model instances assigned to this worker.
-        #
-        # FIXME(thxCode): This may cause performance issues when there are many model instances in the system.
-        #                 A mechanism is needed to improve efficiency here.
-        model_instances_page = self._clientset.model_instances.list()
+        model_instances_page = self._clientset.model_instances.list(
+            params={"assigned_worker_id": str(self._worker_id)}
+        )
+        self._health_prober.retain(mi.id for mi in model_instances_page.items)
         if not model_instances_page.items:
             return
         model_instances: List[ModelInstance] = []
@@ -218,6 +232,12 @@ class ServeManager:
                         model_instances.append(model_instance)
                         break
 
+        # Fields to update by model instance ID.
+        patches: Dict[int, dict] = {}
+        # Main worker instances to set RUNNING once healthy.
+        health_checks: Dict[int, Tuple[ModelInstance, str, Model]] = {}
+        health_check_targets: List[HealthCheckTarget] = []
+
         for model_instance in model_instances:
             # Skip if the provision process has not exited yet.
             if self._is_provisioning(model_instance):
@@ -282,8 +302,7 @@ class ServeManager:
                             patch_dict = {
                                 f"distributed_servers.subordinate_workers.{sw_pos}": sw,
                             }
-                        # Update model instance.
-                        self._update_model_instance(model_instance.id, **patch_dict)
+                        patches[model_instance.id] = patch_dict
                 continue
 
             # Otherwise, update model instance state to RUNNING if everything is fine.
@@ -319,27 +338,26 @@ class ServeManager:
                     if not sw_error_msg:
                         if model_instance.state == ModelInstanceStateEnum.RUNNING:
                             continue
-                        if not is_ready(
+                        health_check_url = get_health_check_url(
                             backend, model_instance, health_check_path, model
-                        ):
+                        )
+                        if health_check_url is False:
                             continue
-
-                        patch_dict = {
-                            "state": ModelInstanceStateEnum.RUNNING,
-                            "restart_count": 0,  # Reset restart count on successful run.
-                            "state_message": "",
-                        }
-
-                        # Fetch model meta once running.
-                        meta = get_meta_from_running_instance(
-                            model_instance, backend, model
+                        # Set RUNNING after the health checks of the round.
+                        health_checks[model_instance.id] = (
+                            model_instance,
+                            backend,
+                            model,
                         )
-                        if meta:
-                            # Some meta is set in server evaluation and should be preserved, so we update meta instead of overwrite.
-                            merged_meta = dict(model.meta or {})
-                            merged_meta.update(meta)
-                            if merged_meta != model.meta:
-                                self._update_model(model.id, meta=merged_meta)
+                        if health_check_url is not True:
+                            health_check_targets.append(
+                                HealthCheckTarget(
+                                    id=model_instance.id,
+                                    name=model_instance.name,
+                                    url=health_check_url,
+                                )
+                            )
+                        continue
                     # Otherwise, update the main worker state to ERROR.
                     else:
                         patch_dict = {
@@ -373,8 +391,30 @@ class ServeManager:
                     patch_dict = {
                         f"distributed_servers.subordinate_workers.{sw_pos}": sw,
                     }
-                # Update model instance.
-                self._update_model_instance(model_instance.id, **patch_dict)
+                patches[model_instance.id] = patch_dict
+
+        healthy = self._health_prober.probe(health_check_targets)
+        for id, (model_instance, backend, model) in health_checks.items():
+            # Instances without a health check are ready.
+            if not healthy.get(id, True):
+                continue
+
+            patches[id] = {
+                "state": ModelInstanceStateEnum.RUNNING,
+                "restart_count": 0,  # Reset restart count on successful run.
+                "state_message": "",
+            }
+
+            # Fetch model meta once running.
+            meta = get_meta_from_running_instance(model_instance, backend, model)
+            if meta:
+                # Some meta is set in server evaluation and should be preserved, so we update meta instead of overwrite.
+                merged_meta = dict(model.meta or {})
+                merged_meta.update(meta)
+                if merged_meta != model.meta:
+                    self._update_model(model.id, meta=merged_meta)
+
+        self._update_model_instances(patches)
 
     @staticmethod
     def _serve_model_instance(
@@ -799,6 +839,44 @@ class ServeManager:
                 f"Model instance with ID {id} not found when trying to update."
             )
 
+    def _update_model_instances(self, patches: Dict[int, dict]):
+        """
+        Update model instances with given fields in one request.
+
+        Args:
+            patches: The fields to update by model instance ID, group by field name and value.
+        """
+
+        model_updates = []
+        for id, kwargs in patches.items():
+            try:
+                mi_public = self._clientset.model_instances.get(id=id)
+            except NotFoundException:
+                logger.warning(
+                    f"Model instance with ID {id} not found when trying to update."
+                )
+                continue
+
+            mi = ModelInstanceBatchUpdate(**mi_public.model_dump())
+            for key, value in kwargs.items():
+                set_attr(mi, key, value)
+            model_updates.append(mi)
+
+        if not model_updates:
+            return
+
+        response = self._clientset.http_client.get_httpx_client().put(
+            "/model-instances/batch",
+            content=f"[{','.join(mi.model_dump_json() for mi in model_updates)}]",
+            headers={"Content-Type": "application/json"},
+        )
+        if response.status_code in (404, 405, 422):
+            # The server doesn't support batch updates, update one by one.
+            for id, kwargs in patches.items():
+                self._update_model_instance(id, **kwargs)
+            return
+        raise_if_response_error(response)
+
     def _stop_model_instance(self, mi: ModelInstance):
         """
         Stop model instance and clean up.
@@ -949,14 +1027,15 @@ class ServeManager:
         )
 
 
-def is_ready(
+def get_health_check_url(
     backend: str,
     mi: ModelInstance,
     health_check_path: Optional[str] = None,
     model: Model = None,
-) -> bool:
+) -> Union[str, bool]:
     """
-    Access the health endpoint of the given model instance to check if it is servable.
+    Get the health endpoint of the given model instance to check if it is servable,
+    or whether it is servable if that is known without a health check.
     """
     is_built_in = is_built_in_backend(backend)
     if (not is_built_in or backend == BackendEnum.CUSTOM) and (not health_check_path):
@@ -985,16 +1064,8 @@ def is_ready(
         # Built-in backends (vLLM, SGLang, vox-box) except (Custom, MindIE) use /v1/models as health check path.
         health_check_path = "/v1/models"
 
-    try:
-        # Use the worker IP instead of localhost for health check.
-        # Reasons:
-        # 1. Connectivity to the loopback address does not work with Ascend MindIE.
-        # 2. More adaptable to container networks.
-        health_check_url = f"http://{mi.worker_ip}:{mi.port}{health_check_path}"
-        response = requests.get(health_check_url, timeout=1)
-        if response.status_code == 200:
-            return True
-    except Exception as e:
-        logger.debug(f"Error checking model instance {mi.name} health: {e}")
-        pass
-    return False
+    # Use the worker IP instead of localhost for health check.
+    # Reasons:
+    # 1. Connectivity to the loopback address does not work with Ascend MindIE.
+    # 2. More adaptable to container networks.
+    return f"http://{mi.worker_ip}:{mi.port}{health_check_path}"
@@ -1,10 +1,12 @@
 import os
 import logging
+import time
 from typing import Optional, Tuple
 
 import httpx
 
-from gpustack import __version__, __git_commit__
+from gpustack import __version__, __git_commit__, envs
+from gpustack.api.exceptions import HTTPException
 from gpustack.client import ClientSet
 from gpustack.client.worker_manager_clients import (
     WorkerStatusClient,
@@ -15,6 +17,10 @@ from gpustack.schemas.workers import (
     WorkerCreate,
     WorkerUpdate,
     WorkerRegistrationPublic,
+    WorkerStatusPublic,
+    diff_worker_status,
+    merge_worker_status,
+    worker_status_digest,
 )
 from gpustack.schemas.config import PredefinedConfigNoDefaults
 from gpustack.security import API_KEY_PREFIX
@@ -42,6 +48,10 @@ class WorkerManager:
     _clientset: Optional[ClientSet] = None
     _registration_client: WorkerRegistrationClient
     _status_client: WorkerStatusClient
+    # Status known to the server, which deltas are computed against.
+    _reported_status: Optional[dict] = None
+    _full_status_reported_at: float = 0
+    _status_delta_supported: bool = True
 
     def __init__(
         self,
@@ -62,6 +72,7 @@ class WorkerManager:
             api_key=token,
         )
         self._status_client = WorkerStatusClient(self._clientset.http_client)
+        self._reported_status = None
 
     def sync_worker_status(self):
         """
@@ -76,10 +87,48 @@ class WorkerManager:
             logger.error(f"Failed to collect status for worker: {e}")
             return
         try:
-            self._status_client.create(workerStatus)
+            self._report_status(workerStatus)
         except Exception as e:
             logger.error(f"Failed to update worker status: {e}")
 
+    def _report_status(self, worker_status: WorkerStatusPublic):
+        """
+        Report only the status fields that changed since the last report, and
+        the full status periodically or when the server has no status to
+        apply the changes to.
+        """
+        status = worker_status.model_dump(mode="json")
+        now = time.monotonic()
+        if (
+            self._reported_status is not None
+            and self._status_delta_supported
+            and now - self._full_status_reported_at
+            < envs.WORKER_STATUS_FULL_SYNC_INTERVAL
+        ):
+            delta = diff_worker_status(
+                self._reported_status, status, envs.WORKER_STATUS_DELTA_THRESHOLD
+            )
+            merged = merge_worker_status(self._reported_status, delta)
+            try:
+                self._status_client.update(
+                    delta,
+                    baseline=worker_status_digest(self._reported_status),
+                    digest=worker_status_digest(merged),
+                )
+                self._reported_status = merged
+                return
+            except HTTPException as e:
+                if e.status_code in (404, 405):
+                    # The server does not support status deltas.
+                    self._status_delta_supported = False
+                elif e.status_code != 409:
+                    raise
+
+        self._reported_status = None
+        self._status_client.create(worker_status, digest=worker_status_digest(status))
+        self._reported_status = status
+        self._full_status_reported_at = now
+
     async def register_with_server(
         self,
     ) -> Tuple[ClientSet, Optional[PredefinedConfigNoDefaults]]:
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from gpustack.api import middlewares
+from gpustack.api.middlewares import passthrough_streaming_generator
+from gpustack.schemas.model_usage import OperationEnum
+
+CONTENT_FRAME = (
+    b'data: {"id":"1","choices":[{"index":0,"delta":{"content":"hi"},'
+    b'"finish_reason":null}],"usage":null}\n\n'
+)
+USAGE_FRAME = (
+    b'data: {"id":"1","choices":[],"usage":{"prompt_tokens":5,'
+    b'"completion_tokens":7,"total_tokens":12}}\n\n'
+)
+DONE_FRAME = b"data: [DONE]\n\n"
+
+
+async def iterate(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(chunks, monkeypatch):
+    recorded = []
+
+    async def fake_record_model_usage(request, usage, operation):
+        recorded.append(usage)
+
+    monkeypatch.setattr(middlewares, "record_model_usage", fake_record_model_usage)
+    request = SimpleNamespace(
+        state=SimpleNamespace(start_time=datetime.now(timezone.utc))
+    )
+    output = b"".join(
+        [
+            chunk
+            async for chunk in passthrough_streaming_generator(
+                request, iterate(chunks), OperationEnum.CHAT_COMPLETION
+            )
+        ]
+    )
+    return output, recorded
+
+
+@pytest.mark.asyncio
+async def test_passthrough_forwards_content_unchanged(monkeypatch):
+    chunks = [CONTENT_FRAME, CONTENT_FRAME, DONE_FRAME]
+
+    output, recorded = await collect(chunks, monkeypatch)
+
+    assert output == b"".join(chunks)
+    assert recorded == []
+
+
+@pytest.mark.asyncio
+async def test_passthrough_records_usage_split_across_chunks(monkeypatch):
+    stream = CONTENT_FRAME + USAGE_FRAME + DONE_FRAME
+    split = len(CONTENT_FRAME) + 30
+    chunks = [stream[:split], stream[split:]]
+
+    output, recorded = await collect(chunks, monkeypatch)
+
+    assert len(recorded) == 1
+    assert recorded[0].prompt_tokens == 5
+    assert recorded[0].completion_tokens == 7
+
+    frames = output.split(b"\n\n")
+    assert frames[0] + b"\n\n" == CONTENT_FRAME
+    usage = json.loads(frames[1][len(b"data: ") :])["usage"]
+    assert usage["total_tokens"] == 12
+    assert "tokens_per_second" in usage
+    assert output.endswith(DONE_FRAME)
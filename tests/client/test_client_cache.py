@@ -0,0 +1,134 @@
+import json
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from gpustack.client.generated_model_instance_client import ModelInstanceClient
+from gpustack.schemas.models import ModelInstanceStateEnum
+from gpustack.server.bus import Event, EventType
+
+
+def instance(id, worker_id=None, model_id=1, state=ModelInstanceStateEnum.RUNNING):
+    now = datetime.now(timezone.utc)
+    return {
+        "id": id,
+        "name": f"test-{id}",
+        "worker_id": worker_id,
+        "model_id": model_id,
+        "model_name": "test",
+        "state": state,
+        "source": "huggingface",
+        "huggingface_repo_id": "Qwen/Qwen3-0.6B",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def new_client(*instances) -> ModelInstanceClient:
+    client = ModelInstanceClient(client=None)
+    client._watch_started = True
+    for data in instances:
+        client._update_cache_from_event(Event(type=EventType.CREATED, data=data))
+    return client
+
+
+def ids(client: ModelInstanceClient, params=None):
+    return sorted(item.id for item in client.list(params=params).items)
+
+
+def test_list_filters_by_indexed_fields():
+    client = new_client(
+        instance(1, worker_id=1, model_id=1),
+        instance(2, worker_id=1, model_id=2),
+        instance(3, worker_id=2, model_id=1),
+        # Items without a value for a field match any value.
+        instance(4, worker_id=None, model_id=2),
+    )
+
+    assert ids(client) == [1, 2, 3, 4]
+    assert ids(client, {"worker_id": "1"}) == [1, 2, 4]
+    assert ids(client, {"worker_id": 1, "model_id": 2}) == [2, 4]
+    assert ids(client, {"worker_id": "3", "model_id": "1"}) == []
+    assert ids(client, {"state": ModelInstanceStateEnum.RUNNING, "watch": "true"}) == [
+        1,
+        2,
+        3,
+        4,
+    ]
+
+
+def test_list_follows_cache_updates():
+    client = new_client(instance(1, worker_id=1), instance(2, worker_id=1))
+    assert ids(client, {"worker_id": "1"}) == [1, 2]
+    snapshot = client.list(params={"worker_id": "1"}).items
+
+    client._update_cache_from_event(
+        Event(type=EventType.UPDATED, data=instance(1, worker_id=2))
+    )
+    client._update_cache_from_event(
+        Event(type=EventType.DELETED, data=instance(2, worker_id=1))
+    )
+
+    assert ids(client, {"worker_id": "1"}) == []
+    assert ids(client, {"worker_id": "2"}) == [1]
+    assert [item.id for item in snapshot] == [1, 2]
+
+
+def test_listed_items_are_copies():
+    client = new_client(instance(1, worker_id=1), instance(2, worker_id=1))
+    client.list(params={"worker_id": "1"}).items.clear()
+
+    assert ids(client, {"worker_id": "1"}) == [1, 2]
+
+
+class FakeHTTPClient:
+    """Serve watch streams, recording the params of each watch."""
+
+    def __init__(self, lines):
+        self.params = []
+        self.lines = lines
+
+    def get_async_httpx_client(self):
+        def handler(request: httpx.Request):
+            self.params.append(dict(request.url.params))
+            return httpx.Response(200, text="\n".join(self.lines) + "\n")
+
+        return httpx.AsyncClient(
+            base_url="http://server", transport=httpx.MockTransport(handler)
+        )
+
+
+def event_line(id, resource_version=None):
+    event = {"type": "CREATED", "data": instance(id), "id": id}
+    if resource_version is not None:
+        event["resource_version"] = resource_version
+    return json.dumps(jsonable_encoder(event))
+
+
+@pytest.mark.asyncio
+async def test_awatch_sends_resource_version_only_when_resuming():
+    def once(event):
+        return True
+
+    http_client = FakeHTTPClient([event_line(1)])
+    client = ModelInstanceClient(client=http_client)
+    await client.awatch(stop_condition=once)
+    await client.awatch(stop_condition=once)
+    assert [params.get("resource_version") for params in http_client.params] == [
+        None,
+        None,
+    ]
+
+    http_client = FakeHTTPClient([event_line(1, resource_version=7)])
+    client = ModelInstanceClient(client=http_client)
+    # Reconnect with the same params, as watch loops do.
+    params = {"worker_id": "1", "resource_version": 0}
+    for _ in range(3):
+        await client.awatch(stop_condition=once, params=params)
+    assert [params["resource_version"] for params in http_client.params] == [
+        "0",
+        "7",
+        "7",
+    ]
@@ -0,0 +1,270 @@
+import asyncio
+import copy
+from collections import Counter
+from typing import Dict
+
+import pytest
+from kubernetes_asyncio import client as k8s_client
+from kubernetes_asyncio.client import ApiException
+
+from gpustack.gateway.client.networking_higress_io_v1_api import McpBridgeRegistry
+from gpustack.gateway.sync import GatewaySync
+from gpustack.gateway.utils import ensure_model_ingress
+from gpustack.server.bus import EventType
+
+
+class FakeNetworkingApi:
+    """In-memory NetworkingV1Api counting the ingress calls."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.ingresses: Dict[str, k8s_client.V1Ingress] = {
+            "gpustack": k8s_client.V1Ingress(
+                metadata=k8s_client.V1ObjectMeta(name="gpustack"),
+                spec=k8s_client.V1IngressSpec(rules=[]),
+            )
+        }
+
+    async def read_namespaced_ingress(self, name, namespace):
+        self.calls["read"] += 1
+        if name not in self.ingresses:
+            raise ApiException(status=404)
+        return copy.deepcopy(self.ingresses[name])
+
+    async def create_namespaced_ingress(self, namespace, body):
+        self.calls["create"] += 1
+        self.ingresses[body.metadata.name] = copy.deepcopy(body)
+
+    async def replace_namespaced_ingress(self, name, namespace, body):
+        self.calls["replace"] += 1
+        self.ingresses[name] = copy.deepcopy(body)
+
+    async def delete_namespaced_ingress(self, name, namespace):
+        self.calls["delete"] += 1
+        self.ingresses.pop(name)
+
+
+def sync_ingress(sync: GatewaySync, api, replicas: int, event_type=EventType.UPDATED):
+    destinations = [
+        (
+            100 // replicas,
+            "qwen3",
+            McpBridgeRegistry(name=f"model-1-{i}", type="static"),
+        )
+        for i in range(replicas)
+    ]
+    kwargs = dict(
+        ingress_name="ai-route-route-1",
+        route_name="qwen3",
+        namespace="gpustack",
+        destinations=destinations,
+        event_type=event_type,
+        networking_api=api,
+    )
+    return sync.sync(
+        key=("Ingress", "gpustack", "ai-route-route-1"),
+        desired=(event_type == EventType.DELETED, destinations),
+        apply=lambda: ensure_model_ingress(**kwargs),
+        deleted=event_type == EventType.DELETED,
+    )
+
+
+def destination_annotation(api) -> str:
+    ingress = api.ingresses["ai-route-route-1"]
+    return ingress.metadata.annotations["higress.io/destination"]
+
+
+@pytest.mark.asyncio
+async def test_burst_applied_once_with_latest_state():
+    api = FakeNetworkingApi()
+    sync = GatewaySync(debounce=0.01, resync_period=60)
+
+    for replicas in range(1, 9):
+        assert sync_ingress(sync, api, replicas)
+    await sync.wait()
+
+    assert api.calls["create"] == 1
+    assert api.calls["replace"] == 0
+    assert destination_annotation(api).count("model-1-") == 8
+
+
+@pytest.mark.asyncio
+async def test_unchanged_state_skipped():
+    api = FakeNetworkingApi()
+    sync = GatewaySync(debounce=0.01, resync_period=60)
+    sync_ingress(sync, api, 2)
+    await sync.wait()
+    calls = api.calls.copy()
+
+    assert not sync_ingress(sync, api, 2)
+    await sync.wait()
+    assert api.calls == calls
+
+    assert sync_ingress(sync, api, 3)
+    await sync.wait()
+    assert api.calls["replace"] == 1
+    assert destination_annotation(api).count("model-1-") == 3
+
+    assert sync_ingress(sync, api, 3, EventType.DELETED)
+    await sync.wait()
+    assert not sync_ingress(sync, api, 3, EventType.DELETED)
+    assert api.calls["delete"] == 1
+
+
+@pytest.mark.asyncio
+async def test_resynced_after_period():
+    api = FakeNetworkingApi()
+    sync = GatewaySync(debounce=0, resync_period=0)
+    sync_ingress(sync, api, 2)
+    await sync.wait()
+
+    # Deleted outside of GPUStack.
+    del api.ingresses["ai-route-route-1"]
+    assert sync_ingress(sync, api, 2)
+    await sync.wait()
+
+    assert api.calls["create"] == 2
+
+
+@pytest.mark.asyncio
+async def test_deleted_keys_forgotten_after_resync_period():
+    api = FakeNetworkingApi()
+    sync = GatewaySync(debounce=0, resync_period=0.05)
+    key = ("Ingress", "gpustack", "ai-route-route-1")
+    sync_ingress(sync, api, 2)
+    await sync.wait()
+    async with sync.lock(key):
+        pass
+
+    sync_ingress(sync, api, 2, EventType.DELETED)
+    await sync.wait()
+    assert key not in sync._locks
+    # Repeated deletions are skipped until the resync period is over.
+    assert not sync_ingress(sync, api, 2, EventType.DELETED)
+
+    async def apply():
+        pass
+
+    await asyncio.sleep(0.05)
+    sync.sync(("Ingress", "gpustack", "other"), "spec", apply)
+    await sync.wait()
+    assert key not in sync._applied
+    assert not sync._deleted
+
+
+@pytest.mark.asyncio
+async def test_state_reverted_before_apply_is_applied():
+    applied = []
+    release = asyncio.Event()
+
+    def apply_state(state):
+        async def apply():
+            if state == "other":
+                await release.wait()
+            applied.append(state)
+
+        return apply
+
+    sync = GatewaySync(debounce=0, resync_period=60)
+    object_key = ("WasmPlugin", "ns", "plugin")
+    key = object_key + (1,)
+    sync.sync(key, "a", apply_state("a"), object_key)
+    await sync.wait()
+
+    # Another route holds the object while "b" waits to be applied.
+    sync.sync(object_key + (2,), "other", apply_state("other"), object_key)
+    await asyncio.sleep(0.01)
+    sync.sync(key, "b", apply_state("b"), object_key)
+    await asyncio.sleep(0.01)
+    # Reverted to the state applied last.
+    assert sync.sync(key, "a", apply_state("a"), object_key)
+    release.set()
+    await sync.wait()
+
+    assert applied == ["a", "other", "b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_failed_apply_retried_with_backoff():
+    attempts = []
+
+    async def apply():
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) < 3:
+            raise RuntimeError("connection refused")
+
+    sync = GatewaySync(
+        debounce=0, resync_period=60, retry_base_delay=0.05, retry_max_delay=1
+    )
+    sync.sync(("WasmPlugin", "ns", "plugin"), "spec", apply)
+    await sync.wait()
+
+    assert len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.05
+    assert attempts[2] - attempts[1] >= 0.1
+    assert not sync.sync(("WasmPlugin", "ns", "plugin"), "spec", apply)
+
+
+@pytest.mark.asyncio
+async def test_failed_apply_replaced_by_newer_state():
+    applied = []
+
+    def apply_state(state):
+        async def apply():
+            if state == "a":
+                raise RuntimeError("connection refused")
+            applied.append(state)
+
+        return apply
+
+    sync = GatewaySync(debounce=0, resync_period=60, retry_base_delay=0.05)
+    sync.sync(("WasmPlugin", "ns", "plugin"), "a", apply_state("a"))
+    await asyncio.sleep(0.01)
+    # Merged into the pending retry.
+    assert sync.sync(("WasmPlugin", "ns", "plugin"), "b", apply_state("b"))
+    await sync.wait()
+
+    assert applied == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_applies_to_shared_object_serialized():
+    running = []
+    overlapped = False
+
+    async def apply():
+        nonlocal overlapped
+        overlapped = overlapped or bool(running)
+        running.append(1)
+        await asyncio.sleep(0.02)
+        running.pop()
+
+    sync = GatewaySync(debounce=0, resync_period=60)
+    for route_id in range(3):
+        sync.sync(
+            ("WasmPlugin", "ns", "plugin", route_id),
+            route_id,
+            apply,
+            object_key=("WasmPlugin", "ns", "plugin"),
+        )
+    await sync.wait()
+
+    assert not overlapped
+
+
+@pytest.mark.asyncio
+async def test_direct_writes_serialized_with_applies():
+    order = []
+
+    async def apply():
+        order.append("apply")
+
+    sync = GatewaySync(debounce=0, resync_period=60)
+    object_key = ("McpBridge", "ns", "default")
+    async with sync.lock(object_key):
+        sync.sync(object_key + (1,), "spec", apply, object_key)
+        await asyncio.sleep(0.01)
+        order.append("write")
+    await sync.wait()
+
+    assert order == ["write", "apply"]
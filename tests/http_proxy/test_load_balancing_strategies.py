@@ -0,0 +1,121 @@
+import pytest
+
+from gpustack.http_proxy.load_balancer import MODEL_STRATEGY_META_KEY, LoadBalancer
+from gpustack.http_proxy.strategies import (
+    EWMATTFTStrategy,
+    InstanceLoadTracker,
+    LeastOutstandingRequestsStrategy,
+    PowerOfTwoChoicesStrategy,
+    RoundRobinStrategy,
+)
+from gpustack.schemas.models import ModelInstanceStateEnum
+from tests.utils.model import new_model, new_model_instance
+
+
+def running_instances(count: int):
+    return [
+        new_model_instance(i, f"test-{i}", 1, 1, ModelInstanceStateEnum.RUNNING)
+        for i in range(1, count + 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_round_robin_keeps_position_when_instances_change():
+    strategy = RoundRobinStrategy()
+    instances = running_instances(3)
+
+    picked = [(await strategy.select_instance(instances)).id for _ in range(4)]
+    assert picked == [1, 2, 3, 1]
+
+    # A new list with the same instances continues the rotation.
+    picked = (await strategy.select_instance(list(instances))).id
+    assert picked == 2
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_requests():
+    tracker = InstanceLoadTracker()
+    strategy = LeastOutstandingRequestsStrategy(tracker)
+    instances = running_instances(3)
+    tracker.request_started(instances[0])
+    tracker.request_started(instances[1])
+
+    assert (await strategy.select_instance(instances)).id == 3
+
+    tracker.request_started(instances[2])
+    tracker.request_started(instances[2])
+    tracker.request_finished(instances[0])
+    assert (await strategy.select_instance(instances)).id == 1
+
+
+@pytest.mark.asyncio
+async def test_power_of_two_choices_never_picks_busiest():
+    tracker = InstanceLoadTracker()
+    strategy = PowerOfTwoChoicesStrategy(tracker)
+    instances = running_instances(3)
+    for _ in range(5):
+        tracker.request_started(instances[0])
+
+    for _ in range(50):
+        assert (await strategy.select_instance(instances)).id != 1
+
+
+@pytest.mark.asyncio
+async def test_ewma_ttft_prefers_fast_instances():
+    tracker = InstanceLoadTracker(decay=0.5)
+    strategy = EWMATTFTStrategy(tracker)
+    instances = running_instances(2)
+
+    # Unmeasured instances are explored first.
+    tracker.first_token_received(instances[0], 1.0)
+    assert (await strategy.select_instance(instances)).id == 2
+
+    tracker.first_token_received(instances[1], 0.1)
+    assert (await strategy.select_instance(instances)).id == 2
+
+    # Queued requests raise the expected wait of the fast instance.
+    for _ in range(10):
+        tracker.request_started(instances[1])
+    assert (await strategy.select_instance(instances)).id == 1
+
+    tracker.first_token_received(instances[0], 0.0)
+    assert tracker.ewma_ttft(instances[0]) == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_strategy_selected_per_model():
+    load_balancer = LoadBalancer()
+    instances = running_instances(2)
+    load_balancer.tracker.request_started(instances[0])
+    model = new_model(
+        1,
+        "test",
+        huggingface_repo_id="Qwen/Qwen3",
+        meta={MODEL_STRATEGY_META_KEY: "least_outstanding_requests"},
+    )
+
+    assert isinstance(
+        load_balancer.get_strategy(model), LeastOutstandingRequestsStrategy
+    )
+    assert isinstance(load_balancer.get_strategy(), RoundRobinStrategy)
+    for _ in range(3):
+        assert (await load_balancer.get_instance(instances, model)).id == 2
+
+
+@pytest.mark.asyncio
+async def test_instances_no_longer_running_are_forgotten():
+    load_balancer = LoadBalancer()
+    tracker = load_balancer.tracker
+    instances = running_instances(3)
+    other = new_model_instance(4, "other-1", 2, 1, ModelInstanceStateEnum.RUNNING)
+    for instance in [*instances, other]:
+        tracker.request_started(instance)
+        tracker.first_token_received(instance, 0.1)
+
+    await load_balancer.get_instance(instances[1:])
+
+    assert tracker.outstanding(instances[0]) == 0
+    assert tracker.ewma_ttft(instances[0]) is None
+    assert tracker.ewma_ttft(instances[1]) == 0.1
+    # Instances of other models are kept.
+    assert tracker.ewma_ttft(other) == 0.1
@@ -0,0 +1,136 @@
+import pytest
+
+from gpustack.http_proxy.multipart import MultipartForwarder
+
+BOUNDARY = "test-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def field_part(name: str, value: str) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+        f"{value}\r\n"
+    ).encode()
+
+
+def file_part(name: str, filename: str, content: bytes) -> bytes:
+    return (
+        (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        + content
+        + b"\r\n"
+    )
+
+
+def closing() -> bytes:
+    return f"--{BOUNDARY}--\r\n".encode()
+
+
+async def chunked(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+async def forward(forwarder: MultipartForwarder) -> bytes:
+    return b"".join([chunk async for chunk in forwarder.iter_body()])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+async def test_fields_before_file_are_parsed(chunk_size):
+    content = b"\x00\x01audio" * 1000
+    body = (
+        field_part("model", "whisper")
+        + field_part("stream", "true")
+        + file_part("file", "a.wav", content)
+        + closing()
+    )
+    forwarder = MultipartForwarder(chunked(body, chunk_size), CONTENT_TYPE)
+    await forwarder.parse()
+
+    assert forwarder.get("model") == "whisper"
+    assert forwarder.get("stream") == "true"
+    assert await forward(forwarder) == body
+
+
+@pytest.mark.asyncio
+async def test_file_after_model_is_not_buffered():
+    content = b"x" * (8 * 1024 * 1024)
+    body = field_part("model", "whisper") + file_part("file", "a.wav", content)
+    body += closing()
+    forwarder = MultipartForwarder(chunked(body, 64 * 1024), CONTENT_TYPE)
+    await forwarder.parse()
+
+    # Only the fields and the file part headers are read ahead.
+    assert len(forwarder._buffer) <= 64 * 1024
+    assert await forward(forwarder) == body
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [3, 4096])
+async def test_file_before_model_is_spooled_and_model_replaced(chunk_size):
+    content = b"image-bytes\r\n--not-a-boundary" * 100
+    body = (
+        file_part("image", "a.png", content)
+        + field_part("model", "sd")
+        + field_part("prompt", "a cat")
+        + closing()
+    )
+    forwarder = MultipartForwarder(chunked(body, chunk_size), CONTENT_TYPE)
+    await forwarder.parse()
+    assert forwarder.get("model") == "sd"
+
+    forwarder.set_field("model", "stable-diffusion")
+
+    expected = body.replace(
+        field_part("model", "sd"), field_part("model", "stable-diffusion")
+    )
+    assert await forward(forwarder) == expected
+
+
+@pytest.mark.asyncio
+async def test_field_after_file_is_parsed():
+    content = b"\x00\x01audio" * 1000
+    body = (
+        field_part("model", "whisper")
+        + file_part("file", "a.wav", content)
+        + field_part("stream", "true")
+        + closing()
+    )
+    forwarder = MultipartForwarder(
+        chunked(body, 4096), CONTENT_TYPE, required_fields=("model", "stream")
+    )
+    await forwarder.parse()
+
+    assert forwarder.get("stream") == "true"
+    assert await forward(forwarder) == body
+
+
+@pytest.mark.asyncio
+async def test_spooled_body_forwarded_without_incoming_stream():
+    content = b"x" * (2 * 1024 * 1024)
+    body = field_part("model", "whisper") + file_part("file", "a.wav", content)
+    body += closing()
+    incoming_open = True
+
+    async def stream():
+        async for chunk in chunked(body, 64 * 1024):
+            assert incoming_open
+            yield chunk
+
+    forwarder = MultipartForwarder(stream(), CONTENT_TYPE)
+    await forwarder.parse()
+    await forwarder.spool()
+    incoming_open = False
+
+    assert await forward(forwarder) == body
+
+
+@pytest.mark.asyncio
+async def test_missing_boundary():
+    with pytest.raises(ValueError):
+        MultipartForwarder(chunked(b"", 1), "multipart/form-data")
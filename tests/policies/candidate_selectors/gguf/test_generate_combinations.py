@@ -1,6 +1,13 @@
+import itertools
+import random
+import time
 from typing import Dict, Tuple
 import pytest
+from gpustack import envs
 from gpustack.policies.candidate_selectors import GGUFResourceFitSelector
+from gpustack.policies.candidate_selectors.gguf_resource_fit_selector import (
+    _vram_combinations,
+)
 
 from gpustack.schemas.models import (
     GPUSelector,
@@ -48,15 +55,16 @@ async def test_generate_combinations_for_single_worker_gpus():
             )
             actual_combinations_count[i] = combinations
 
-        expected_total = 247
+        # GPUs with the same allocatable vram are interchangeable.
+        expected_total = 7
         expected_combinations = {
             # key: gpu count, value: combinations number
-            2: 28,
-            3: 56,
-            4: 70,
-            5: 56,
-            6: 28,
-            7: 8,
+            2: 1,
+            3: 1,
+            4: 1,
+            5: 1,
+            6: 1,
+            7: 1,
             8: 1,
         }
 
@@ -179,17 +187,18 @@ async def test_generate_combinations_for_worker_with_rpc_servers_with_auto_selec
             resource_fit_selector._generate_combinations_for_worker_with_rpcs(workers)
         )
 
-        expected_total = 39202
+        # RPC servers with the same allocatable vram are interchangeable.
+        expected_total = 8
         expected_combinations = {
             # key: gpu count, value: combinations number
-            2: 16,
-            3: 120,
-            4: 560,
-            5: 1820,
-            6: 4368,
-            7: 8008,
-            8: 11440,
-            9: 12870,
+            2: 1,
+            3: 1,
+            4: 1,
+            5: 1,
+            6: 1,
+            7: 1,
+            8: 1,
+            9: 1,
         }
 
     compare_combinations(combinations, expected_combinations, expected_total)
@@ -202,9 +211,79 @@ def compare_combinations(
 ):
     actual_total = 0
     for e_gpu_count, e_comb_num in expected_combinations.items():
-        a_comb = combinations[e_gpu_count]
+        a_comb = list(combinations[e_gpu_count])
         actual_total += len(a_comb)
 
         assert len(a_comb) == e_comb_num
 
     assert actual_total == expected_total
+
+
+def test_vram_combinations_prune_and_dedupe():
+    gpus = [(0, 24), (1, 16), (2, 24), (3, 8)]
+
+    def combinations(count, at_least_vram=0):
+        return list(
+            _vram_combinations(
+                gpus,
+                count,
+                vram=lambda gpu: gpu[1],
+                identity=lambda gpu: gpu[1],
+                at_least_vram=at_least_vram,
+            )
+        )
+
+    assert combinations(2) == [
+        ((0, 24), (2, 24)),
+        ((0, 24), (1, 16)),
+        ((0, 24), (3, 8)),
+        ((1, 16), (3, 8)),
+    ]
+    assert combinations(2, at_least_vram=33) == [
+        ((0, 24), (2, 24)),
+        ((0, 24), (1, 16)),
+    ]
+    assert combinations(3, at_least_vram=100) == []
+
+
+def test_vram_combinations_match_exhaustive_search():
+    rng = random.Random(0)
+    for _ in range(50):
+        gpus = [(i, rng.choice([8, 16, 24, 48])) for i in range(rng.randint(1, 9))]
+        count = rng.randint(1, len(gpus))
+        at_least_vram = rng.randint(0, 150)
+
+        actual = [
+            sorted(gpu[1] for gpu in c)
+            for c in _vram_combinations(
+                gpus,
+                count,
+                vram=lambda gpu: gpu[1],
+                identity=lambda gpu: gpu[1],
+                at_least_vram=at_least_vram,
+            )
+        ]
+        expected = {
+            tuple(sorted(gpu[1] for gpu in c))
+            for c in itertools.combinations(gpus, count)
+            if sum(gpu[1] for gpu in c) >= at_least_vram
+        }
+
+        assert len(actual) == len(expected)
+        assert {tuple(vrams) for vrams in actual} == expected
+
+
+def test_search_budget():
+    m = new_model(1, "test", 1, "Meta-Llama-3-70B-Instruct-GGUF")
+    resource_fit_selector = GGUFResourceFitSelector(m, [])
+    resource_fit_selector._search_deadline = time.monotonic() + 60
+
+    with patch.object(envs, "SCHEDULER_GGUF_COMBINATION_SEARCH_MAX_COUNT", 3):
+        assert list(resource_fit_selector._within_search_budget(range(2))) == [0, 1]
+        assert list(resource_fit_selector._within_search_budget(range(2))) == [0]
+
+    assert len(resource_fit_selector._event_collector.events) == 1
+
+    resource_fit_selector._searched_combinations = 0
+    resource_fit_selector._search_deadline = time.monotonic() - 1
+    assert list(resource_fit_selector._within_search_budget(range(2))) == []
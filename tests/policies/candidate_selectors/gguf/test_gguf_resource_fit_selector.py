@@ -462,24 +462,10 @@ async def test_schedule_to_single_worker_multi_gpu_with_binpack_spread(config):
                 "score": 65.08312111378692,
                 "tensor_split": [17171480576, 16647192576, 16542334976],
             },
-            {
-                "offload_layers": 81,
-                "worker_id": 5,
-                "worker_name": "host-4-4080",
-                "gpu_indexes": [1, 2, 3],
-                "is_unified_memory": False,
-                "ram": 471942328,
-                "vram": {
-                    1: 16733447168,
-                    2: 15703068672,
-                    3: 15703068672,
-                },
-                "score": 65.08312111378692,
-                "tensor_split": [17171480576, 16647192576, 16542334976],
-            },
         ]
 
-        assert len(binpack_candidates) == 4
+        # [1, 2, 3] has the same VRAM as [0, 2, 3] and is not searched.
+        assert len(binpack_candidates) == 3
         assert binpack_candidate == binpack_candidates[2]
         compare_candidates(binpack_candidates, expected_candidates)
 
@@ -507,14 +493,9 @@ async def test_schedule_to_single_worker_multi_gpu_with_binpack_spread(config):
                 "score": 86.5,
                 "tensor_split": [17171480576, 16647192576, 16542334976],
             },
-            {
-                "gpu_indexes": [1, 2, 3],
-                "score": 86.5,
-                "tensor_split": [17171480576, 16647192576, 16542334976],
-            },
         ]
 
-        assert len(spread_candidates) == 4
+        assert len(spread_candidates) == 3
         assert spread_candidate == spread_candidates[0]
         compare_candidates(spread_candidates, expected_candidates)
 
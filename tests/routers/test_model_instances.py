@@ -0,0 +1,79 @@
+import asyncio
+import functools
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from gpustack.schemas.models import (
+    DistributedServers,
+    ModelInstance,
+    ModelInstanceSubordinateWorker,
+    SourceEnum,
+)
+from gpustack.server.bus import Event, EventType, event_bus
+from tests.utils.model import new_model_instance
+
+
+def new_instance(id, worker_id=None, subordinate_worker_ids=()):
+    instance = new_model_instance(id, f"test-{id}", 1, worker_id=worker_id)
+    instance.source = SourceEnum.HUGGING_FACE
+    instance.huggingface_repo_id = "Qwen/Qwen3-0.6B"
+    instance.created_at = instance.updated_at = datetime.now(timezone.utc)
+    if subordinate_worker_ids:
+        instance.distributed_servers = DistributedServers(
+            subordinate_workers=[
+                ModelInstanceSubordinateWorker(worker_id=worker_id)
+                for worker_id in subordinate_worker_ids
+            ]
+        )
+    return instance
+
+
+def test_is_assigned_to():
+    assert new_instance(1, worker_id=1).is_assigned_to(1)
+    assert new_instance(2, worker_id=2, subordinate_worker_ids=[1]).is_assigned_to(1)
+    assert not new_instance(3, worker_id=2, subordinate_worker_ids=[3]).is_assigned_to(
+        1
+    )
+    assert not new_instance(4).is_assigned_to(1)
+
+
+@pytest.mark.asyncio
+async def test_assigned_worker_watch():
+    topic = ModelInstance.__name__.lower()
+    stream = ModelInstance.streaming(
+        filter_func=functools.partial(ModelInstance.is_assigned_to, worker_id=1),
+        filter_keys=["worker_id", "distributed_servers"],
+        # Resume from the latest version to skip listing from the database.
+        resource_version=event_bus.topic_version(topic),
+    )
+    received = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+
+    main = new_instance(1, worker_id=1)
+    subordinate = new_instance(2, worker_id=2, subordinate_worker_ids=[1])
+    other = new_instance(3, worker_id=2)
+    moved = new_instance(1, worker_id=2)
+    for event in [
+        Event(type=EventType.UPDATED, data=main),
+        Event(type=EventType.UPDATED, data=other),
+        Event(type=EventType.UPDATED, data=subordinate),
+        Event(
+            type=EventType.UPDATED,
+            data=moved,
+            changed_fields={"worker_id": ([1], [2])},
+        ),
+    ]:
+        await event_bus.publish(topic, event)
+
+    events = [json.loads(await received)]
+    for _ in range(2):
+        events.append(json.loads(await stream.__anext__()))
+    await stream.aclose()
+
+    assert [(e["type"], e["data"]["id"]) for e in events] == [
+        (EventType.UPDATED.value, 1),
+        (EventType.UPDATED.value, 2),
+        (EventType.DELETED.value, 1),
+    ]
@@ -1,11 +1,30 @@
-from gpustack.routes.workers import update_worker_data
+from types import SimpleNamespace
+
+import pytest
+
+from gpustack.api.exceptions import ConflictException
+from gpustack.routes.workers import (
+    create_worker_status,
+    update_worker_data,
+    update_worker_status,
+)
 from gpustack.schemas.workers import (
+    GPUDeviceStatus,
+    MemoryInfo,
     Worker,
     WorkerCreate,
     WorkerStateEnum,
     WorkerStatus,
+    WorkerStatusPublic,
     Maintenance,
     SystemReserved,
+    diff_worker_status,
+    merge_worker_status,
+)
+from gpustack.server.worker_status_buffer import (
+    forget_worker_status,
+    heartbeat_flush_buffer,
+    worker_status_flush_buffer,
 )
 from gpustack.schemas.clusters import Cluster, ClusterProvider
 
@@ -183,3 +202,86 @@ def test_update_worker_data_preserves_labels_merge():
     assert updated_worker.labels["env"] == "prod"  # Updated
     assert updated_worker.labels["region"] == "us-west"  # Preserved
     assert updated_worker.labels["zone"] == "a"  # New
+
+
+def new_worker_status(gpu_memory_used: int, hostname="test-host") -> WorkerStatusPublic:
+    status = WorkerStatus.get_default_status()
+    status.gpu_devices = [
+        GPUDeviceStatus(
+            index=0,
+            name="NVIDIA A100",
+            memory=MemoryInfo(total=1000, used=gpu_memory_used, utilization_rate=50),
+        )
+    ]
+    return WorkerStatusPublic(
+        hostname=hostname,
+        ip="192.168.1.100",
+        ifname="eth0",
+        port=8080,
+        worker_uuid="test-uuid-123",
+        status=status,
+    )
+
+
+def test_diff_worker_status():
+    previous = new_worker_status(500).model_dump(mode="json")
+
+    # Within 1% of the total GPU memory.
+    current = new_worker_status(509).model_dump(mode="json")
+    assert diff_worker_status(previous, current, 0.01) == {}
+    assert diff_worker_status(previous, current) == {
+        "status": {"gpu_devices": current["status"]["gpu_devices"]}
+    }
+
+    current = new_worker_status(520, hostname="new-host").model_dump(mode="json")
+    delta = diff_worker_status(previous, current, 0.01)
+    assert delta == {
+        "hostname": "new-host",
+        "status": {"gpu_devices": current["status"]["gpu_devices"]},
+    }
+    assert merge_worker_status(previous, delta) == current
+
+
+@pytest.mark.asyncio
+async def test_worker_status_delta():
+    worker_id = 1001
+    user = SimpleNamespace(worker=SimpleNamespace(id=worker_id))
+    forget_worker_status(worker_id)
+
+    with pytest.raises(ConflictException):
+        await update_worker_status(user, {})
+
+    report = new_worker_status(500).model_dump(mode="json")
+    try:
+        await create_worker_status(
+            user, WorkerStatusPublic.model_validate(report), digest="a"
+        )
+        assert worker_status_flush_buffer.pop(worker_id)["hostname"] == "test-host"
+
+        # No-op reports only refresh the heartbeat.
+        await update_worker_status(user, {}, baseline="a", digest="a")
+        await create_worker_status(
+            user, WorkerStatusPublic.model_validate(report), digest="a"
+        )
+        assert worker_id not in worker_status_flush_buffer
+        assert worker_id in heartbeat_flush_buffer
+
+        await update_worker_status(
+            user, {"hostname": "new-host"}, baseline="a", digest="b"
+        )
+        input_dict = worker_status_flush_buffer.pop(worker_id)
+        assert input_dict["hostname"] == "new-host"
+        assert input_dict["status"]["gpu_devices"][0]["memory"]["used"] == 500
+
+        # Deltas based on reports this server did not receive are refused.
+        with pytest.raises(ConflictException):
+            await update_worker_status(
+                user, {"hostname": "other-host"}, baseline="c", digest="d"
+            )
+        with pytest.raises(ConflictException):
+            await update_worker_status(user, {"hostname": "other-host"})
+        assert worker_id not in worker_status_flush_buffer
+    finally:
+        forget_worker_status(worker_id)
+        worker_status_flush_buffer.pop(worker_id, None)
+        heartbeat_flush_buffer.discard(worker_id)
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+
+from gpustack.policies.utils import (
+    get_worker_allocatable_resource,
+    get_worker_model_instances,
+)
+from gpustack.scheduler.allocation_index import AllocationIndex
+from gpustack.schemas.models import (
+    ComputedResourceClaim,
+    DistributedServers,
+    ModelInstanceStateEnum,
+    ModelInstanceSubordinateWorker,
+)
+from tests.fixtures.workers.fixtures import (
+    linux_mix_1_nvidia_4080_16gx1_rocm_7800_16gx1,
+    linux_nvidia_1_4090_24gx1,
+)
+from tests.utils.model import new_model_instance
+
+GiB = 1024**3
+
+
+def new_instances():
+    mix = linux_mix_1_nvidia_4080_16gx1_rocm_7800_16gx1()
+    nvidia = linux_nvidia_1_4090_24gx1()
+
+    cuda = new_model_instance(
+        1,
+        "cuda",
+        1,
+        worker_id=mix.id,
+        state=ModelInstanceStateEnum.RUNNING,
+        gpu_indexes=[0],
+        computed_resource_claim=ComputedResourceClaim(ram=GiB, vram={0: 4 * GiB}),
+    )
+    cuda.gpu_type = "cuda"
+
+    untyped = new_model_instance(
+        2,
+        "untyped",
+        1,
+        worker_id=mix.id,
+        state=ModelInstanceStateEnum.RUNNING,
+        gpu_indexes=[0],
+        computed_resource_claim=ComputedResourceClaim(ram=GiB, vram={0: 2 * GiB}),
+    )
+
+    distributed = new_model_instance(
+        3,
+        "distributed",
+        2,
+        worker_id=nvidia.id,
+        state=ModelInstanceStateEnum.RUNNING,
+        gpu_indexes=[0],
+        computed_resource_claim=ComputedResourceClaim(ram=GiB, vram={0: 8 * GiB}),
+    )
+    distributed.gpu_type = "rocm"
+    distributed.distributed_servers = DistributedServers(
+        subordinate_workers=[
+            ModelInstanceSubordinateWorker(
+                worker_id=mix.id,
+                computed_resource_claim=ComputedResourceClaim(
+                    ram=GiB, vram={0: 3 * GiB}
+                ),
+            )
+        ]
+    )
+
+    cpu = new_model_instance(
+        4,
+        "cpu",
+        3,
+        worker_id=nvidia.id,
+        state=ModelInstanceStateEnum.RUNNING,
+        computed_resource_claim=ComputedResourceClaim(ram=2 * GiB, vram={}),
+    )
+
+    # Subordinate workers without a resource claim still run the instance.
+    unclaimed = new_model_instance(
+        5,
+        "unclaimed",
+        4,
+        worker_id=nvidia.id,
+        computed_resource_claim=ComputedResourceClaim(ram=GiB, vram={}),
+    )
+    unclaimed.distributed_servers = DistributedServers(
+        subordinate_workers=[ModelInstanceSubordinateWorker(worker_id=mix.id)]
+    )
+
+    return [mix, nvidia], [cuda, untyped, distributed, cpu, unclaimed]
+
+
+def new_index(workers, instances) -> AllocationIndex:
+    index = AllocationIndex()
+    for worker in workers:
+        index.upsert_worker(worker)
+    for instance in instances:
+        index.upsert(instance)
+    return index
+
+
+def assert_same_allocatable(index, workers, instances):
+    for worker in workers:
+        for gpu_type in (None, "cuda", "rocm"):
+            assert get_worker_allocatable_resource(
+                index, worker, gpu_type
+            ) == get_worker_allocatable_resource(instances, worker, gpu_type)
+        assert [i.id for i in get_worker_model_instances(index, worker)] == [
+            i.id for i in get_worker_model_instances(instances, worker)
+        ]
+
+
+def test_index_matches_instance_list():
+    workers, instances = new_instances()
+    index = new_index(workers, instances)
+
+    assert len(index) == len(instances)
+    assert_same_allocatable(index, workers, instances)
+
+
+def test_index_applies_updates_and_removals():
+    workers, instances = new_instances()
+    index = new_index(workers, instances)
+
+    moved = instances[0].model_copy(deep=True)
+    moved.worker_id = workers[1].id
+    moved.updated_at = datetime(2025, 1, 1)
+    index.upsert(moved)
+    instances[0] = moved
+    assert_same_allocatable(index, workers, instances)
+
+    index.remove(instances[2].id)
+    del instances[2]
+    assert_same_allocatable(index, workers, instances)
+
+
+def test_stale_updates_are_ignored():
+    workers, instances = new_instances()
+    index = new_index(workers, instances)
+
+    scheduled = instances[3].model_copy(deep=True)
+    scheduled.updated_at = datetime(2025, 1, 1)
+    index.upsert(scheduled)
+
+    stale = instances[3].model_copy(deep=True)
+    stale.worker_id = None
+    stale.updated_at = scheduled.updated_at - timedelta(seconds=1)
+    index.upsert(stale)
+
+    assert index.allocated(workers[1].id).ram == 4 * GiB
+
+
+def test_workers_are_copies():
+    workers, instances = new_instances()
+    index = new_index(workers, instances)
+
+    for worker in index.workers():
+        worker.status.gpu_devices = []
+
+    assert all(w.status.gpu_devices for w in index.workers())
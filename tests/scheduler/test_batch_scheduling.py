@@ -0,0 +1,95 @@
+import pytest
+
+from gpustack import envs
+from gpustack.config.config import Config
+from gpustack.policies.worker_filters.backend_framework_filter import (
+    BackendFrameworkFilter,
+)
+from gpustack.scheduler.allocation_index import AllocationIndex
+from gpustack.scheduler.queue import AsyncUniqueQueue
+from gpustack.scheduler.scheduler import place_instances
+from gpustack.schemas.models import BackendEnum, ModelInstanceStateEnum
+from tests.fixtures.workers.fixtures import linux_nvidia_4_4080_16gx4
+from tests.utils.model import new_model, new_model_instance
+
+GiB = 1024**3
+
+
+@pytest.fixture(autouse=True)
+def offline_scheduling(monkeypatch):
+    async def passthrough(self, workers):
+        return workers, []
+
+    monkeypatch.setattr(BackendFrameworkFilter, "filter", passthrough)
+    monkeypatch.setattr(envs, "SCHEDULER_SCALE_UP_LOCALITY_MAX_SCORE", 0)
+
+
+@pytest.mark.asyncio
+async def test_get_batch_takes_queued_items():
+    queue = AsyncUniqueQueue()
+    for i in range(5):
+        await queue.put(i)
+
+    assert await queue.get_batch(3) == [0, 1, 2]
+    assert await queue.get_batch(3) == [3, 4]
+
+    await queue.put(0)
+    assert queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_place_instances_does_not_overlap(config: Config):
+    worker = linux_nvidia_4_4080_16gx4()
+    model = new_model(
+        1,
+        "test",
+        replicas=5,
+        huggingface_repo_id="Qwen/Qwen3-0.6B",
+        backend=BackendEnum.CUSTOM,
+        env={"GPUSTACK_MODEL_VRAM_CLAIM": str(10 * GiB)},
+    )
+    pending = [
+        new_model_instance(i, f"test-{i}", 1, state=ModelInstanceStateEnum.ANALYZING)
+        for i in range(1, 6)
+    ]
+
+    index = AllocationIndex()
+    index.upsert_worker(worker)
+    for instance in pending:
+        index.upsert(instance)
+
+    results = await place_instances(config, model, pending, index)
+
+    assert all(candidate is not None for candidate, _, _ in results)
+    assert all(i.state == ModelInstanceStateEnum.SCHEDULED for i in pending)
+    assert len(index.worker_instances(worker.id)) == 5
+
+    allocated = index.allocated(worker.id)
+    for gpu in worker.status.gpu_devices:
+        assert allocated.vram[gpu.index] <= gpu.memory.total
+
+
+@pytest.mark.asyncio
+async def test_place_instances_sees_earlier_placements(config: Config):
+    worker = linux_nvidia_4_4080_16gx4()
+    model = new_model(
+        1,
+        "test",
+        replicas=2,
+        huggingface_repo_id="Qwen/Qwen3-0.6B",
+        backend=BackendEnum.CUSTOM,
+        env={"GPUSTACK_MODEL_VRAM_CLAIM": str(40 * GiB)},
+    )
+    pending = [
+        new_model_instance(i, f"test-{i}", 1, state=ModelInstanceStateEnum.ANALYZING)
+        for i in range(1, 3)
+    ]
+
+    index = AllocationIndex()
+    index.upsert_worker(worker)
+
+    await place_instances(config, model, pending, index)
+
+    # The first replica takes all GPUs, the second one falls back to CPU.
+    assert pending[0].gpu_indexes == [0, 1, 2, 3]
+    assert not pending[1].gpu_indexes
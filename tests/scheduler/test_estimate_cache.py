@@ -0,0 +1,149 @@
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from gpustack.scheduler import calculator
+from gpustack.scheduler.calculator import (
+    GPUOffloadEnum,
+    ModelResourceClaim,
+    _get_empty_estimate,
+    calculate_gguf_model_resource_claim,
+)
+from gpustack.scheduler.estimate_cache import EstimateCache
+from gpustack.scheduler.evaluator import make_hashable_key
+from gpustack.schemas.model_evaluations import ModelSpec
+from gpustack.schemas.models import SourceEnum
+from tests.fixtures.workers.fixtures import linux_nvidia_1_4090_24gx1
+from tests.utils.model import new_model
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_once():
+    cache = EstimateCache("test", max_size=2, ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(
+        *[cache.get_or_compute("key", compute) for _ in range(3)]
+    )
+    results.append(await cache.get_or_compute("key", compute))
+
+    assert results == ["value"] * 4
+    assert len(calls) == 1
+    assert cache.hits == 1
+    assert cache.hit_rate == 0.25
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_evicted():
+    cache = EstimateCache("test", max_size=2, ttl=60)
+    for key in ["a", "b"]:
+        await cache.put(key, key)
+    await cache.get("a")
+    await cache.put("c", "c")
+
+    assert await cache.get("a") == "a"
+    assert await cache.get("b") is None
+    assert await cache.get("c") == "c"
+
+
+@pytest.mark.asyncio
+async def test_none_and_errors_not_cached():
+    cache = EstimateCache("test", max_size=2, ttl=60)
+
+    assert await cache.get_or_compute("key", AsyncMock(return_value=None)) is None
+    with pytest.raises(ValueError):
+        await cache.get_or_compute("key", AsyncMock(side_effect=ValueError()))
+    assert await cache.get_or_compute("key", AsyncMock(return_value=1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_persisted_under_cache_dir(tmp_path):
+    cache_dir = str(tmp_path)
+
+    def new_cache(ttl=60):
+        return EstimateCache(
+            "test", max_size=2, ttl=ttl, dumps=lambda v: v, loads=lambda v: v
+        )
+
+    await new_cache().put(("model", 1), {"ram": 1}, cache_dir)
+    assert await new_cache().get(("model", 1), cache_dir) == {"ram": 1}
+    assert await new_cache().get(("model", 1)) is None
+
+    for i in range(3):
+        await new_cache().put(i, i, cache_dir)
+    assert len(os.listdir(tmp_path / "estimates" / "test")) == 2
+
+    await new_cache(ttl=0).put("expired", 1, cache_dir)
+    time.sleep(0.01)
+    assert await new_cache().get("expired", cache_dir) is None
+
+
+@pytest.mark.asyncio
+async def test_gguf_claim_cached_across_decisions(tmp_path):
+    model = new_model(1, "test", huggingface_repo_id="Qwen/Qwen2.5-7B-Instruct-GGUF")
+    e, a = _get_empty_estimate(n_gpu=2)
+    calculate = AsyncMock(
+        return_value=ModelResourceClaim(
+            model=model, resource_claim_estimate=e, resource_architecture=a
+        )
+    )
+    calculator.gguf_estimate_cache.clear()
+
+    with patch.object(calculator, "_calculate_gguf_model_resource_claim", calculate):
+        gib = 1024**3
+        for tensor_split in [[16 * gib, 8 * gib], [16 * gib + 1, 8 * gib]]:
+            claim = await calculate_gguf_model_resource_claim(
+                model,
+                GPUOffloadEnum.Partial,
+                tensor_split=tensor_split,
+                rpc=[f"worker-{len(tensor_split)}:50052"],
+                cache_dir=str(tmp_path),
+            )
+            assert claim.model is model
+            assert claim.resource_claim_estimate == e
+
+        # Placements with the same split in MiB share the estimate.
+        assert calculate.await_count == 1
+
+        # Estimates are reused after a restart.
+        calculator.gguf_estimate_cache.clear()
+        await calculate_gguf_model_resource_claim(
+            model,
+            GPUOffloadEnum.Partial,
+            tensor_split=[16 * gib, 8 * gib],
+            rpc=["other:50052"],
+            cache_dir=str(tmp_path),
+        )
+        assert calculate.await_count == 1
+
+        await calculate_gguf_model_resource_claim(
+            model, GPUOffloadEnum.Partial, tensor_split=[8 * gib, 8 * gib]
+        )
+        assert calculate.await_count == 2
+
+    calculator.gguf_estimate_cache.clear()
+
+
+def test_evaluation_key_ignores_heartbeat_fields():
+    model = ModelSpec(
+        source=SourceEnum.HUGGING_FACE, huggingface_repo_id="Qwen/Qwen3-0.6B"
+    )
+    worker = linux_nvidia_1_4090_24gx1()
+    key = make_hashable_key(model, [worker])
+
+    worker.status.gpu_devices[0].memory.utilization_rate = 99
+    worker.status.gpu_devices[0].temperature = 80
+    worker.status.gpu_devices[0].memory.used = 1
+    worker.state_message = "heartbeat"
+    assert make_hashable_key(model, [worker]) == key
+
+    worker.status.gpu_devices[0].memory.allocated = 1024
+    assert make_hashable_key(model, [worker]) != key
@@ -0,0 +1,169 @@
+import struct
+
+import pytest
+
+from gpustack.scheduler.calculator import (
+    GGUFParserCommandMutableParameters,
+    GPUOffloadEnum,
+)
+from gpustack.scheduler.gguf_estimator import (
+    GGUFEstimator,
+    UnsupportedGGUFError,
+    load_local_gguf_table,
+)
+from gpustack.utils.gguf import (
+    GGUFHeaderTruncated,
+    GGUFSkippedArray,
+    gguf_split_paths,
+    parse_gguf_header,
+    read_gguf_header,
+)
+
+F32, Q4_0 = 0, 2
+
+
+def _string(value: str) -> bytes:
+    data = value.encode()
+    return struct.pack("<Q", len(data)) + data
+
+
+def _value(value) -> bytes:
+    if isinstance(value, str):
+        return struct.pack("<I", 8) + _string(value)
+    if isinstance(value, list):
+        if isinstance(value[0], str):
+            items = b"".join(_string(v) for v in value)
+            return struct.pack("<IIQ", 9, 8, len(value)) + items
+        items = b"".join(struct.pack("<I", v) for v in value)
+        return struct.pack("<IIQ", 9, 4, len(value)) + items
+    return struct.pack("<II", 4, value)
+
+
+def write_gguf(path, metadata, tensors):
+    data = b"GGUF" + struct.pack("<IQQ", 3, len(tensors), len(metadata))
+    for key, value in metadata.items():
+        data += _string(key) + _value(value)
+    for offset, (name, dims, type) in enumerate(tensors):
+        data += _string(name) + struct.pack("<I", len(dims))
+        data += b"".join(struct.pack("<Q", d) for d in dims)
+        data += struct.pack("<IQ", type, offset)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def write_llama(path, n_layer=80, n_embd=256, vocab=1024, **metadata):
+    tensors = [("token_embd.weight", (n_embd, vocab), Q4_0)]
+    for i in range(n_layer):
+        tensors += [
+            (f"blk.{i}.attn_norm.weight", (n_embd,), F32),
+            (f"blk.{i}.attn_q.weight", (n_embd, n_embd), Q4_0),
+            (f"blk.{i}.attn_k.weight", (n_embd, n_embd // 4), Q4_0),
+            (f"blk.{i}.attn_v.weight", (n_embd, n_embd // 4), Q4_0),
+            (f"blk.{i}.attn_output.weight", (n_embd, n_embd), Q4_0),
+            (f"blk.{i}.ffn_up.weight", (n_embd, n_embd * 4), Q4_0),
+            (f"blk.{i}.ffn_down.weight", (n_embd * 4, n_embd), Q4_0),
+        ]
+    tensors += [("output.weight", (n_embd, vocab), Q4_0)]
+    write_gguf(
+        path,
+        {
+            "general.architecture": "llama",
+            "llama.block_count": n_layer,
+            "llama.context_length": 8192,
+            "llama.embedding_length": n_embd,
+            "llama.feed_forward_length": n_embd * 4,
+            "llama.attention.head_count": 8,
+            "llama.attention.head_count_kv": 2,
+            "tokenizer.ggml.tokens": [f"t{i}" for i in range(vocab)],
+            **metadata,
+        },
+        tensors,
+    )
+
+
+def test_parse_header(tmp_path):
+    path = str(tmp_path / "model.gguf")
+    write_llama(path, n_layer=2, vocab=2048)
+
+    header = read_gguf_header(path)
+
+    assert header.version == 3
+    assert header.metadata["llama.block_count"] == 2
+    assert header.metadata["tokenizer.ggml.tokens"] == GGUFSkippedArray(2048)
+    assert header.tensors[0].name == "token_embd.weight"
+    assert header.tensors[0].nbytes == 256 * 2048 // 32 * 18
+    assert header.tensors[1].nbytes == 256 * 4
+
+    with open(path, "rb") as f:
+        data = f.read()
+    assert parse_gguf_header(data + b"\0" * 64).digest == header.digest
+    with pytest.raises(GGUFHeaderTruncated):
+        parse_gguf_header(data[:-1])
+
+
+def test_split_paths():
+    assert gguf_split_paths("/m/model-00002-of-00003.gguf") == [
+        "/m/model-00001-of-00003.gguf",
+        "/m/model-00002-of-00003.gguf",
+        "/m/model-00003-of-00003.gguf",
+    ]
+    assert gguf_split_paths("/m/model.gguf") == ["/m/model.gguf"]
+
+
+def test_table_cached_by_digest(tmp_path):
+    path = str(tmp_path / "model.gguf")
+    copy_path = str(tmp_path / "copy.gguf")
+    write_llama(path)
+    write_llama(copy_path)
+
+    table = load_local_gguf_table(path)
+
+    assert table.architecture == "llama"
+    assert table.block_count == 80
+    assert table.vocab_size == 1024
+    assert load_local_gguf_table(copy_path) is table
+
+
+def test_split_layers(tmp_path):
+    # Layer assignment of llama3_70b_partial_offload_split_2_4080.json.
+    path = str(tmp_path / "model.gguf")
+    write_llama(path)
+    estimator = GGUFEstimator(
+        load_local_gguf_table(path), GGUFParserCommandMutableParameters()
+    )
+
+    estimate = estimator.estimate(GPUOffloadEnum.Partial, tensor_split=[1, 1])
+
+    assert len(estimate.items) == 82
+    layers = {
+        item.offloadLayers: [vram.handleLayers for vram in item.vrams]
+        for item in estimate.items
+    }
+    assert layers[0] == [0, 0]
+    assert layers[40] == [20, 20]
+    assert layers[80] == [40, 40]
+    assert layers[81] == [41, 39]
+    assert estimate.items[81].fullOffloaded
+    assert estimate.items[81].ram.handleLayers == 0
+
+    full = estimator.estimate(GPUOffloadEnum.Full, tensor_split=[1, 1])
+    assert full.items == estimate.items[81:]
+
+
+def test_unsupported(tmp_path):
+    path = str(tmp_path / "model.gguf")
+    write_llama(path, n_layer=2, **{"mamba.ssm.state_size": 16})
+    with pytest.raises(UnsupportedGGUFError):
+        load_local_gguf_table(path)
+
+    write_llama(path, n_layer=2)
+    with pytest.raises(UnsupportedGGUFError):
+        GGUFEstimator(
+            load_local_gguf_table(path),
+            GGUFParserCommandMutableParameters(split_mode="row"),
+        )
+    with pytest.raises(UnsupportedGGUFError):
+        GGUFEstimator(
+            load_local_gguf_table(path),
+            GGUFParserCommandMutableParameters(parallel_size=1),
+        )
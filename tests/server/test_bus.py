@@ -0,0 +1,186 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from gpustack.server.bus import (
+    Event,
+    EventBus,
+    EventType,
+    OverflowPolicy,
+    Subscriber,
+    SubscriberDisconnectedError,
+)
+
+
+def obj(id, value=0):
+    return {"id": id, "value": value}
+
+
+async def drain(subscriber: Subscriber):
+    events = []
+    while subscriber.queue:
+        events.append(await subscriber.receive())
+    return [(e.type, e.data) for e in events]
+
+
+@pytest.mark.asyncio
+async def test_updated_events_are_squashed():
+    subscriber = Subscriber("test")
+    subscriber.enqueue(Event(type=EventType.UPDATED, data=obj(1, 1)))
+    subscriber.enqueue(Event(type=EventType.UPDATED, data=obj(1, 2)))
+
+    assert await drain(subscriber) == [(EventType.UPDATED, obj(1, 2))]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest():
+    subscriber = Subscriber(
+        "test", maxsize=2, overflow_policy=OverflowPolicy.DROP_OLDEST
+    )
+    for i in range(3):
+        subscriber.enqueue(Event(type=EventType.CREATED, data=obj(i)))
+
+    assert await drain(subscriber) == [
+        (EventType.CREATED, obj(1)),
+        (EventType.CREATED, obj(2)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_events_of_the_same_object():
+    subscriber = Subscriber("test", maxsize=4, overflow_policy=OverflowPolicy.COALESCE)
+    subscriber.enqueue(Event(type=EventType.CREATED, data=obj(1)))
+    subscriber.enqueue(Event(type=EventType.UPDATED, data=obj(2, 1)))
+    subscriber.enqueue(Event(type=EventType.UPDATED, data=obj(1, 1)))
+    subscriber.enqueue(Event(type=EventType.CREATED, data=obj(3)))
+    subscriber.enqueue(Event(type=EventType.DELETED, data=obj(3)))
+    subscriber.enqueue(Event(type=EventType.DELETED, data=obj(2)))
+
+    # Merging happens when the queue is full, before the new event is queued.
+    assert await drain(subscriber) == [
+        (EventType.CREATED, obj(1, 1)),
+        (EventType.UPDATED, obj(2, 1)),
+        (EventType.DELETED, obj(2)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_never_drops_events():
+    subscriber = Subscriber("test", maxsize=4, overflow_policy=OverflowPolicy.COALESCE)
+    for i in range(8):
+        subscriber.enqueue(Event(type=EventType.DELETED, data=obj(i)))
+
+    assert [data["id"] for _, data in await drain(subscriber)] == list(range(8))
+
+
+@pytest.mark.asyncio
+async def test_disconnect():
+    subscriber = Subscriber(
+        "test", maxsize=1, overflow_policy=OverflowPolicy.DISCONNECT
+    )
+    subscriber.enqueue(Event(type=EventType.CREATED, data=obj(1)))
+    subscriber.enqueue(Event(type=EventType.CREATED, data=obj(2)))
+
+    assert subscriber.disconnected
+    with pytest.raises(SubscriberDisconnectedError):
+        await subscriber.receive()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_does_not_block_publish():
+    bus = EventBus(maxsize=2)
+    slow = bus.subscribe("test", OverflowPolicy.DISCONNECT)
+    fast = bus.subscribe("test")
+
+    received = []
+
+    async def consume():
+        while len(received) < 10:
+            received.append(await fast.receive())
+
+    consumer = asyncio.create_task(consume())
+    for i in range(10):
+        await asyncio.wait_for(
+            bus.publish("test", Event(type=EventType.CREATED, data=obj(i))), 1
+        )
+        await asyncio.sleep(0)
+    await asyncio.wait_for(consumer, 1)
+
+    assert [e.data["id"] for e in received] == list(range(10))
+    assert slow.disconnected
+
+    bus.unsubscribe("test", slow)
+    bus.unsubscribe("test", fast)
+    assert "test" not in bus.subscribers
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_encoded_events():
+    bus = EventBus()
+    subscribers = [bus.subscribe("test") for _ in range(3)]
+    await bus.publish("test", Event(type=EventType.CREATED, data=obj(1)))
+
+    calls = []
+
+    def encoder(event: Event) -> bytes:
+        calls.append(event)
+        return json.dumps(jsonable_encoder(event)).encode()
+
+    encoded = [(await s.receive()).encode("public", encoder) for s in subscribers]
+
+    assert len(calls) == 1
+    assert encoded[0] is encoded[1] is encoded[2]
+    assert json.loads(encoded[0]) == {
+        "type": EventType.CREATED.value,
+        "data": obj(1),
+        "changed_fields": {},
+        "id": None,
+        "resource_version": bus.resource_version,
+    }
+
+
+@pytest.mark.asyncio
+async def test_events_since_resource_version():
+    bus = EventBus()
+    for i in range(3):
+        await bus.publish("test", Event(type=EventType.UPDATED, data=obj(i)))
+
+    versions = [e.resource_version for e in bus.history["test"]]
+    assert versions == sorted(set(versions))
+    assert bus.topic_version("test") == versions[-1]
+
+    assert bus.events_since("test", bus._initial_version) == list(bus.history["test"])
+    assert [e.data for e in bus.events_since("test", versions[0])] == [
+        obj(1),
+        obj(2),
+    ]
+    assert bus.events_since("test", versions[-1]) == []
+    # Versions not handed out by this bus can't be resumed from.
+    assert bus.events_since("test", versions[-1] + 1) is None
+    assert bus.events_since("test", 0) is None
+
+
+@pytest.mark.asyncio
+async def test_events_since_evicted_resource_version():
+    bus = EventBus(history_size=2)
+    for i in range(3):
+        await bus.publish("test", Event(type=EventType.UPDATED, data=obj(i)))
+
+    assert bus.events_since("test", bus._initial_version) is None
+    evicted = bus._history_start["test"]
+    assert [e.data for e in bus.events_since("test", evicted)] == [obj(1), obj(2)]
+
+
+@pytest.mark.asyncio
+async def test_updated_events_are_not_squashed_when_disabled():
+    bus = EventBus()
+    subscriber = bus.subscribe("test", OverflowPolicy.DISCONNECT, squash=False)
+    await bus.publish("test", Event(type=EventType.UPDATED, data=obj(1, 1)))
+    await bus.publish("test", Event(type=EventType.UPDATED, data=obj(1, 2)))
+
+    assert await drain(subscriber) == [
+        (EventType.UPDATED, obj(1, 1)),
+        (EventType.UPDATED, obj(1, 2)),
+    ]
@@ -0,0 +1,164 @@
+import pytest
+
+from gpustack.logging import setup_logging
+
+from gpustack.schemas.models import Model, ModelInstanceStateEnum
+from gpustack.server.bus import Event, EventBus, EventType
+from gpustack.server.bus_backends import PostgresEventBusBackend
+from gpustack.server.cache import build_cache_key, cache
+from gpustack.server.services import ModelInstanceService, ModelService
+from tests.utils.model import new_model, new_model_instance
+
+setup_logging()
+
+
+@pytest.fixture(autouse=True)
+def invalidated(monkeypatch):
+    classes = []
+
+    async def invalidate_cached_all(cls):
+        classes.append(cls)
+
+    monkeypatch.setattr(
+        Model, "_invalidate_cached_all", classmethod(invalidate_cached_all)
+    )
+    return classes
+
+
+def new_backend(bus: EventBus) -> PostgresEventBusBackend:
+    return PostgresEventBusBackend(bus, "postgresql://localhost/gpustack")
+
+
+async def deliver(sender, receiver, events):
+    for payload in sender.encode(events):
+        assert len(payload.encode("utf-8")) < 8000
+        receiver.receive(payload)
+    while not receiver._inbox.empty():
+        await receiver.dispatch(receiver._inbox.get_nowait())
+
+
+@pytest.mark.asyncio
+async def test_events_are_shared_with_other_replicas(invalidated):
+    sender = new_backend(EventBus())
+    bus = EventBus()
+    receiver = new_backend(bus)
+    subscriber = bus.subscribe("model")
+
+    model = new_model(1, "qwen", huggingface_repo_id="Qwen/Qwen3-0.6B")
+    await deliver(
+        sender,
+        receiver,
+        [
+            ("model", Event(type=EventType.CREATED, data=model)),
+            (
+                "model",
+                Event(
+                    type=EventType.UPDATED,
+                    data=model,
+                    changed_fields={"replicas": (1, 2)},
+                ),
+            ),
+        ],
+    )
+
+    created = await subscriber.receive()
+    updated = await subscriber.receive()
+    assert created.type == EventType.CREATED
+    assert isinstance(created.data, Model)
+    assert created.data.name == "qwen"
+    assert updated.type == EventType.UPDATED
+    assert updated.id == 1
+    assert updated.changed_fields == {"replicas": (1, 2)}
+    assert invalidated == [Model]
+
+
+@pytest.mark.asyncio
+async def test_service_caches_are_cleared_for_remote_events():
+    sender = new_backend(EventBus())
+    receiver = new_backend(EventBus())
+
+    keys = [
+        build_cache_key(ModelService.get_by_id, 1),
+        build_cache_key(ModelService.get_by_name, "qwen"),
+        build_cache_key(ModelService.get_by_name, "qwen3"),
+        build_cache_key(ModelInstanceService.get_running_instances, 1),
+    ]
+    for key in keys:
+        await cache.set(key, "stale")
+
+    model = new_model(1, "qwen3", huggingface_repo_id="Qwen/Qwen3-0.6B")
+    instance = new_model_instance(1, "qwen3-1", 1)
+    instance.source = model.source
+    instance.huggingface_repo_id = model.huggingface_repo_id
+    await deliver(
+        sender,
+        receiver,
+        [
+            (
+                "model",
+                Event(
+                    type=EventType.UPDATED,
+                    data=model,
+                    changed_fields={"name": ("qwen", "qwen3")},
+                ),
+            ),
+            ("modelinstance", Event(type=EventType.CREATED, data=instance)),
+        ],
+    )
+
+    for key in keys:
+        assert await cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_large_commits_are_split_into_pieces():
+    sender = new_backend(EventBus())
+    bus = EventBus()
+    receiver = new_backend(bus)
+    subscriber = bus.subscribe("model")
+
+    events = [
+        (
+            "model",
+            Event(
+                type=EventType.CREATED,
+                data=new_model(
+                    i,
+                    f"model-{i}",
+                    huggingface_repo_id="Qwen/Qwen3-0.6B",
+                    description="\"quoted\" " * 100,
+                ),
+            ),
+        )
+        for i in range(50)
+    ]
+    assert len(sender.encode(events)) > 1
+
+    await deliver(sender, receiver, events)
+
+    received = [(await subscriber.receive()).data.name for _ in range(50)]
+    assert received == [f"model-{i}" for i in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_own_notifications_are_skipped():
+    bus = EventBus()
+    backend = new_backend(bus)
+    subscriber = bus.subscribe("model")
+
+    model = new_model(1, "qwen", huggingface_repo_id="Qwen/Qwen3-0.6B")
+    await deliver(backend, backend, [("model", Event(EventType.CREATED, model))])
+
+    assert not subscriber.queue
+
+
+def test_unknown_topic_is_skipped():
+    backend = new_backend(EventBus())
+    record = {
+        "t": "unknown",
+        "y": "UPDATED",
+        "i": 1,
+        "d": {"state": ModelInstanceStateEnum.RUNNING},
+        "c": {},
+    }
+    assert backend._decode(record) is None
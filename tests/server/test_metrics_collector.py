@@ -1,4 +1,8 @@
-from gpustack.server.metrics_collector import parse_token_metrics, ModelUsageMetrics
+from gpustack.server.metrics_collector import (
+    TokenMetricsParser,
+    parse_token_metrics,
+    ModelUsageMetrics,
+)
 
 # Example Prometheus metrics text
 METRICS_TEXT = '''
@@ -69,3 +73,39 @@ route_upstream_model_consumer_metric_llm_duration_count{ai_route="ai-route-model
     assert m3.request_count == 7
     assert m3.user_id == 4
     assert m3.access_key == "xyz123"
+
+
+def test_token_metrics_parser_chunks():
+    metrics_text = (
+        """# HELP envoy_cluster_upstream_rq_total Total requests.
+# TYPE envoy_cluster_upstream_rq_total counter
+envoy_cluster_upstream_rq_total{envoy_cluster_name="outbound|80||model-1-1.static"} 42
+# TYPE route_upstream_model_consumer_metric_llm_service_duration counter
+route_upstream_model_consumer_metric_llm_service_duration{ai_route="ai-route-model-1",ai_cluster="outbound|80||model-1-1.static",ai_model="qwen3-0.6b",ai_consumer="d720eeb5b57fbe94.gpustack-2"} 9279
+# TYPE route_upstream_model_consumer_metric_input_token counter
+route_upstream_model_consumer_metric_input_token_total{ai_route="a,}\\"b",ai_cluster="outbound|80||provider-3.dns",ai_model="gpt-4o",ai_consumer="none"} 7
+"""
+        + METRICS_TEXT.strip()
+    ).encode()
+
+    for chunk_size in [1, 7, 64, len(metrics_text)]:
+        parser = TokenMetricsParser()
+        for i in range(0, len(metrics_text), chunk_size):
+            parser.feed(metrics_text[i : i + chunk_size])
+        result = parser.close()
+
+        assert len(result) == 2
+        by_model = {m.model: m for m in result.values()}
+        assert by_model["qwen3-0.6b"] == ModelUsageMetrics(
+            model="qwen3-0.6b",
+            input_token=156,
+            output_token=1755,
+            total_token=1911,
+            request_count=13,
+            user_id=2,
+            model_id=1,
+            access_key="d720eeb5b57fbe94",
+        )
+        assert by_model["gpt-4o"] == ModelUsageMetrics(
+            model="gpt-4o", input_token=7, provider_id=3
+        )
@@ -0,0 +1,92 @@
+from gpustack.schemas.model_routes import ModelRouteTarget, TargetStateEnum
+from gpustack.schemas.models import ModelInstanceStateEnum
+from gpustack.server.bus import Event, EventType
+from gpustack.server.routing_table import RoutingTable
+from tests.fixtures.workers.fixtures import linux_nvidia_1_4090_24gx1
+from tests.utils.model import new_model, new_model_instance
+
+
+def new_target(id, route_name, model_id, state=TargetStateEnum.ACTIVE):
+    return ModelRouteTarget(
+        id=id,
+        name=f"{route_name}-{id}",
+        route_name=route_name,
+        route_id=1,
+        model_id=model_id,
+        state=state,
+    )
+
+
+def populated_table() -> RoutingTable:
+    table = RoutingTable()
+    table._apply_target_event(Event(EventType.CREATED, new_target(1, "qwen", 1)))
+    table._apply_model_event(
+        Event(
+            EventType.CREATED, new_model(1, "qwen3", huggingface_repo_id="Qwen/Qwen3")
+        )
+    )
+    worker = linux_nvidia_1_4090_24gx1()
+    table._apply_worker_event(Event(EventType.CREATED, worker))
+    table._apply_instance_event(
+        Event(
+            EventType.CREATED,
+            new_model_instance(
+                10, "qwen3-a", 1, worker.id, ModelInstanceStateEnum.RUNNING
+            ),
+        )
+    )
+    return table
+
+
+def test_lookup_hit():
+    table = populated_table()
+
+    model, instances = table.lookup("qwen")
+    assert model.id == 1
+    assert [i.id for i in instances] == [10]
+
+    worker = table.resolve_worker(instances[0])
+    assert worker is not None
+    assert table.hits == 1
+    assert table.misses == 0
+
+
+def test_lookup_miss_for_unknown_route():
+    table = populated_table()
+
+    assert table.lookup("unknown") is None
+    assert table.misses == 1
+
+
+def test_instance_leaving_running_state_is_removed():
+    table = populated_table()
+    first = table.get_running_instances(1)
+    # The list is reused until the instance set changes.
+    assert table.get_running_instances(1) is first
+
+    instance = new_model_instance(10, "qwen3-a", 1, 1, ModelInstanceStateEnum.ERROR)
+    table._apply_instance_event(Event(EventType.UPDATED, instance))
+
+    assert table.get_running_instances(1) == []
+    assert table.lookup("qwen") is None
+
+
+def test_inactive_target_is_removed():
+    table = populated_table()
+
+    target = new_target(1, "qwen", 1, state=TargetStateEnum.UNAVAILABLE)
+    table._apply_target_event(Event(EventType.UPDATED, target))
+
+    assert table.lookup("qwen") is None
+
+
+def test_missing_worker_is_stale():
+    table = populated_table()
+    _, instances = table.lookup("qwen")
+
+    table._apply_worker_event(
+        Event(EventType.DELETED, table.get_worker(instances[0].worker_id))
+    )
+
+    assert table.resolve_worker(instances[0]) is None
+    assert table.stale == 1
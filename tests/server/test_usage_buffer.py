@@ -0,0 +1,171 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+
+from gpustack.schemas.model_usage import ModelUsage, OperationEnum
+from gpustack.server import db, usage_buffer
+from gpustack.server.usage_buffer import (
+    build_usage_key,
+    build_usage_upsert,
+    build_usage_upserts,
+    flush_usage_buffer,
+    init_usage_wal,
+    record_usage,
+    usage_flush_buffer,
+)
+
+
+def new_usage(user_id, prompt, completion, requests) -> ModelUsage:
+    return ModelUsage(
+        user_id=user_id,
+        model_id=1,
+        model_name="qwen3",
+        date=date(2025, 1, 1),
+        operation=OperationEnum.CHAT_COMPLETION,
+        prompt_token_count=prompt,
+        completion_token_count=completion,
+        request_count=requests,
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_buffer(monkeypatch):
+    monkeypatch.setattr(usage_buffer, "_usage_wal", None)
+    monkeypatch.setattr(usage_buffer, "_pending_segments", [])
+    usage_flush_buffer.clear()
+    yield
+    usage_flush_buffer.clear()
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[ModelUsage.__table__])
+    previous, db.engine = db.engine, engine
+    yield engine
+    db.engine = previous
+    await engine.dispose()
+
+
+async def stored_counts():
+    async with db.async_session() as session:
+        rows = (await session.exec(select(ModelUsage).order_by(ModelUsage.id))).all()
+    return [
+        (r.user_id, r.prompt_token_count, r.completion_token_count, r.request_count)
+        for r in rows
+    ]
+
+
+@pytest.mark.parametrize(
+    "dialect, expected",
+    [
+        (postgresql.dialect(), "ON CONFLICT (usage_key) DO UPDATE"),
+        (mysql.dialect(), "ON DUPLICATE KEY UPDATE"),
+    ],
+)
+def test_build_usage_upsert(dialect, expected):
+    record_usage(new_usage(1, 10, 20, 1))
+    record_usage(new_usage(2, 30, 40, 2))
+
+    stmt = build_usage_upsert(dialect.name, list(usage_flush_buffer.values()))
+    sql = str(stmt.compile(dialect=dialect))
+
+    assert sql.count("INSERT INTO model_usages") == 1
+    assert expected in sql
+    assert "model_usages.request_count +" in sql
+
+
+def test_build_usage_upsert_unsupported_dialect():
+    with pytest.raises(RuntimeError):
+        build_usage_upsert("oracle", [new_usage(1, 10, 20, 1)])
+
+
+def test_build_usage_upserts_within_parameter_limit():
+    usages = [new_usage(user_id, 1, 1, 1) for user_id in range(5000)]
+
+    stmts = build_usage_upserts("postgresql", usages)
+
+    assert len(stmts) > 1
+    params = [len(stmt.compile(dialect=postgresql.dialect()).params) for stmt in stmts]
+    assert max(params) <= usage_buffer.MAX_BIND_PARAMETERS
+    assert sum(params) == 5000 * (len(ModelUsage.__table__.columns) - 1)
+
+
+def test_record_usage_accumulates_deltas():
+    record_usage(new_usage(1, 10, 20, 1))
+    record_usage(new_usage(1, 5, 5, 1))
+    record_usage(new_usage(2, 1, 1, 1))
+
+    assert len(usage_flush_buffer) == 2
+    buffered = usage_flush_buffer[build_usage_key(new_usage(1, 0, 0, 0))]
+    assert buffered.prompt_token_count == 15
+    assert buffered.completion_token_count == 25
+    assert buffered.request_count == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_usage_buffer_increments_rows(sqlite_engine):
+    record_usage(new_usage(1, 10, 20, 1))
+    await flush_usage_buffer()
+
+    record_usage(new_usage(1, 15, 25, 1))
+    record_usage(new_usage(2, 5, 5, 1))
+    await flush_usage_buffer()
+
+    assert not usage_flush_buffer
+    assert await stored_counts() == [(1, 25, 45, 2), (2, 5, 5, 1)]
+
+
+@pytest.mark.asyncio
+async def test_flush_many_keys(sqlite_engine):
+    for user_id in range(5000):
+        record_usage(new_usage(user_id, 1, 1, 1))
+    await flush_usage_buffer()
+
+    assert not usage_flush_buffer
+    assert len(await stored_counts()) == 5000
+
+
+@pytest.mark.asyncio
+async def test_flush_failure_keeps_deltas(sqlite_engine, tmp_path, monkeypatch):
+    init_usage_wal(str(tmp_path))
+    record_usage(new_usage(1, 10, 20, 1))
+
+    def broken_upsert(dialect, usages):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(usage_buffer, "build_usage_upsert", broken_upsert)
+    await flush_usage_buffer()
+    monkeypatch.setattr(usage_buffer, "build_usage_upsert", build_usage_upsert)
+
+    record_usage(new_usage(1, 1, 1, 1))
+    assert len(list(tmp_path.iterdir())) == 2
+
+    await flush_usage_buffer()
+
+    assert await stored_counts() == [(1, 11, 21, 2)]
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_unflushed_deltas_are_replayed(sqlite_engine, tmp_path, monkeypatch):
+    init_usage_wal(str(tmp_path))
+    record_usage(new_usage(1, 10, 20, 1))
+    record_usage(new_usage(2, 3, 4, 1))
+    # Simulate a crash leaving a partially written record behind.
+    with open(usage_buffer._usage_wal._path, "a") as f:
+        f.write('{"user_id":')
+    usage_buffer._usage_wal.rotate()
+
+    usage_flush_buffer.clear()
+    monkeypatch.setattr(usage_buffer, "_pending_segments", [])
+    init_usage_wal(str(tmp_path))
+    await flush_usage_buffer()
+
+    assert await stored_counts() == [(1, 10, 20, 1), (2, 3, 4, 1)]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,163 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from gpustack.server.bus import Event, EventType
+from gpustack.server.work_queue import WorkQueue
+
+
+def updated(id, **changed_fields):
+    return Event(
+        type=EventType.UPDATED,
+        data=SimpleNamespace(id=id, model_id=id // 10),
+        changed_fields=changed_fields,
+    )
+
+
+async def run_until_done(queue: WorkQueue, events, timeout=2):
+    """Run the queue on the events, until they are all reconciled."""
+    added = asyncio.Event()
+
+    async def subscribe():
+        for event in events:
+            yield event
+        added.set()
+        await asyncio.Event().wait()
+
+    task = asyncio.create_task(queue.run(subscribe()))
+    try:
+        await asyncio.wait_for(added.wait(), timeout)
+        await asyncio.wait_for(drained(queue), timeout)
+    finally:
+        task.cancel()
+
+
+async def drained(queue: WorkQueue):
+    while queue.depth or queue._busy:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_queued_events_of_object_merged():
+    reconciled = []
+
+    async def reconcile(event):
+        reconciled.append((event.data.id, event.changed_fields))
+        await asyncio.sleep(0.05)
+
+    queue = WorkQueue("test", reconcile, concurrency=4)
+    await run_until_done(
+        queue,
+        [
+            updated(1, state=("a", "b")),
+            updated(1, state=("b", "c")),
+            updated(1, state=("c", "d"), name=("x", "y")),
+            Event(type=EventType.HEARTBEAT, data=None),
+        ],
+    )
+
+    assert reconciled == [(1, {"state": ("a", "d"), "name": ("x", "y")})]
+
+
+@pytest.mark.asyncio
+async def test_created_and_deleted_cancel_out():
+    reconciled = []
+
+    async def reconcile(event):
+        reconciled.append((event.type, event.data.id))
+        await asyncio.sleep(0.05)
+
+    data = SimpleNamespace(id=2)
+    queue = WorkQueue("test", reconcile)
+    await run_until_done(
+        queue,
+        [
+            updated(1),
+            Event(type=EventType.CREATED, data=data),
+            Event(type=EventType.DELETED, data=data),
+        ],
+        timeout=1,
+    )
+
+    assert reconciled == [(EventType.UPDATED, 1)]
+
+
+@pytest.mark.asyncio
+async def test_keys_reconciled_concurrently_up_to_limit():
+    running = set()
+    max_running = 0
+    order = []
+
+    async def reconcile(event):
+        nonlocal max_running
+        key = event.data.model_id
+        assert key not in running
+        running.add(key)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0.02)
+        order.append(event.data.id)
+        running.discard(key)
+
+    queue = WorkQueue(
+        "test",
+        reconcile,
+        key=lambda event: event.data.model_id,
+        concurrency=3,
+    )
+    await run_until_done(
+        queue, [updated(i * 10 + j) for j in range(2) for i in range(5)]
+    )
+
+    assert max_running == 3
+    for i in range(5):
+        # Events of the same key are reconciled in order.
+        assert order.index(i * 10) < order.index(i * 10 + 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_reconcile_retried_with_backoff():
+    attempts = []
+
+    async def reconcile(event):
+        attempts.append((asyncio.get_running_loop().time(), event.changed_fields))
+        if event.data.id == 1 and len(attempts) < 3:
+            raise RuntimeError("gateway unavailable")
+
+    queue = WorkQueue(
+        "test", reconcile, max_retries=5, retry_base_delay=0.05, retry_max_delay=1
+    )
+
+    async def add_later():
+        await asyncio.sleep(0.02)
+        # Later events wait for the retry and are merged into it.
+        queue.add(updated(1, state=("b", "c")))
+
+    await asyncio.gather(
+        run_until_done(queue, [updated(1, state=("a", "b"))]), add_later()
+    )
+
+    assert [fields for _, fields in attempts] == [
+        {"state": ("a", "b")},
+        {"state": ("a", "c")},
+        {"state": ("a", "c")},
+    ]
+    assert attempts[1][0] - attempts[0][0] >= 0.05
+    assert attempts[2][0] - attempts[1][0] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_failed_reconcile_dropped_after_max_retries():
+    attempts = []
+
+    async def reconcile(event):
+        attempts.append(event.data.id)
+        if event.data.id == 1:
+            raise RuntimeError("gateway unavailable")
+
+    queue = WorkQueue("test", reconcile, max_retries=2, retry_base_delay=0.01)
+    await run_until_done(queue, [updated(1), updated(2)])
+
+    assert attempts.count(1) == 3
+    assert attempts.count(2) == 1
+    assert not queue._retries
@@ -0,0 +1,104 @@
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gpustack.worker.chunked_downloader import ChunkedDownloader
+
+DATA = os.urandom(100_000)
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    accept_ranges = True
+    requested_bytes = 0
+
+    def do_GET(self):
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if self.accept_ranges and match:
+            start, end = int(match.group(1)), int(match.group(2))
+            body = DATA[start : end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+        else:
+            body = DATA
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"test-etag"')
+        self.end_headers()
+        self.wfile.write(body)
+        type(self).requested_bytes += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}/model.gguf"
+
+    server.shutdown()
+    server.server_close()
+    RangeHandler.accept_ranges = True
+    RangeHandler.requested_bytes = 0
+
+
+def test_download_in_chunks(url, tmp_path):
+    path = str(tmp_path / "model.gguf")
+    progress = []
+
+    ChunkedDownloader(chunk_size=7_000, max_workers=4).download(
+        url,
+        path,
+        progress_callback=lambda downloaded, total: progress.append(
+            (downloaded, total)
+        ),
+    )
+
+    with open(path, "rb") as f:
+        assert f.read() == DATA
+    assert progress[-1] == (len(DATA), len(DATA))
+    assert progress == sorted(progress)
+    assert os.listdir(tmp_path) == ["model.gguf"]
+
+
+def test_download_resumes_chunks(url, tmp_path):
+    path = str(tmp_path / "model.gguf")
+    downloader = ChunkedDownloader(chunk_size=7_000, max_workers=4)
+
+    def interrupt(downloaded, total):
+        if downloaded > len(DATA) // 2:
+            raise KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        downloader.download(url, path, progress_callback=interrupt)
+    assert not os.path.exists(path)
+
+    RangeHandler.requested_bytes = 0
+    progress = []
+    downloader.download(
+        url,
+        path,
+        progress_callback=lambda downloaded, total: progress.append(downloaded),
+    )
+
+    with open(path, "rb") as f:
+        assert f.read() == DATA
+    # Only the rest is fetched again, besides the probe.
+    assert progress[0] > len(DATA) // 2
+    assert RangeHandler.requested_bytes == len(DATA) - progress[0] + 1
+
+
+def test_download_without_ranges(url, tmp_path):
+    RangeHandler.accept_ranges = False
+    path = str(tmp_path / "model.gguf")
+
+    ChunkedDownloader(chunk_size=7_000).download(url, path)
+
+    with open(path, "rb") as f:
+        assert f.read() == DATA
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+from gpustack.worker.exporter import unified_registry
+from gpustack.worker.health_prober import HealthCheckTarget, HealthProber
+
+
+@pytest.fixture
+def server_url():
+    async def healthy(request):
+        return web.Response(text="ok")
+
+    async def unhealthy(request):
+        return web.Response(status=503)
+
+    async def hung(request):
+        await asyncio.sleep(5)
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/healthy", healthy)
+    app.router.add_get("/unhealthy", unhealthy)
+    app.router.add_get("/hung", hung)
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app, handler_cancellation=True)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{port}"
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def duration_count(id: int, name: str):
+    return unified_registry.get_sample_value(
+        "gpustack:model_instance_health_check_duration_seconds_count",
+        {"model_instance_id": str(id), "model_instance_name": name},
+    )
+
+
+def test_probe_checks_targets_concurrently(server_url):
+    prober = HealthProber(timeout=0.5)
+    targets = [
+        HealthCheckTarget(id=1, name="healthy", url=f"{server_url}/healthy"),
+        HealthCheckTarget(id=2, name="unhealthy", url=f"{server_url}/unhealthy"),
+        HealthCheckTarget(id=3, name="hung-1", url=f"{server_url}/hung"),
+        HealthCheckTarget(id=4, name="hung-2", url=f"{server_url}/hung"),
+    ]
+
+    start_time = time.perf_counter()
+    results = prober.probe(targets)
+    elapsed = time.perf_counter() - start_time
+
+    assert results == {1: True, 2: False, 3: False, 4: False}
+    # The hung ones time out together.
+    assert elapsed < 1
+    assert duration_count(1, "healthy") == 1
+
+    prober.retain([1])
+    assert duration_count(1, "healthy") == 1
+    assert duration_count(3, "hung-1") is None
@@ -1,8 +1,10 @@
 import asyncio
+import os
+import sys
 from typing import List, Union
 import pytest
 
-from gpustack.worker.logs import LogOptions, log_generator
+from gpustack.worker.logs import LogOptions, _Inotify, _followed_files, log_generator
 
 
 @pytest.fixture
@@ -127,3 +129,40 @@ async def test_log_generator_tail_larger_than_large_file(large_log_file):
         [line async for line in log_generator(log_path, options)]
     )
     assert result == ["line" * 256 + "\n", "line" * 256 + "\n"]
+
+
+@pytest.mark.asyncio
+async def test_log_generator_tail_across_blocks(tmp_path):
+    lines = [f"line{i}\n" * (i % 7 + 1) for i in range(20000)]
+    log_file = tmp_path / "blocks.log"
+    log_file.write_text("".join(lines) + "partial")
+    log_path = str(log_file)
+
+    for tail in [1, 2, 12345, 30000]:
+        result = [line async for line in log_generator(log_path, LogOptions(tail=tail))]
+        expected = "".join(lines).splitlines(keepends=True) + ["partial"]
+        assert normalize_newlines(result) == expected[-tail:]
+
+
+@pytest.mark.asyncio
+async def test_log_generator_follow_shares_reader(sample_log_file):
+    log_path = str(sample_log_file)
+    generators = [log_generator(log_path, LogOptions(tail=1, follow=True))]
+    generators.append(log_generator(log_path, LogOptions(tail=2, follow=True)))
+
+    assert await generators[0].__anext__() == "line5\n"
+    assert await generators[1].__anext__() == "line4\n"
+    assert await generators[1].__anext__() == "line5\n"
+    assert list(_followed_files) == [os.path.realpath(log_path)]
+    if sys.platform == "linux":
+        assert _Inotify.create(log_path) is not None
+
+    with open(log_path, "a") as file:
+        file.write("line6\nline")
+    for generator in generators:
+        assert await asyncio.wait_for(generator.__anext__(), timeout=1) == "line6\n"
+        assert await asyncio.wait_for(generator.__anext__(), timeout=1) == "line"
+
+    for generator in generators:
+        await generator.aclose()
+    assert not _followed_files
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+import pytest
+from aiohttp import web
+
+from gpustack.logging import setup_logging
+from gpustack.worker import runtime_metrics_client
+from gpustack.worker.runtime_metrics_client import Client, Config
+
+PAYLOAD = """# HELP vllm:num_requests_running Number of requests running.
+# TYPE vllm:num_requests_running gauge
+vllm:num_requests_running{model_name="qwen3"} %d
+"""
+
+setup_logging()
+
+
+@pytest.fixture
+def server():
+    state = {"running": 1}
+
+    async def metrics(request):
+        return web.Response(text=PAYLOAD % state["running"])
+
+    async def version(request):
+        return web.json_response({"version": "0.10.0"})
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/version", version)
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app, handler_cancellation=True)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"127.0.0.1:{port}", state
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_fetch_metrics_skips_parsing_unchanged_payloads(server, monkeypatch):
+    endpoint, state = server
+    unreachable = "127.0.0.1:1"
+    parsed = []
+    parse = runtime_metrics_client.text_string_to_metric_families
+
+    def counting_parse(text):
+        parsed.append(text)
+        return parse(text)
+
+    monkeypatch.setattr(
+        runtime_metrics_client, "text_string_to_metric_families", counting_parse
+    )
+    client = Client(Config(timeout=1, max_retries=1, base_delay=0.01, jitter=0.01))
+
+    results = client.fetch_metrics_from_endpoints([endpoint, unreachable])
+    assert results[unreachable] is None
+    family = results[endpoint]["vllm:num_requests_running"]
+    assert family.samples[0].value == 1
+    assert len(parsed) == 1
+
+    results = client.fetch_metrics_from_endpoints([endpoint])
+    assert results[endpoint]["vllm:num_requests_running"] is family
+    assert len(parsed) == 1
+
+    state["running"] = 2
+    results = client.fetch_metrics_from_endpoints([endpoint])
+    assert results[endpoint]["vllm:num_requests_running"].samples[0].value == 2
+    assert len(parsed) == 2
+
+    assert client.fetch_runtime_version_from_endpoint(endpoint, "vLLM") == "0.10.0"
+
+
+def test_fetch_metrics_from_one_endpoint_keeps_other_endpoints(server):
+    endpoint, _ = server
+    client = Client(Config(timeout=1, max_retries=0, jitter=0))
+
+    client.fetch_metrics_from_endpoints([endpoint])
+    assert client.fetch_metrics_from_endpoint("127.0.0.1:1") is None
+    assert endpoint in client._parsed